@@ -0,0 +1,50 @@
+# benchmarks/conftest.py
+import pytest
+from utils.catalog import load_catalog
+from utils.benchmark import BenchmarkBaseline, run_flow, write_results
+from utils.parallel import get_worker_id
+
+@pytest.fixture(scope="session")
+def benchmark_products():
+    """Products used to build carts during the benchmarks."""
+    return load_catalog()
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(pytestconfig):
+    return BenchmarkBaseline(
+        pytestconfig.getoption("--benchmark-baseline"),
+        pytestconfig.getoption("--benchmark-threshold"),
+    )
+
+@pytest.fixture(scope="session")
+def benchmark_results(pytestconfig, benchmark_baseline):
+    """
+    Results of every flow in the session.
+    Written to reports/benchmarks and, with --benchmark-save-baseline, into the baseline file.
+    """
+    results = []
+    pytestconfig.benchmark_results = results
+    yield results
+    if results:
+        write_results(results, get_worker_id())
+        if pytestconfig.getoption("--benchmark-save-baseline"):
+            benchmark_baseline.save(results)
+
+@pytest.fixture
+def bench_flow(pytestconfig, benchmark_results, benchmark_baseline):
+    """
+    Run a flow with the configured warm-up and repetitions, record it and
+    fail the test when it regressed against the baseline.
+    """
+    repetitions = pytestconfig.getoption("--benchmark-reps")
+    warmup = pytestconfig.getoption("--benchmark-warmup")
+    saving = pytestconfig.getoption("--benchmark-save-baseline")
+
+    def run(flow, action, setup=None, teardown=None):
+        result = run_flow(flow, action, repetitions, warmup, setup, teardown)
+        benchmark_results.append(result)
+        regression = benchmark_baseline.check(result)
+        assert saving or regression is None, regression
+        return result
+
+    return run
@@ -0,0 +1,65 @@
+"""
+Sales Module Benchmarks
+=======================
+Throughput and latency of the main POS UI flows, measured through SalesPage
+and SalesService. Skipped unless pytest runs with --benchmark.
+
+    pytest benchmarks --benchmark --benchmark-reps 20
+    pytest benchmarks --benchmark --benchmark-save-baseline   # refresh the baseline
+
+Run without xdist, so every flow is measured on a single, otherwise idle browser.
+"""
+
+import random
+import pytest
+from services.sales_service import SalesService
+
+CASH_USED = 1000
+REFERENCE = 123456789
+CART_SIZE = 3
+
+@pytest.mark.benchmark
+@pytest.mark.usefixtures("ticket_lifecycle")
+class TestSalesBenchmark:
+
+    def test_start_new_ticket(self, sales_page, bench_flow):
+        """Create a ticket until its tab is active."""
+        bench_flow("start_new_ticket", sales_page.start_new_ticket)
+
+    def test_add_product_by_code(self, sales_page, bench_flow, benchmark_products):
+        """Search and add one product to a fresh ticket until the total updates."""
+        bench_flow(
+            "add_product_by_code",
+            lambda: sales_page.add_product_by_code(random.choice(benchmark_products).name),
+            setup=sales_page.start_new_ticket,
+        )
+
+    def test_remove_current_ticket(self, sales_page, bench_flow):
+        """Remove the active ticket and confirm."""
+        bench_flow("remove_current_ticket", sales_page.remove_current_ticket, setup=sales_page.start_new_ticket)
+
+    def test_pay_with_cash(self, sales_page, pos_api, bench_flow, benchmark_products):
+        """Pay a seeded cart with cash and finish the sale."""
+        bench_flow(
+            "pay_with_cash",
+            lambda: sales_page.pay_with_cash(CASH_USED),
+            setup=lambda: SalesService.build_cart(sales_page, random.sample(benchmark_products, CART_SIZE), pos_api),
+        )
+
+    def test_pay_with_card(self, sales_page, pos_api, bench_flow, benchmark_products):
+        """Fill the card payment of a seeded cart."""
+        bench_flow(
+            "pay_with_card",
+            lambda: sales_page.pay_with_card(REFERENCE),
+            setup=lambda: SalesService.build_cart(sales_page, random.sample(benchmark_products, CART_SIZE), pos_api),
+            teardown=sales_page.close_payment_modal,
+        )
+
+    def test_mix_payment_cash(self, sales_page, pos_api, bench_flow, benchmark_products):
+        """Fill the mixed cash/card payment of a seeded cart."""
+        bench_flow(
+            "mix_payment_cash",
+            lambda: sales_page.mix_payment_cash(CASH_USED),
+            setup=lambda: SalesService.build_cart(sales_page, random.sample(benchmark_products, CART_SIZE), pos_api),
+            teardown=sales_page.close_payment_modal,
+        )
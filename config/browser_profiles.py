@@ -0,0 +1,93 @@
+# config/browser_profiles.py
+import os
+from dataclasses import dataclass, field
+from selenium import webdriver
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Turns off CSS/jQuery animations before any page script runs
+JS_DISABLE_ANIMATIONS = """
+(function() {
+    var style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { transition: none !important; animation: none !important; scroll-behavior: auto !important; }';
+    (document.head || document.documentElement).appendChild(style);
+    document.addEventListener('DOMContentLoaded', function() { if (window.jQuery) { window.jQuery.fx.off = true; } });
+})();
+"""
+
+# Resources the assertions never look at. Fonts and PNG/SVG icons are kept on purpose:
+# the POS icons (feather-*, remove <img>) are click targets and would lose their size.
+LEAN_BLOCKED_URLS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.mp4", "*.webm", "*.mp3",
+)
+
+HEADLESS_ARGUMENTS = ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu")
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Chrome configuration for one kind of run (local debugging, CI, benchmarks)."""
+    name: str
+    arguments: tuple[str, ...] = ()
+    window_size: tuple[int, int] | None = None  # None = maximize
+    blocked_urls: tuple[str, ...] = ()
+    disable_animations: bool = False
+    capabilities: dict = field(default_factory=dict)
+
+    def build_options(self) -> webdriver.ChromeOptions:
+        options = webdriver.ChromeOptions()
+        for argument in self.arguments:
+            options.add_argument(argument)
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        for name, value in self.capabilities.items():
+            options.set_capability(name, value)
+        return options
+
+    def start(self) -> webdriver.Chrome:
+        """Launch Chrome with this profile and apply its CDP settings."""
+        driver = webdriver.Chrome(options=self.build_options())
+        if self.window_size is None:
+            driver.maximize_window()
+        blocked = self.blocked_urls + tuple(filter(None, os.getenv("POS_BLOCKED_URLS", "").split(",")))
+        if blocked:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked)})
+        if self.disable_animations:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": JS_DISABLE_ANIMATIONS})
+        logger.info("Chrome started with browser profile '%s'", self.name)
+        return driver
+
+
+PROFILES = {
+    # Headed and maximized, what the suite always used
+    "debug": BrowserProfile("debug"),
+    "ci": BrowserProfile("ci", arguments=HEADLESS_ARGUMENTS, window_size=(1920, 1080)),
+    "lean": BrowserProfile(
+        "lean",
+        arguments=HEADLESS_ARGUMENTS + (
+            "--disable-extensions",
+            "--disable-component-extensions-with-background-pages",
+            "--disable-background-networking",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--force-prefers-reduced-motion",
+        ),
+        window_size=(1366, 768),
+        blocked_urls=LEAN_BLOCKED_URLS,
+        disable_animations=True,
+    ),
+}
+
+
+def get_profile(name: str) -> BrowserProfile:
+    """Return the browser profile called `name` (debug, ci or lean)."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile '{name}', choose one of: {', '.join(PROFILES)}") from None
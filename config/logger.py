@@ -1,52 +1,102 @@
 # utils/logger.py
-import logging
 import os
+import json
+import queue
+import atexit
+import logging
 from datetime import datetime
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from utils.parallel import get_worker_id
+
+LOG_DIR = "logs"
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and is kept in JSON lines
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, worker, message and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": get_worker_id(),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        return json.dumps(entry, default=str)
+
+
+def log_file_path(worker_id: str | None = None, structured: bool | None = None) -> str:
+    """
+    Log file of this process: one per day and per xdist worker, so workers never share a file.
+
+    Returns:
+        str: e.g. logs/test_log_20250101.log, logs/test_log_20250101_gw1.log or .jsonl for JSON lines.
+    """
+    worker_id = worker_id or get_worker_id()
+    structured = _structured() if structured is None else structured
+    suffix = "" if worker_id == "master" else f"_{worker_id}"
+    extension = "jsonl" if structured else "log"
+    return os.path.join(LOG_DIR, f"test_log_{datetime.now().strftime('%Y%m%d')}{suffix}.{extension}")
+
+
+def _structured() -> bool:
+    # POS_LOG_FORMAT=json writes JSON lines instead of text to the log file
+    return os.getenv("POS_LOG_FORMAT", "text").lower() == "json"
+
 
-def get_logger(name: str = __name__, log_level: int = logging.DEBUG) -> logging.Logger:
+@lru_cache(maxsize=None)
+def _queue_handler() -> QueueHandler:
+    """
+    Start the logging pipeline once per process.
+    Loggers only put records on a queue; a listener thread formats them and writes the shared
+    file sink and the console, so no log I/O happens on the test thread.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    text_formatter = logging.Formatter(TEXT_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+
+    # File handler, opened with the first record
+    file_handler = logging.FileHandler(log_file_path(), encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonLinesFormatter() if _structured() else text_formatter)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(text_formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    # Drain the queue before the interpreter exits
+    atexit.register(listener.stop)
+    return QueueHandler(log_queue)
+
+
+def get_logger(name: str = __name__, log_level: int | str | None = None) -> logging.Logger:
     """
     Configure and return a logger instance.
     
     Args:
         name (str): Logger name (usually __name__).
-        log_level (int): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+        log_level (int | str | None): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+            Defaults to POS_LOG_LEVEL, or DEBUG.
     
     Returns:
         logging.Logger: Configured logger.
     """
 
-    # Ensure logs directory exists
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-
-    # Log file with timestamp
-    log_file = os.path.join(log_dir, f"test_log_{datetime.now().strftime('%Y%m%d')}.log")
-    print(log_file)
-
     # Logger configuration
     logger = logging.getLogger(name)
-    logger.setLevel(log_level)
+    logger.setLevel(log_level or os.getenv("POS_LOG_LEVEL", "DEBUG").upper())
 
     # Avoid duplicate handlers if logger is reused
     if not logger.handlers:
-        # File handler
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(log_level)
-
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-
-        # Log format
-        formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        # Add handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(_queue_handler())
 
     return logger
@@ -1,11 +1,35 @@
 # Initialize enviroment variables
-from dotenv import load_dotenv
 import os
 
-load_dotenv()
+# name -> how to read it. Resolved on first access, so importing settings costs nothing
+# and .env is only parsed when a value is actually needed.
+SETTINGS = {
+    "USER": lambda: os.getenv("USER"),
+    "PASSWORD": lambda: os.getenv("PASSWORD"),
+    "SMART_SITE_POS": lambda: os.getenv("SMART_SITE_POS"),
+    # Seconds a cached login (cookies + web storage) stays valid. 0 disables the cache.
+    "SESSION_TTL": lambda: int(os.getenv("POS_SESSION_TTL", "1800")),
+    # Seed tickets through the POS backend API instead of the product search UI
+    "API_SEEDING": lambda: os.getenv("POS_API_SEEDING", "0") == "1",
+    "POS_API_URL": lambda: os.getenv("POS_API_URL") or os.getenv("SMART_SITE_POS"),
+    # Seconds the scraped inventory report stays valid for lookups
+    "INVENTORY_TTL": lambda: float(os.getenv("POS_INVENTORY_TTL", "600")),
+}
+
 class Settings:
-    USER = os.getenv("USER")
-    PASSWORD = os.getenv("PASSWORD")
-    SMART_SITE_POS = os.getenv("SMART_SITE_POS")
+    """Environment settings, read (and cached) the first time each one is used. Assigning overrides them."""
+    _env_loaded = False
+
+    def __getattr__(self, name):
+        resolve = SETTINGS.get(name)
+        if resolve is None:
+            raise AttributeError(f"Unknown setting '{name}'")
+        if not Settings._env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            Settings._env_loaded = True
+        value = resolve()
+        setattr(self, name, value)
+        return value
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
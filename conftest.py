@@ -1,26 +1,759 @@
-
 # conftest.py
 import os
+import json
+import time
+import random
 import pytest
-import allure
+from dataclasses import replace
 from datetime import datetime
-from selenium import webdriver
+from config.settings import settings
+from services.ticket_lifecycle import TicketLifecycleManager
+from utils.parallel import get_worker_id, is_xdist_worker
+from utils.session_cache import SessionCache
+from utils.profiler import StepProfiler, percentile
+from utils.screenshots import SCREENSHOT_PREFIX, SCREENSHOTS_DIR, get_screenshot_writer
+from utils.startup import StartupTimer
+from utils.flakes import FlakeHistory, FlakeTracker, TRANSIENT_ERRORS, classify_failure
+from utils.scheduling import assign_lpt_groups, deselect_by_options, history_id, order_by_page_state
+from utils.network import NetworkRecorder, PERFORMANCE_LOGGING
+
+# Selenium, allure, requests and the page objects are imported inside the fixtures and hooks
+# that use them: collecting or listing tests (--collect-only, -m) never loads them.
+
+INITIAL_CASH = 10000
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--pos-seed",
+        action="store",
+        default=None,
+        help="Seed for the random product sets. Shared by every xdist worker so all of them collect the same tests.",
+    )
+    parser.addoption(
+        "--pos-stub",
+        action="store_true",
+        default=False,
+        help="Run against the bundled local POS stub instead of SMART_SITE_POS (one stub per xdist worker).",
+    )
+    parser.addoption(
+        "--pos-stub-latency",
+        action="store",
+        type=int,
+        default=int(os.getenv("POS_STUB_LATENCY_MS", "0")),
+        help="Milliseconds of latency the POS stub adds to every page and API response.",
+    )
+    parser.addoption(
+        "--profile-steps",
+        action="store_true",
+        default=os.getenv("POS_PROFILE_STEPS") == "1",
+        help="Record wall time, WebDriver commands and wait time of every page-object call.",
+    )
+    parser.addoption(
+        "--capture-network",
+        action="store_true",
+        default=os.getenv("POS_CAPTURE_NETWORK") == "1",
+        help="Record the requests of every page-object action from Chrome's performance log "
+             "and attach a HAR plus a per-action summary to Allure.",
+    )
+    parser.addoption(
+        "--browser-profile",
+        action="store",
+        default=os.getenv("POS_BROWSER_PROFILE", "debug"),
+        choices=("debug", "ci", "lean"),
+        help="Chrome profile: debug (headed, maximized), ci (headless) or lean (headless, blocks non-essential resources).",
+    )
+    parser.addoption(
+        "--page-load-timing",
+        action="store_true",
+        default=os.getenv("POS_PAGE_LOAD_TIMING") == "1",
+        help="Read the navigation timing of the page every sales test ends on and report "
+             "page load percentiles for the browser profile.",
+    )
+    group = parser.getgroup("driver pool", "Pre-started browsers")
+    group.addoption(
+        "--driver-pool",
+        type=int,
+        default=int(os.getenv("POS_DRIVER_POOL", "0")),
+        help="Browsers started in the background while pytest collects, kept ready to be handed out. "
+             "0 starts Chrome in the driver fixture.",
+    )
+    group.addoption(
+        "--recycle-after",
+        type=int,
+        default=int(os.getenv("POS_RECYCLE_AFTER", "0")),
+        help="Swap the browser for a fresh one after this many tests (0 = never).",
+    )
+    group.addoption(
+        "--recycle-memory",
+        type=float,
+        default=float(os.getenv("POS_RECYCLE_MEMORY", "0")),
+        help="Swap the browser once its JS heap grew this many MB (0 = never).",
+    )
+    parser.addoption(
+        "--startup-timing",
+        action="store_true",
+        default=os.getenv("POS_STARTUP_TIMING") == "1",
+        help="Report collection time per test module and the slowest imports (reports/profiling/startup_*.json).",
+    )
+    group = parser.getgroup("scenarios", "CSV scenario files")
+    group.addoption(
+        "--scenario-shard",
+        default=os.getenv("POS_SCENARIO_SHARD"),
+        help="Run only shard K/N of every scenario file (e.g. 2/4), to split nightly sets across CI jobs.",
+    )
+    group.addoption(
+        "--scenario-limit",
+        type=int,
+        default=int(os.getenv("POS_SCENARIO_LIMIT", "0")) or None,
+        help="Maximum rows taken from each scenario file (after sharding).",
+    )
+    group.addoption(
+        "--scenario-payment",
+        default=os.getenv("POS_SCENARIO_PAYMENT", "none"),
+        choices=("none", "cash", "mixed"),
+        help="Also pay every scenario ticket (cash, or cash + card) and check the change and split.",
+    )
+    group.addoption(
+        "--cash-ratio",
+        default=os.getenv("POS_CASH_RATIO", "0.8"),
+        help="Share of a mixed payment charged in cash, the rest goes to the card.",
+    )
+    parser.addoption(
+        "--schedule",
+        default=os.getenv("POS_SCHEDULE", "state"),
+        choices=("state", "file"),
+        help="Test order: state (grouped by the page state each test needs) or file (collection order). "
+             "With -n N --dist loadgroup, tests are also balanced over the workers by past durations.",
+    )
+    group = parser.getgroup("flakes", "Retries and quarantine")
+    group.addoption(
+        "--flaky-reruns",
+        type=int,
+        default=int(os.getenv("POS_FLAKY_RERUNS", "2")),
+        help="Reruns of tests failing on a timeout or stale element (needs pytest-rerunfailures). 0 disables.",
+    )
+    group.addoption(
+        "--quarantine",
+        default=os.getenv("POS_QUARANTINE", "xfail"),
+        choices=("xfail", "skip", "off"),
+        help="What to do with tests the flake history marks as flaky or slow: "
+             "xfail (flaky ones run without failing the build, slow ones run last), skip, or off.",
+    )
+    group.addoption(
+        "--slow-budget",
+        type=float,
+        default=float(os.getenv("POS_SLOW_BUDGET", "60")),
+        help="Median seconds above which a test is quarantined as slow (0 disables).",
+    )
+    group.addoption("--flake-history", default=".cache/flake_history.json", help="Outcome history file.")
+    group = parser.getgroup("impact", "Change impact selection")
+    group.addoption(
+        "--impact-record",
+        action="store_true",
+        default=False,
+        help="Record which page-object methods and locators every test exercises into the impact map.",
+    )
+    group.addoption(
+        "--impact-base",
+        default=os.getenv("POS_IMPACT_BASE"),
+        help="Run only the tests affected by the changes since this git ref (e.g. origin/main).",
+    )
+    group.addoption("--impact-map", default=".cache/impact_map.json", help="Impact map file.")
+    group = parser.getgroup("trends", "Allure result history and trends")
+    group.addoption(
+        "--trends",
+        type=int,
+        default=int(os.getenv("POS_TRENDS", "10")),
+        help="Update the result history with the new Allure results and show this many "
+             "slowest/most changed tests. 0 disables.",
+    )
+    group.addoption(
+        "--allure-prune",
+        action="store_true",
+        default=os.getenv("POS_ALLURE_PRUNE") == "1",
+        help="Delete Allure results superseded by a newer result of the same test. "
+             "Never done in a results directory git tracks files in.",
+    )
+    group.addoption("--result-history", default="reports/history/result_history.json", help="Result history file.")
+    group.addoption("--trends-report", default="reports/trends.html", help="Static trends page.")
+    group = parser.getgroup("benchmark", "POS UI benchmarks")
+    group.addoption("--benchmark", action="store_true", default=False, help="Run the tests marked 'benchmark'.")
+    group.addoption("--benchmark-reps", type=int, default=10, help="Measured repetitions per flow.")
+    group.addoption("--benchmark-warmup", type=int, default=2, help="Unmeasured warm-up runs per flow.")
+    group.addoption("--benchmark-baseline", default="benchmarks/baseline.json", help="Baseline results file.")
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.2,
+        help="Allowed p50 slowdown against the baseline before a flow fails (0.2 = 20%%).",
+    )
+    group.addoption(
+        "--benchmark-save-baseline",
+        action="store_true",
+        default=False,
+        help="Store this run as the new baseline instead of failing on regressions.",
+    )
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Seed the random product sets before test modules are imported.
+    Runs before allure so workers never wipe results already written by other workers.
+    """
+    config.startup_timer = None
+    if config.getoption("--startup-timing"):
+        config.startup_timer = StartupTimer()
+        config.startup_timer.start_import_timing()
+
+    if is_xdist_worker(config):
+        seed = config.workerinput["pos_seed"]
+        # Workers only append results: one cleaning the directory would wipe what the others wrote
+        config.option.clean_alluredir = False
+    else:
+        seed = config.getoption("--pos-seed") or random.randrange(1_000_000)
+    config.pos_seed = int(seed)
+    random.seed(config.pos_seed)
+    # Test modules derive their reproducible product sets from it at import time
+    os.environ["POS_SEED"] = str(config.pos_seed)
+
+    # The xdist controller runs no tests, only workers need a stub
+    distributed = getattr(config.option, "numprocesses", None) and not is_xdist_worker(config)
+    if config.getoption("--pos-stub") and not distributed:
+        from stub_server.server import PosStubServer
+        config.pos_stub = PosStubServer(latency_ms=config.getoption("--pos-stub-latency")).start()
+        settings.SMART_SITE_POS = settings.POS_API_URL = config.pos_stub.url
+        settings.USER = settings.USER or "qa@smartsite.test"
+        settings.PASSWORD = settings.PASSWORD or "stub"
+
+    config.flake_history = FlakeHistory(
+        config.getoption("--flake-history"), slow_budget=config.getoption("--slow-budget")
+    )
+    if not is_xdist_worker(config):
+        # The controller receives every report, including the ones of its workers
+        config.flake_tracker = FlakeTracker(config.flake_history)
+        config.pluginmanager.register(config.flake_tracker, "pos_flake_tracker")
+
+    config.page_loads = [] if config.getoption("--page-load-timing") else None
+    config.scenario_outcomes = {}
+    config.scenario_mismatches = {}
+    from utils.money import parse_cash_ratio
+    try:
+        config.cash_ratio = parse_cash_ratio(config.getoption("--cash-ratio"))
+    except ValueError as error:
+        raise pytest.UsageError(f"--cash-ratio: {error}") from None
+    config.step_profiler = None
+    if config.getoption("--profile-steps"):
+        from pages.sales_page import SalesPage
+        from utils.base_page import BasePage
+        config.step_profiler = StepProfiler()
+        config.step_profiler.instrument(BasePage, SalesPage)
+
+    config.network_recorder = None
+    if config.getoption("--capture-network"):
+        from pages.sales_page import SalesPage
+        config.network_recorder = NetworkRecorder()
+        config.network_recorder.instrument(SalesPage)
+
+    config.impact_tracer = None
+    if config.getoption("--impact-record"):
+        from utils.impact import ImpactRecorder, ImpactTracer
+        from utils.base_page import BasePage
+        from pages.sales_page import SalesPage
+        from pages.inventory_page import InventoryPage
+        from services.sales_service import SalesService
+        from services.auth_service import AuthService
+        config.impact_tracer = ImpactTracer()
+        config.impact_tracer.instrument(
+            BasePage, SalesPage, InventoryPage, SalesService, AuthService, TicketLifecycleManager
+        )
+        config.impact_tracer.start()
+        if not is_xdist_worker(config):
+            config.pluginmanager.register(ImpactRecorder(config.getoption("--impact-map")), "pos_impact_recorder")
+
+    # Browsers start now, overlapping collection; the controller of an xdist run needs none
+    config.driver_pool = None
+    pooled = config.getoption("--driver-pool") or config.getoption("--recycle-after") or config.getoption("--recycle-memory")
+    if pooled and not distributed and not config.option.collectonly:
+        from utils.driver_pool import DriverPool
+        config.driver_pool = DriverPool(
+            browser_profile(config).start,
+            spares=config.getoption("--driver-pool"),
+            max_tests=config.getoption("--recycle-after"),
+            max_memory_mb=config.getoption("--recycle-memory"),
+        ).start()
+
+    config.impact_selection = None
+    if is_xdist_worker(config):
+        if config.workerinput.get("impact_selection"):
+            from utils.impact import ImpactSelection
+            config.impact_selection = ImpactSelection.from_dict(config.workerinput["impact_selection"])
+    elif config.getoption("--impact-base"):
+        from utils.impact import ImpactSelection, load_impact_map
+        config.impact_selection = ImpactSelection.from_git(
+            config.getoption("--impact-base"), load_impact_map(config.getoption("--impact-map"))
+        )
+
+def pytest_unconfigure(config):
+    # Flush queued failure screenshots and prune old ones
+    get_screenshot_writer().close()
+
+    pool = getattr(config, "driver_pool", None)
+    if pool is not None:
+        pool.close()
+
+    stub = getattr(config, "pos_stub", None)
+    if stub is not None:
+        stub.stop()
+
+    # Unwrap in reverse order of instrumentation
+    tracer = getattr(config, "impact_tracer", None)
+    if tracer is not None:
+        tracer.uninstrument()
+
+    recorder = getattr(config, "network_recorder", None)
+    if recorder is not None:
+        if recorder.entries or recorder.run_actions:
+            recorder.write_report(get_worker_id())
+        recorder.uninstrument()
+
+    profiler = getattr(config, "step_profiler", None)
+    if profiler is not None:
+        if profiler.records:
+            profiler.write_report(get_worker_id())
+        profiler.uninstrument()
+
+    timer = getattr(config, "startup_timer", None)
+    if timer is not None:
+        timer.stop_import_timing()
+        timer.write_report(get_worker_id())
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the controller seed and impact selection to every xdist worker (e.g. `pytest -n auto`)."""
+    node.workerinput["pos_seed"] = node.config.pos_seed
+    # Workers select the same tests without diffing again
+    if node.config.impact_selection is not None:
+        node.workerinput["impact_selection"] = node.config.impact_selection.to_dict()
+
+def pytest_report_header(config):
+    header = [f"pos-seed: {config.pos_seed} (rerun with --pos-seed={config.pos_seed})"]
+    if getattr(config, "pos_stub", None) is not None:
+        header.append(f"pos-stub: {config.pos_stub.url} (latency {config.pos_stub.state.latency_ms} ms)")
+    selection = config.impact_selection
+    if selection is not None:
+        header.append(
+            f"impact: all tests ({selection.run_all})" if selection.run_all
+            else f"impact: {len(selection.changed)} changed symbol(s), {len(selection.test_files)} changed test file(s) "
+                 f"since {config.getoption('--impact-base')}"
+        )
+    return header
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Time the whole collection phase (--startup-timing)."""
+    start = time.perf_counter()
+    yield
+    timer = session.config.startup_timer
+    if timer is not None:
+        timer.record_phase("collection", time.perf_counter() - start)
+        timer.stop_import_timing()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Time the import and parametrization of every test module (--startup-timing)."""
+    start = time.perf_counter()
+    yield
+    timer = collector.config.startup_timer
+    if timer is not None and isinstance(collector, pytest.Module):
+        timer.record_module(collector.nodeid, time.perf_counter() - start)
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametrize `cart_scenario` with the rows of the files named by @pytest.mark.scenarios(...).
+    Only row offsets are collected; each row is read and validated when its test runs.
+    Expected totals, change and payment splits of every file are computed here, in one pass per file.
+    Rows whose products or total disagree with the catalog are skipped with the mismatch as the reason.
+    """
+    marker = metafunc.definition.get_closest_marker("scenarios")
+    if marker is None or "cart_scenario" not in metafunc.fixturenames:
+        return
+    from utils.catalog import PRODUCTS_CSV, load_catalog
+    from utils.money import DEFAULT_CASH, OutcomeTable
+    from utils.scenarios import catalog_mismatches, iter_scenario_refs, parse_shard
+
+    outcomes = metafunc.config.scenario_outcomes
+    mismatches = metafunc.config.scenario_mismatches
+    for path in marker.args:
+        if path not in outcomes:
+            mismatches[path] = catalog_mismatches(path, load_catalog())
+            outcomes[path] = OutcomeTable.from_scenarios(path, DEFAULT_CASH, metafunc.config.cash_ratio)
+    shard = parse_shard(metafunc.config.getoption("--scenario-shard"))
+    limit = metafunc.config.getoption("--scenario-limit")
+    params = []
+    for path in marker.args:
+        for ref in iter_scenario_refs(path, shard, limit):
+            problem = mismatches[path].get(ref.line)
+            # The scenario data is the expected result: a disagreement with the catalog is reported, not fixed
+            marks = [pytest.mark.skip(reason=f"{ref.id} does not match {PRODUCTS_CSV}: {problem}")] if problem else []
+            params.append(pytest.param(ref, marks=marks, id=ref.id))
+    metafunc.parametrize("cart_scenario", params, indirect=True)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Keep the tests affected by the changes (--impact-base). Stub-only tests need --pos-stub,
+    benchmarks only run on request (--benchmark). Add transient-failure reruns, order tests by page state, apply the quarantine
+    and balance xdist workers over the tests left after -m/-k.
+    Runs before xdist, which appends the group to the node ids under --dist loadgroup.
+    """
+    selection = config.impact_selection
+    if selection is not None and not selection.run_all:
+        selected, deselected = [], []
+        for item in items:
+            (selected if selection.selects(history_id(item)) else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    if not config.getoption("--pos-stub"):
+        for item in items:
+            marker = item.get_closest_marker("stub_only")
+            if marker is not None:
+                item.add_marker(pytest.mark.skip(reason=f"stub only, run with --pos-stub: {marker.args[0]}"))
+
+    if not config.getoption("--benchmark"):
+        skip_benchmark = pytest.mark.skip(reason="benchmark, run with --benchmark")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
+    # Only timeouts and stale elements are retried, a wrong total is a real failure
+    reruns = config.getoption("--flaky-reruns")
+    if reruns and config.pluginmanager.hasplugin("rerunfailures"):
+        for item in items:
+            if item.get_closest_marker("flaky") is None:
+                item.add_marker(pytest.mark.flaky(reruns=reruns, only_rerun=TRANSIENT_ERRORS))
+
+    if config.getoption("--schedule") == "state":
+        order_by_page_state(items)
+
+    mode = config.getoption("--quarantine")
+    if mode != "off":
+        slow = []
+        for item in items:
+            reason = config.flake_history.quarantine_reason(history_id(item))
+            if reason is None:
+                continue
+            item.add_marker(pytest.mark.quarantined(reason))
+            if mode == "skip":
+                item.add_marker(pytest.mark.skip(reason=f"quarantined, {reason}"))
+            elif reason.startswith("flaky"):
+                item.add_marker(pytest.mark.xfail(reason=f"quarantined, {reason}", strict=False))
+            else:
+                slow.append(item)
+        # Slow tests run last, so they do not hold back the feedback of the rest
+        if slow:
+            items[:] = [item for item in items if item not in slow] + slow
+
+    # Collection runs on every worker; all of them read the same history, so they agree.
+    # -m/-k normally deselect after this hook: apply them first, so deselected tests do not weigh on a group
+    if is_xdist_worker(config) and config.getvalue("loadgroup"):
+        deselect_by_options(config, items)
+        assign_lpt_groups(items, config.workerinput["workercount"], config.flake_history.median_duration)
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Add this run's new Allure results to the result history (and delete superseded ones with --allure-prune).
+    Runs where every result is written: the xdist controller, or the only process of a plain run.
+    Skipped for --collect-only and runs where no test was selected, which have no results to add.
+    """
+    config = session.config
+    results_dir = getattr(config.option, "allure_report_dir", None)
+    if is_xdist_worker(config) or not results_dir or not config.getoption("--trends"):
+        return
+    if config.option.collectonly or exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+        return
+    from utils.allure_history import AllureResultIndex, ResultHistory, write_trends_html
+    index = AllureResultIndex(results_dir, prune=config.getoption("--allure-prune"))
+    results = index.update()
+    index.save()
+    history = ResultHistory(config.getoption("--result-history"))
+    config.trend_rows = history.add_run(results)
+    if config.trend_rows:
+        history.save()
+        write_trends_html(history, config.trend_rows, config.getoption("--trends"), config.getoption("--trends-report"))
 
-SCREENSHOTS_DIR = "logs/screenshots"
+def pytest_terminal_summary(terminalreporter, config):
+    page_loads = getattr(config, "page_loads", None)
+    if page_loads:
+        loads = [timing["load"] for timing in page_loads]
+        terminalreporter.section("Page load times")
+        terminalreporter.write_line(
+            f"browser profile '{config.getoption('--browser-profile')}': {len(loads)} page loads, "
+            f"p50 {percentile(loads, 50):.0f} ms, p95 {percentile(loads, 95):.0f} ms, "
+            f"{sum(t['resources'] for t in page_loads) / len(page_loads):.0f} resources per page"
+        )
+
+    manager = getattr(config, "ticket_manager", None)
+    dom = manager.dom_report() if manager else None
+    if dom:
+        terminalreporter.section("Sales page DOM size")
+        terminalreporter.write_line(
+            f"{dom['tests']} tests: {dom['first']} nodes after the first, {dom['last']} after the last "
+            f"(max {dom['max']}, growth {dom['growth']:+d})"
+        )
+
+    tracker = getattr(config, "flake_tracker", None)
+    if tracker is not None and tracker.flaky:
+        terminalreporter.section("Flaky tests")
+        for nodeid, (key, categories) in tracker.flaky.items():
+            terminalreporter.write_line(
+                f"{nodeid}: passed after {len(categories)} rerun(s) ({', '.join(categories)}), "
+                f"flake rate {config.flake_history.flake_rate(key):.0%}"
+            )
+
+    rows = getattr(config, "trend_rows", None)
+    if rows:
+        from utils.allure_history import format_row, largest_deltas, slowest
+        top = config.getoption("--trends")
+        terminalreporter.section("Test trends")
+        terminalreporter.write_line("slowest:")
+        for row in slowest(rows, top):
+            terminalreporter.write_line(f"  {format_row(row)}")
+        deltas = largest_deltas(rows, top)
+        if deltas:
+            terminalreporter.write_line("largest changes against the median of earlier passing runs:")
+            for row in deltas:
+                terminalreporter.write_line(f"  {format_row(row)}")
+        terminalreporter.write_line(f"trends report: {config.getoption('--trends-report')}")
+
+    timer = getattr(config, "startup_timer", None)
+    if timer is not None:
+        startup = timer.report(top=5)
+        terminalreporter.section("Startup timing")
+        terminalreporter.write_line(
+            f"{startup['cpu_before_configure']:.2f}s CPU before configure, "
+            f"collection {startup['phases'].get('collection', 0):.2f}s"
+        )
+        for path, seconds in startup["modules"].items():
+            terminalreporter.write_line(f"  {path}: {seconds:.3f}s")
+        for name, seconds in startup["slowest_imports"].items():
+            terminalreporter.write_line(f"  import {name}: {seconds:.3f}s")
+        terminalreporter.write_line(
+            f"heavy modules loaded: {', '.join(startup['heavy_modules_after_collection']) or 'none'}"
+        )
+
+    results = getattr(config, "benchmark_results", None)
+    if not results:
+        return
+    terminalreporter.section("POS UI benchmarks")
+    terminalreporter.write_line(f"{'flow':<24}{'ops/min':>10}{'p50 (s)':>10}{'p95 (s)':>10}{'max (s)':>10}")
+    for result in results:
+        stats = result.stats
+        terminalreporter.write_line(
+            f"{result.flow:<24}{result.ops_per_minute:>10}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['max']:>10.3f}"
+        )
+
+def browser_profile(config):
+    """--browser-profile debug (headed), ci (headless) or lean (headless + resource blocking)."""
+    from config.browser_profiles import get_profile
+
+    profile = get_profile(config.getoption("--browser-profile"))
+    if config.network_recorder is not None:
+        profile = replace(profile, capabilities={**profile.capabilities, **PERFORMANCE_LOGGING})
+    return profile
 
 @pytest.fixture(scope="session")
-def driver():
+def driver(pytestconfig):
     """
     Fixture to initialize and quit the WebDriver.
-    This fixture has 'session' scope, so it runs once per test session.
+    This fixture has 'session' scope, so it runs once per test session
+    (once per worker process when running with pytest-xdist).
+    With a driver pool it is a handle on a browser started during collection, which
+    the pool may swap for a fresh one between tests (see recycle_driver).
+    """
+    pool = pytestconfig.driver_pool
+
+    def prepare(driver):
+        if pytestconfig.network_recorder is not None:
+            pytestconfig.network_recorder.driver = driver
+        if pytestconfig.step_profiler is not None:
+            pytestconfig.step_profiler.instrument_driver(driver)
+        driver.implicitly_wait(10)
+
+    if pool is None:
+        driver = browser_profile(pytestconfig).start()
+        prepare(driver)
+        yield driver
+        driver.quit()
+        return
+
+    handle = pool.acquire()
+    prepare(handle)
+    pool.on_swap.append(prepare)
+    yield handle
+    pool.release(handle)
+
+@pytest.fixture(scope="session")
+def session_cache():
+    """
+    Authenticated session snapshot on disk, shared by every fixture and xdist worker.
+    Set POS_SESSION_TTL=0 to always log in through the UI.
+    """
+    return SessionCache(settings.SMART_SITE_POS, settings.USER, ttl=settings.SESSION_TTL)
+
+@pytest.fixture(scope="session")
+def sales_page(request, driver, session_cache):
+    """
+    Perform login and initialize the SalesPage.
+    Executed once per session, so every xdist worker owns one isolated, logged-in page.
+    The first worker logs in through the UI, the others restore its cached session.
+    """
+    from pages.sales_page import SalesPage
+    from services.auth_service import AuthService
+
+    def login(driver):
+        AuthService.login(
+            driver, settings.SMART_SITE_POS, settings.USER, settings.PASSWORD, INITIAL_CASH, session_cache
+        )
+
+    login(driver)
+    page = SalesPage(driver)
+    pool = request.config.driver_pool
+    if pool is not None:
+        # A recycled browser starts logged out: restore the cached session and forget the old elements
+        pool.on_swap.append(lambda handle: (login(handle), page.invalidate_cache()))
+    return page
+
+@pytest.fixture(scope="session")
+def inventory_cache():
+    """Inventory report index shared by the session's inventory tests (POS_INVENTORY_TTL seconds)."""
+    from pages.inventory_page import InventoryReportCache
+    return InventoryReportCache(ttl=settings.INVENTORY_TTL)
+
+@pytest.fixture
+def inventory_page(sales_page, inventory_cache):
     """
-    options = webdriver.ChromeOptions()
-    # options.add_argument("--headless=new")  # Remove if you want to see the browser
-    driver = webdriver.Chrome(options=options)
-    driver.maximize_window()
-    driver.implicitly_wait(10)
-    yield driver
-    driver.quit()
+    InventoryPage on the logged-in session. It navigates only when a test needs the live page,
+    and goes back to the sales view afterwards.
+    """
+    from pages.inventory_page import InventoryPage
+    page = InventoryPage(sales_page.driver, inventory_cache)
+    yield page
+    page.leave()
+    sales_page.invalidate_cache()
+
+@pytest.fixture(scope="session")
+def pos_api(sales_page):
+    """
+    Backend API client sharing the browser session, or None when API seeding is off.
+    Enable it with POS_API_SEEDING=1 (optionally POS_API_URL if the API lives elsewhere).
+    """
+    if not settings.API_SEEDING:
+        return None
+    from services.pos_api import PosApiClient
+    return PosApiClient.from_driver(sales_page.driver, settings.POS_API_URL)
+
+@pytest.fixture(scope="session")
+def ticket_manager(request, sales_page, pos_api):
+    """Session-wide ticket tracker; reports the DOM node count over the run."""
+    manager = TicketLifecycleManager(sales_page, pos_api)
+    request.config.ticket_manager = manager
+    return manager
+
+@pytest.fixture
+def ticket_lifecycle(request, ticket_manager):
+    """Remove every ticket the test opened once it finishes, keeping the DOM size constant."""
+    ticket_manager.begin()
+    yield ticket_manager
+    ticket_manager.cleanup(request.node.name)
+
+@pytest.fixture
+def cart_scenario(request):
+    """CartScenario of the CSV row this test was parametrized with (see pytest_generate_tests)."""
+    from utils.scenarios import load_scenario
+    return load_scenario(request.param)
+
+@pytest.fixture
+def scenario_outcome(request, cart_scenario):
+    """ScenarioOutcome (total, cash change, mixed payment split) precomputed for the cart_scenario row."""
+    ref = request.node.callspec.params["cart_scenario"]
+    return request.config.scenario_outcomes[ref.path].outcome(ref.line)
+
+@pytest.fixture(autouse=True)
+def page_load_timing(request):
+    """Collect the navigation timing of every new document a test ends on (page load time per profile, --page-load-timing)."""
+    yield
+    page_loads = request.config.page_loads
+    page = request.node.funcargs.get("sales_page")
+    if page_loads is None or page is None:
+        return
+    timing = page.get_navigation_timing()
+    if timing and (not page_loads or page_loads[-1]["id"] != timing["id"]):
+        page_loads.append(timing)
+
+@pytest.fixture(autouse=True)
+def recycle_driver(request):
+    """Swap the browser for a warm one once it served --recycle-after tests or grew --recycle-memory MB."""
+    yield
+    pool = request.config.driver_pool
+    if pool is not None and pool.recycling and "driver" in request.fixturenames:
+        pool.release_test(request.getfixturevalue("driver"))
+
+@pytest.fixture(autouse=True)
+def profile_steps(request):
+    """Tag page-object timings with the running test and attach them to Allure (--profile-steps)."""
+    profiler = request.config.step_profiler
+    if profiler is None:
+        yield
+        return
+    profiler.current_test = request.node.nodeid
+    yield
+    profiler.current_test = None
+    import allure
+    allure.attach(
+        json.dumps(profiler.test_summary(request.node.nodeid), indent=2),
+        name="Step timings",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+@pytest.fixture(autouse=True)
+def network_capture(request):
+    """Tag captured requests with the running test and attach its HAR and summary to Allure (--capture-network)."""
+    recorder = request.config.network_recorder
+    if recorder is not None and "driver" in request.fixturenames:
+        # Start the browser now, so the requests of the test's first actions are captured too
+        request.getfixturevalue("driver")
+    if recorder is None or recorder.driver is None:
+        yield
+        return
+    # Requests sent between tests, or still in flight from the previous one, count for the run only
+    recorder.drain()
+    recorder.finish_test()
+    recorder.current_test = request.node.nodeid
+    yield
+    recorder.drain()
+    recorder.current_test = None
+    try:
+        entries = recorder.test_entries(request.node.nodeid)
+        if not entries:
+            return
+        import allure
+        allure.attach(
+            json.dumps(recorder.to_har(entries), indent=2),
+            name="Network (HAR)",
+            attachment_type=allure.attachment_type.JSON,
+            extension="har",
+        )
+        allure.attach(
+            recorder.format_table(recorder.test_summary(request.node.nodeid)),
+            name="Backend requests per action",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+    finally:
+        # Only the run summary outlives the test, not its requests
+        recorder.finish_test()
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -28,22 +761,36 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
 
+    # Read by the flake tracker and impact recorder: same id across runs, whatever the seed drew
+    report.history_id = history_id(item)
+
+    # Read by the impact recorder: symbols exercised during this phase of the test
+    tracer = item.config.impact_tracer
+    if tracer is not None:
+        report.impact = tracer.stop()
+        tracer.start()
+
+    # Read by the flake tracker: timeout, stale, assertion or error
+    if call.excinfo is not None:
+        report.failure_category = classify_failure(call.excinfo)
+
     if report.when == "call" and report.failed:
         driver = item.funcargs.get("driver", None)
         if driver:
-            os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
-
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             test_name = item.name
+            # Worker id keeps parallel failures of the same test from overwriting each other
             screenshot_path = os.path.join(
-                SCREENSHOTS_DIR, f"{test_name}_{timestamp}.png"
+                SCREENSHOTS_DIR, f"{SCREENSHOT_PREFIX}{test_name}_{get_worker_id()}_{timestamp}.png"
             )
 
-            driver.save_screenshot(screenshot_path)
+            import allure
 
-            with open(screenshot_path, "rb") as image:
-                allure.attach(
-                    image.read(),
-                    name=f"Screenshot - {test_name}",
-                    attachment_type=allure.attachment_type.PNG
-                )
\ No newline at end of file
+            # Capture once in memory: Allure gets the bytes now, the disk copy is written in background
+            png = driver.get_screenshot_as_png()
+            allure.attach(
+                png,
+                name=f"Screenshot - {test_name}",
+                attachment_type=allure.attachment_type.PNG
+            )
+            get_screenshot_writer().submit(png, screenshot_path)
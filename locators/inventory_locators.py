@@ -0,0 +1,28 @@
+# locators/inventory_locators.py
+from selenium.webdriver.common.by import By
+
+class InventoryLocators:
+    """Locators for Inventory Page elements."""
+
+    # Navigation
+    inventory_btn = (By.LINK_TEXT, "Inventario")
+    inventory_report_btn = (By.LINK_TEXT, "Reporte de inventario")
+    inventory_title = (By.CLASS_NAME, "size-titulo-seccion")
+
+    # Inventory report table. Taken from the bundled POS stub (stub_server/templates/inventory_report.html),
+    # not yet verified against the live POS: tests reading the table are marked stub_only.
+    report_table = (By.ID, "tablaReporteInventario")
+    report_name_cell = (By.CSS_SELECTOR, ".nombre-producto")
+    report_price_cell = (By.CSS_SELECTOR, ".precio-producto")
+    report_stock_cell = (By.CSS_SELECTOR, ".existencia-producto")
+
+    # Product form and list (not available yet)
+    '''
+    add_product_btn = (By.ID, "add-product-btn")
+    name_input = (By.ID, "product-name")
+    price_input = (By.ID, "product-price")
+    code_input = (By.ID, "product-code")
+    stock_input = (By.ID, "product-stock")
+    save_btn = (By.ID, "save-product")
+    error_message = (By.ID, "error-message")
+    '''
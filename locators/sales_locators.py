@@ -13,6 +13,7 @@ class SalesLocators:
     # Product management
     remove_product_btn = (By.XPATH, '//img[@onclick="eliminarProductoTicketNormalActual(this);"]')
     products_on_ticket = (By.CSS_SELECTOR, ".widget-list-item-description-title")
+    product_prices_on_ticket = (By.CSS_SELECTOR, ".widget-list-item-description-subtitle")
 
     # Ticket removal confirmation
     remove_ticket_confirm = (By.CSS_SELECTOR, ".swal2-confirm")
@@ -33,6 +34,11 @@ class SalesLocators:
     accept_payment = (By.ID, "finalizarCompraTicketNormal")
 
     # --- Dynamic locators ---
+    @staticmethod
+    def ticket_tab(ticket_id: str):
+        """Return locator for the tab link of the given ticket."""
+        return (By.ID, f"nuevoTicketContenido{ticket_id}-tab")
+
     @staticmethod
     def product_input(ticket_id: str):
         """Return locator for product input field based on ticket ID."""
@@ -43,6 +49,11 @@ class SalesLocators:
         """Return locator for product add button based on ticket ID."""
         return (By.XPATH, f'//*[@id="listaProductosBusqueda{ticket_id}"]/div')
 
+    @staticmethod
+    def search_results(ticket_id: str):
+        """Return locator for the clickable product cells of a ticket's search results."""
+        return (By.XPATH, f'//*[@id="listaProductosBusqueda{ticket_id}"]//*[contains(@class, "col-7")]')
+
     @staticmethod
     def total_ticket_price(ticket_id: str):
         """Return locator for total ticket price label."""
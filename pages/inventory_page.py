@@ -1,69 +1,178 @@
 # pages/inventory_page.py
+import time
+from decimal import Decimal
+from typing import NamedTuple
+from locators.inventory_locators import InventoryLocators
+from utils.base_page import BasePage
+from utils.money import parse_amount
+from config.logger import get_logger
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
+logger = get_logger(__name__)
 
-class InventoryPage:
+# Reads the whole inventory report table in one WebDriver round-trip. arguments[0] holds the selectors.
+JS_INVENTORY_REPORT = """
+var loc = arguments[0];
+var table = document.getElementById(loc.table);
+if (!table) { return null; }
+var cell = function(row, selector) { var el = row.querySelector(selector); return el ? el.textContent.trim() : null; };
+return Array.prototype.map.call(table.querySelectorAll('tbody tr'), function(row) {
+    return [cell(row, loc.name), cell(row, loc.price), cell(row, loc.stock)];
+});
+"""
+
+
+class InventoryItem(NamedTuple):
+    """One row of the inventory report."""
+    name: str
+    price: Decimal | None
+    stock: int | None
+
+
+def _parse_stock(text: str | None) -> int | None:
+    try:
+        return int(float(text.replace(",", ""))) if text else None
+    except ValueError:
+        return None
+
+
+class InventoryIndex:
+    """In-memory, queryable copy of the inventory report."""
+
+    def __init__(self, items: list[InventoryItem]):
+        self.items = items
+        self._by_name = {item.name: item for item in items}
+        self._lowered = [(item.name.lower(), item) for item in items]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, name) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> InventoryItem | None:
+        return self._by_name.get(name)
+
+    def search(self, term: str) -> list[InventoryItem]:
+        """Products whose name contains `term` (case-insensitive), in report order."""
+        term = term.lower()
+        return [item for lowered, item in self._lowered if term in lowered]
+
+
+class InventoryReportCache:
+    """
+    Inventory report index shared by every InventoryPage of the session.
+    The report is read-only for the tests, so it is scraped once and reused until `ttl` expires
+    (or invalidate() is called after changing the inventory).
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self.index: InventoryIndex | None = None
+        self.loaded_at = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return self.index is not None and time.monotonic() - self.loaded_at < self.ttl
+
+    def store(self, index: InventoryIndex):
+        self.index = index
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self.index = None
+
+
+class InventoryPage(BasePage):
     """
     Page Object for the inventory management page.
-    Encapsulates locators and actions to interact with the inventory.
+    Navigates lazily: nothing is clicked until an action needs the inventory views,
+    and report lookups are answered from the cached report index.
     """
 
-    def __init__(self, driver):
-        self.driver = driver
-        
-        # Go to inventory page
-        self.inventory_btn = (By.LINK_TEXT, "Inventario")
-        self.driver.find_element(*self.inventory_btn).click()
-        
-        # Locators for Inventario pages
-        self.inventory_report_btn = (By.LINK_TEXT, "Reporte de inventario")
-        self.inventory_title = (By.CLASS_NAME, "size-titulo-seccion")
-        '''
-        self.add_product_btn = (By.ID, "add-product-btn")
-        self.name_input = (By.ID, "product-name")
-        self.price_input = (By.ID, "product-price")
-        self.code_input = (By.ID, "product-code")
-        self.stock_input = (By.ID, "product-stock")
-        self.save_btn = (By.ID, "save-product")
-        self.error_message = (By.ID, "error-message")
-        self.search_box = (By.ID, "search-box")
-        self.product_list_items = (By.CSS_SELECTOR, ".product-list .product-item"
-        '''
-        
-    def inventory_report(self):
-        self.driver.find_element(*self.inventory_report_btn).click()
-        return self.driver.find_element(*self.inventory_title).text
+    def __init__(self, driver, cache: InventoryReportCache | None = None, timeout: int = 10):
+        super().__init__(driver, timeout)
+        self.cache = cache or InventoryReportCache()
+        self._view: str | None = None  # "inventory" or "report" once navigated there
+        self._start_url: str | None = None
+
+    # ---------- Navigation ----------
+
+    def open(self):
+        """Go to the inventory page, unless this page object already did."""
+        if self._view is None:
+            self._start_url = self.driver.current_url
+            self.wait_and_click(InventoryLocators.inventory_btn)
+            self._view = "inventory"
+
+    def leave(self):
+        """Return to the page the inventory was opened from, if it was opened at all."""
+        if self._view is not None:
+            self.driver.get(self._start_url)
+            self.invalidate_cache()
+            self._view = None
+
+    def open_report(self):
+        """Go to the inventory report, unless it is already displayed."""
+        if self._view != "report":
+            self.open()
+            self.wait_and_click(InventoryLocators.inventory_report_btn)
+            self.wait_for_element(InventoryLocators.report_table)
+            self._view = "report"
+
+    def inventory_report(self) -> str:
+        """Open the inventory report and return its title."""
+        self.open_report()
+        return self.get_text(InventoryLocators.inventory_title)
+
+    # ---------- Report index ----------
+
+    def report_index(self, refresh: bool = False) -> InventoryIndex:
+        """Return the inventory report index, scraping the table only when the cache is empty or expired."""
+        if refresh or not self.cache.fresh:
+            self.open_report()
+            rows = self.driver.execute_script(JS_INVENTORY_REPORT, {
+                "table": InventoryLocators.report_table[1],
+                "name": InventoryLocators.report_name_cell[1],
+                "price": InventoryLocators.report_price_cell[1],
+                "stock": InventoryLocators.report_stock_cell[1],
+            }) or []
+            index = InventoryIndex([
+                InventoryItem(name, parse_amount(price), _parse_stock(stock))
+                for name, price, stock in rows if name
+            ])
+            self.cache.store(index)
+            logger.info("Inventory report indexed: %d products", len(index))
+        return self.cache.index
+
+    def search_product(self, search_term: str) -> list[str]:
+        """Search for products by name or partial name and return their names."""
+        return [item.name for item in self.report_index().search(search_term)]
+
+    def is_product_in_list(self, product_name: str) -> bool:
+        """Check if a product appears in the inventory report."""
+        return product_name in self.report_index()
+
+    def get_product(self, product_name: str) -> InventoryItem | None:
+        """Return the report row of a product (price and stock), or None."""
+        return self.report_index().get(product_name)
 
 '''
     def add_product(self, name, price, code, stock):
         """Add a new product to the inventory."""
-        self.driver.find_element(*self.add_product_btn).click()
-        self.driver.find_element(*self.name_input).clear()
-        self.driver.find_element(*self.name_input).send_keys(name)
-        self.driver.find_element(*self.price_input).clear()
-        self.driver.find_element(*self.price_input).send_keys(price)
-        self.driver.find_element(*self.code_input).clear()
-        self.driver.find_element(*self.code_input).send_keys(code)
-        self.driver.find_element(*self.stock_input).clear()
-        self.driver.find_element(*self.stock_input).send_keys(stock)
-        self.driver.find_element(*self.save_btn).click()
+        self.driver.find_element(*InventoryLocators.add_product_btn).click()
+        self.driver.find_element(*InventoryLocators.name_input).clear()
+        self.driver.find_element(*InventoryLocators.name_input).send_keys(name)
+        self.driver.find_element(*InventoryLocators.price_input).clear()
+        self.driver.find_element(*InventoryLocators.price_input).send_keys(price)
+        self.driver.find_element(*InventoryLocators.code_input).clear()
+        self.driver.find_element(*InventoryLocators.code_input).send_keys(code)
+        self.driver.find_element(*InventoryLocators.stock_input).clear()
+        self.driver.find_element(*InventoryLocators.stock_input).send_keys(stock)
+        self.driver.find_element(*InventoryLocators.save_btn).click()
+        # The cached report no longer matches the inventory
+        self.cache.invalidate()
 
     def get_error_message(self):
         """Return the validation or business rule error message."""
-        return self.driver.find_element(*self.error_message).text
-
-    def search_product(self, search_term):
-        """Search for products by name or partial name and return their text."""
-        search = self.driver.find_element(*self.search_box)
-        search.clear()
-        search.send_keys(search_term)
-        search.send_keys(Keys.RETURN)
-        products = self.driver.find_elements(*self.product_list_items)
-        return [p.text for p in products]
-
-    def is_product_in_list(self, product_name):
-        """Check if a product appears in the product list."""
-        products = self.driver.find_elements(*self.product_list_items)
-        return any(product_name in p.text for p in products)
-'''
\ No newline at end of file
+        return self.driver.find_element(*InventoryLocators.error_message).text
+'''
@@ -35,6 +35,23 @@ class LoginPage:
         self.driver.find_element(*self.password_input).send_keys(password)
         self.driver.find_element(*self.login_button).click()
 
+    def is_displayed(self) -> bool:
+        """
+        Check if the login form is on screen.
+        Uses a script instead of find_element so the implicit wait is not paid when it is absent.
+        """
+        return self.driver.execute_script(
+            "return document.getElementById(arguments[0]) !== null;", self.username_input[1]
+        )
+
+    def is_initial_cash_displayed(self) -> bool:
+        """
+        Check if the initial cash form is on screen.
+        """
+        return self.driver.execute_script(
+            "return document.getElementsByName(arguments[0]).length > 0;", self.initial_cash[1]
+        )
+
     def get_error_message(self):
         """
         Get error message if login fails.
@@ -1,14 +1,66 @@
 # pages/sales_page.py
+from decimal import Decimal
+from dataclasses import dataclass, field
 from config.logger import get_logger
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from locators.sales_locators import SalesLocators
-from utils.base_page import BasePage
+from utils.base_page import BasePage, JS_FIND_ALL
+from utils.money import DEFAULT_CASH_RATIO, parse_amount, split_payment, to_money
 from selenium.webdriver.common.by import By
-import time
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
 
 logger = get_logger(__name__)
 
+# Reads the whole ticket state in one WebDriver round-trip. arguments[0] holds the locators.
+JS_TICKET_SNAPSHOT = JS_FIND_ALL + """
+var loc = arguments[0];
+var texts = function(l) { return findAll(l[0], l[1]).map(function(e) { return e.innerText.trim(); }); };
+var active = findAll(loc.ticket_name[0], loc.ticket_name[1]);
+var activeName = active.length ? active[0].innerText.trim() : null;
+var ticketId = activeName ? activeName.split(' ')[1] : null;
+var total = ticketId === null ? [] : findAll(loc.total[0], loc.total[1].replace('{ticket_id}', ticketId));
+return {
+    ticket_id: ticketId,
+    ticket_names: texts(loc.all_tickets),
+    item_names: texts(loc.items),
+    item_prices: texts(loc.prices),
+    remove_buttons: findAll(loc.remove[0], loc.remove[1]).length,
+    total_text: total.length ? total[0].innerText.trim() : null
+};
+"""
+
+
+@dataclass
+class LineItem:
+    """One product line of the active ticket."""
+    name: str
+    price: Decimal | None
+    remove_index: int | None
+
+
+@dataclass
+class TicketSnapshot:
+    """State of the sales view captured in a single execute_script call."""
+    ticket_id: str | None
+    ticket_names: list[str] = field(default_factory=list)
+    items: list[LineItem] = field(default_factory=list)
+    total_text: str | None = None
+
+    @property
+    def total(self) -> Decimal | None:
+        return parse_amount(self.total_text)
+
+    @property
+    def item_names(self) -> list[str]:
+        return [item.name for item in self.items]
+
+    def find_item(self, name: str) -> LineItem | None:
+        """Return the first line item with the given product name."""
+        return next((item for item in self.items if item.name == name), None)
+
 class SalesPage(BasePage):
     """Page Object for Sales Page.
     Contains methods to interact with tickets, products, and payment options.
@@ -18,16 +70,43 @@ class SalesPage(BasePage):
         super().__init__(driver, timeout)  # inherits BasePage methods
         self.driver = driver
         self.timeout = timeout
+        # Active ticket ID, memoized until a ticket-changing action runs
+        self._ticket_id: str | None = None
+
+    def invalidate_cache(self):
+        """Forget cached elements and the memoized active ticket."""
+        super().invalidate_cache()
+        self._ticket_id = None
+
+    def _switch_ticket(self, ticket_name: str | None = None):
+        """
+        Another ticket became active: `.nav-link.active` and friends now point elsewhere.
+        Drop the cached elements and remember the new ticket if its tab name is known.
+        """
+        self.invalidate_cache()
+        parts = (ticket_name or "").split(" ")
+        self._ticket_id = parts[1] if len(parts) > 1 else None
 
     # ---------- Ticket actions ----------
 
     def start_new_ticket(self):
-        """Create a new ticket."""
+        """Create a new ticket and wait until its tab is the active one."""
+        previous_ticket = self.read_text(SalesLocators.ticket_name)
         self.wait_and_click(SalesLocators.new_ticket_btn)
+        self._switch_ticket(self.wait_for_text_change(SalesLocators.ticket_name, previous_ticket))
+
+    def open_ticket(self, ticket_id: str, reload: bool = False):
+        """Activate the tab of a ticket. Reload first if the ticket was created outside the UI."""
+        if reload:
+            self.refresh()
+        self.wait_and_click(SalesLocators.ticket_tab(ticket_id))
+        self._switch_ticket(f"Ticket {ticket_id}")
 
     def get_ticket_id(self) -> str:
-        """Return the current active ticket ID."""
-        return self.get_text(SalesLocators.ticket_name).split(" ")[1]
+        """Return the current active ticket ID (read once, then memoized until the ticket changes)."""
+        if self._ticket_id is None:
+            self._ticket_id = self.get_text(SalesLocators.ticket_name).split(" ")[1]
+        return self._ticket_id
 
     def remove_current_ticket(self, confirm=True):
         """Remove current ticket. Confirm or cancel based on 'confirm' flag."""
@@ -35,55 +114,120 @@ class SalesPage(BasePage):
         self.wait_and_click(SalesLocators.ticket_remove_icon(ticket_id))
         if confirm:
             self.wait_and_click(SalesLocators.remove_ticket_confirm)
+            # Another ticket becomes active once the removal went through
+            self._switch_ticket(self.wait_for_text_change(SalesLocators.ticket_name, f"Ticket {ticket_id}"))
         else:
             self.wait_and_click(SalesLocators.remove_ticket_cancel)
 
     def get_ticket_list(self) -> list[str]:
         """Return all open tickets as a list of names."""
-        tickets = self.driver.find_elements(*SalesLocators.all_tickets)
-        return [ticket.text.strip() for ticket in tickets]
+        return self.get_ticket_snapshot().ticket_names
+
+    def get_ticket_snapshot(self) -> TicketSnapshot:
+        """
+        Return the active ticket ID, tab names, line items (with prices and
+        remove-button indices) and total, read in one WebDriver round-trip.
+        """
+        state = self.driver.execute_script(JS_TICKET_SNAPSHOT, {
+            "ticket_name": SalesLocators.ticket_name,
+            "all_tickets": SalesLocators.all_tickets,
+            "items": SalesLocators.products_on_ticket,
+            "prices": SalesLocators.product_prices_on_ticket,
+            "remove": SalesLocators.remove_product_btn,
+            "total": SalesLocators.total_ticket_price("{ticket_id}"),
+        })
+        prices = state["item_prices"]
+        items = [
+            LineItem(
+                name=name,
+                price=parse_amount(prices[i]) if i < len(prices) else None,
+                remove_index=i if i < state["remove_buttons"] else None,
+            )
+            for i, name in enumerate(state["item_names"])
+        ]
+        snapshot = TicketSnapshot(state["ticket_id"], state["ticket_names"], items, state["total_text"])
+        if snapshot.ticket_id != self._ticket_id:
+            # The active ticket changed outside the tracked actions, the cached elements may point elsewhere
+            self.invalidate_cache()
+        self._ticket_id = snapshot.ticket_id
+        logger.debug("Ticket snapshot: %s", snapshot)
+        return snapshot
 
     # ---------- Product actions ----------
 
     def add_product_by_code(self, code: str):
         """Add a product to the ticket using its code."""
         ticket_id = self.get_ticket_id()
-        input_box = self.write_input(SalesLocators.product_input(ticket_id), code)
-        time.sleep(1.5)
-        results = self.driver.find_elements(By.CSS_SELECTOR, ".col-7")
-        for result in results:
-            product_name = result.text.strip().split("\n")[0]
-            if product_name == code:
-                result.click()
-                break
-        logger.info(f"Product {code} added to ticket {ticket_id}")
-        time.sleep(0.5)
+        self.search_product(code)
+        previous_total = self.select_search_result(code)
+        self.wait_for_total_change(previous_total)
+        logger.info("Product %s added to ticket %s", code, ticket_id)
+
+    def search_product(self, code: str):
+        """Type `code` into the product search of the active ticket. The search XHR runs in the background."""
+        self.write_input(SalesLocators.product_input(self.get_ticket_id()), code)
+
+    def select_search_result(self, code: str) -> str | None:
+        """
+        Click the search result named `code` in the active ticket, without waiting for the add to land.
+
+        Returns:
+            str | None: Total label before the click, for wait_for_total_change().
+        """
+        ticket_id = self.get_ticket_id()
+        previous_total = self.read_text(SalesLocators.total_ticket_price(ticket_id))
+        # Search results are rendered once the product search XHR answers
+        locator = SalesLocators.search_results(ticket_id)
+        results = self.wait_for_list_settled(locator, contains=code)
+        index = [text.strip().split("\n")[0] for text in results].index(code)
+        self.driver.find_elements(*locator)[index].click()
+        return previous_total
+
+    def wait_for_total_change(self, previous_total: str | None, ticket_id: str | None = None) -> str:
+        """Wait until the total of a ticket (default: the active one) differs from `previous_total`."""
+        ticket_id = ticket_id or self.get_ticket_id()
+        return self.wait_for_text_change(SalesLocators.total_ticket_price(ticket_id), previous_total)
+
+    def wait_for_ticket_items(self, count: int, timeout: float | None = None) -> TicketSnapshot:
+        """Wait until the active ticket lists at least `count` products and return its snapshot."""
+        def listed(driver):
+            snapshot = self.get_ticket_snapshot()
+            return snapshot if len(snapshot.items) >= count else None
+        return self.wait_until(listed, f"{count} items on the ticket", timeout)
 
     def remove_product_by_code(self, code: str):
         """Remove a product from ticket by its code name."""
-        products = self.driver.find_elements(*SalesLocators.products_on_ticket)
-        names = [item.text for item in products]
-        logger.debug(names)
-        try:
-            idx = names.index(code)
-            n = self.driver.find_elements(*SalesLocators.remove_product_btn)
-            n_rm = len(n)
-            logger.debug(n)
-            logger.debug(n_rm)
-            self.driver.find_elements(*SalesLocators.remove_product_btn)[idx].click()
-            self.wait_and_click(SalesLocators.remove_ticket_confirm)
-            logger.info(f"Product '{code}' removed from ticket.")
-        except ValueError:
-            logger.error(f"Product '{code}' not found in ticket.")
-            raise
-
-    def get_ticket_total(self) -> float:
-        """Return total amount for current ticket."""
-        time.sleep(0.5)
+        snapshot = self.get_ticket_snapshot()
+        item = snapshot.find_item(code)
+        if item is None or item.remove_index is None:
+            logger.error("Product '%s' not found in ticket.", code)
+            raise ValueError(f"Product '{code}' not found in ticket {snapshot.ticket_id}: {snapshot.item_names}")
+        self.driver.find_elements(*SalesLocators.remove_product_btn)[item.remove_index].click()
+        self.wait_and_click(SalesLocators.remove_ticket_confirm)
+        self.wait_for_text_change(SalesLocators.total_ticket_price(snapshot.ticket_id), snapshot.total_text)
+        logger.info("Product '%s' removed from ticket.", code)
+
+    def get_ticket_total(self) -> Decimal:
+        """
+        Return total amount for current ticket, once the network is idle and its total label shows an amount.
+        Raises ValueError if the label is missing or not an amount after the page timeout.
+        """
+        self.wait_for_network_idle()
         ticket_id = self.get_ticket_id()
-        logger.debug(f"ticket id={ticket_id}")
-        total_text = self.get_text(SalesLocators.total_ticket_price(ticket_id))
-        return float(total_text.split()[1])
+        locator = SalesLocators.total_ticket_price(ticket_id)
+        last = {"text": None}
+
+        def shown(driver):
+            last["text"] = self.read_text(locator)
+            # The text, not the amount: a 0.00 total is ready too
+            return last["text"] if parse_amount(last["text"]) is not None else None
+
+        try:
+            text = self.wait_until(shown, f"total of ticket {ticket_id}")
+        except TimeoutException:
+            raise ValueError(f"Total of ticket {ticket_id} is not an amount: {last['text']!r}") from None
+        logger.debug("ticket id=%s total=%s", ticket_id, text)
+        return parse_amount(text)
 
     # ---------- Payment actions ----------
 
@@ -92,31 +236,38 @@ class SalesPage(BasePage):
         ticket_id = self.get_ticket_id()
         self.wait_and_click(SalesLocators.pay_button(ticket_id))
 
-    def pay_with_cash(self, cash_used: float) -> float:
+    def close_payment_modal(self):
+        """Close the payment modal without finishing the sale."""
+        ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+
+    def pay_with_cash(self, cash_used) -> Decimal | None:
         """Pay ticket using cash. Returns change."""
         self.open_payment_modal()
-        self.write_input(SalesLocators.client_cash_input, str(cash_used))
-        change = float(self.get_value(SalesLocators.change))
+        self.write_input(SalesLocators.client_cash_input, str(to_money(cash_used)))
+        change = parse_amount(self.get_value(SalesLocators.change))
         self.wait_and_click(SalesLocators.accept_payment)
+        # The paid ticket is closed and the POS activates another one
+        self._switch_ticket()
         return change
 
-    def pay_with_card(self, reference_card: str) -> float:
+    def pay_with_card(self, reference_card: str) -> Decimal | None:
         """Pay ticket using card. Returns total amount."""
         self.open_payment_modal()
         self.wait_and_click(SalesLocators.payment_with_card)
         self.write_input(SalesLocators.reference_card_input, reference_card)
-        return float(self.get_value(SalesLocators.total_price_card))
+        return parse_amount(self.get_value(SalesLocators.total_price_card))
 
-    def mix_payment_cash(self, cash_used: float) -> tuple[float, float]:
+    def mix_payment_cash(self, cash_used, cash_ratio=DEFAULT_CASH_RATIO) -> tuple[Decimal | None, Decimal | None]:
         """Pay ticket using mixed payment (cash + card).
+        `cash_ratio` of the total is charged in cash (rounded to cents), the rest to the card.
         Returns (change, remaining card amount).
         """
         self.open_payment_modal()
         self.wait_and_click(SalesLocators.payment_with_cash_and_card)
-        total_to_pay = float(self.get_text(SalesLocators.total_to_pay).split()[1])
-        total_cash = total_to_pay * 0.8  # assume 80% cash, 20% card
+        total_to_pay = parse_amount(self.get_text(SalesLocators.total_to_pay))
+        total_cash = split_payment(total_to_pay, cash_used, cash_ratio).cash
         self.write_input(SalesLocators.total_cash_input, str(total_cash))
-        self.write_input(SalesLocators.client_cash_input, str(cash_used))
-        change = float(self.get_value(SalesLocators.change))
-        remaining_card = float(self.get_value(SalesLocators.in_card))
+        self.write_input(SalesLocators.client_cash_input, str(to_money(cash_used)))
+        change = parse_amount(self.get_value(SalesLocators.change))
+        remaining_card = parse_amount(self.get_value(SalesLocators.in_card))
         return change, remaining_card
\ No newline at end of file
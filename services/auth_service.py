@@ -0,0 +1,50 @@
+# services/auth_service.py
+from pages.login_page import LoginPage
+from utils.session_cache import SessionCache
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AuthService:
+    """
+    Business-level actions for authentication.
+    Restores a cached session when possible and falls back to the LoginPage flow.
+    """
+
+    @staticmethod
+    def login(driver, base_url: str, user: str, password: str, initial_cash, cache: SessionCache) -> bool:
+        """
+        Leave the driver logged in on the sales view.
+
+        Args:
+            driver: WebDriver instance (usually a fresh one).
+            base_url (str): Smart Site POS URL.
+            user (str): Login email.
+            password (str): Login password.
+            initial_cash: Amount for the initial cash form.
+            cache (SessionCache): Session snapshot shared between fixtures and workers.
+
+        Returns:
+            bool: True if the cached session was reused, False if the UI login ran.
+        """
+        with cache.lock():
+            if cache.restore(driver):
+                login_page = LoginPage(driver)
+                if not login_page.is_displayed():
+                    if login_page.is_initial_cash_displayed():
+                        login_page.set_initial_cash(initial_cash)
+                    return True
+                logger.warning("Cached session rejected by the server, logging in through the UI")
+                cache.clear()
+
+            AuthService.login_with_ui(driver, base_url, user, password, initial_cash)
+            cache.save(driver)
+            return False
+
+    @staticmethod
+    def login_with_ui(driver, base_url: str, user: str, password: str, initial_cash):
+        """Run the full LoginPage flow: load, login and set the initial cash."""
+        login_page = LoginPage(driver)
+        login_page.load(base_url)
+        login_page.login(user, password)
+        login_page.set_initial_cash(initial_cash)
@@ -0,0 +1,101 @@
+# services/pos_api.py
+from urllib.parse import unquote
+import requests
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PosApiEndpoints:
+    """Backend routes used by the Smart Site POS sales view."""
+
+    products = "/api/products"
+    tickets = "/api/tickets"
+
+    @staticmethod
+    def ticket(ticket_id: str):
+        """Return the route of a single ticket."""
+        return f"/api/tickets/{ticket_id}"
+
+    @staticmethod
+    def ticket_items(ticket_id: str):
+        """Return the route to add items to a ticket in bulk."""
+        return f"/api/tickets/{ticket_id}/items"
+
+
+class PosApiClient:
+    """
+    HTTP client for the POS backend.
+    Shares the browser session cookies, so tickets created here belong to
+    the same logged-in user the Selenium driver is using.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session | None = None, timeout: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.session.headers.update({
+            "Accept": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+
+    @classmethod
+    def from_driver(cls, driver, base_url: str, timeout: int = 10) -> "PosApiClient":
+        """
+        Build a client that reuses the cookies and user agent of a logged-in driver.
+
+        Args:
+            driver: Logged-in WebDriver instance.
+            base_url (str): Backend base URL.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            PosApiClient: Client bound to the browser session.
+        """
+        session = requests.Session()
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+            # Laravel style CSRF protection: echo the XSRF cookie back as a header
+            if cookie["name"] == "XSRF-TOKEN":
+                session.headers["X-XSRF-TOKEN"] = unquote(cookie["value"])
+        return cls(base_url, session, timeout)
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        elapsed = response.elapsed.total_seconds()
+        logger.debug("%s %s -> %s in %.3fs", method, path, response.status_code, elapsed, extra={"elapsed": elapsed})
+        return response.json() if response.content else {}
+
+    # ---------- Products ----------
+
+    def search_products(self, query: str) -> list[dict]:
+        """Return the products matching `query` (same search the ticket input runs)."""
+        return self._request("GET", PosApiEndpoints.products, params={"q": query})["products"]
+
+    # ---------- Tickets ----------
+
+    def create_ticket(self, product_names: list[str] | None = None) -> dict:
+        """
+        Create a ticket, optionally already filled with products, in a single round-trip.
+
+        Returns:
+            dict: Ticket payload with at least 'id', 'items' and 'total'.
+        """
+        items = [{"name": name, "quantity": 1} for name in product_names or []]
+        ticket = self._request("POST", PosApiEndpoints.tickets, json={"items": items})
+        logger.info("Ticket %s seeded with %d items through the API", ticket["id"], len(items))
+        return ticket
+
+    def add_items(self, ticket_id: str, product_names: list[str]) -> dict:
+        """Add several products to an existing ticket in one request."""
+        items = [{"name": name, "quantity": 1} for name in product_names]
+        return self._request("POST", PosApiEndpoints.ticket_items(ticket_id), json={"items": items})
+
+    def get_ticket(self, ticket_id: str) -> dict:
+        """Return the ticket payload."""
+        return self._request("GET", PosApiEndpoints.ticket(ticket_id))
+
+    def delete_ticket(self, ticket_id: str):
+        """Delete the ticket."""
+        self._request("DELETE", PosApiEndpoints.ticket(ticket_id))
@@ -1,4 +1,7 @@
 # services/sales_service.py
+from decimal import Decimal
+from utils.catalog import total_price
+from utils.money import to_money
 
 class SalesService:
     """
@@ -7,21 +10,110 @@ class SalesService:
     """
 
     @staticmethod
-    def add_items_and_get_expected_total(sales_page, products) -> float:
+    def add_items_and_get_expected_total(sales_page, products) -> Decimal:
         """
         Add multiple products to the current ticket and calculate expected total.
 
         Args:
             sales_page (SalesPage): Instance of SalesPage.
-            products (list): List of products with 'name' and 'price'.
+            products (list): List of catalog Products (name, exact Decimal price).
 
         Returns:
-            float: Expected total price after adding all products.
+            Decimal: Expected total price after adding all products, in cents.
         """
-        expected_total = 0.0
-
         for product in products:
-            sales_page.add_product_by_code(product["name"])
-            expected_total += float(product["price"])
+            sales_page.add_product_by_code(product.name)
+
+        return to_money(total_price(products))
+
+    @staticmethod
+    def build_cart(sales_page, products, pos_api=None) -> Decimal:
+        """
+        Open a new ticket holding `products` and return the expected total.
+        With a PosApiClient the ticket is seeded in one HTTP round-trip and only
+        opened in the browser; otherwise products are added through the search UI.
+
+        Args:
+            sales_page (SalesPage): Instance of SalesPage.
+            products (list): List of catalog Products (name, exact Decimal price).
+            pos_api (PosApiClient | None): Client sharing the browser session.
+
+        Returns:
+            Decimal: Expected total price of the ticket, in cents.
+        """
+        SalesService.open_ticket_with(sales_page, [product.name for product in products], pos_api)
+        return to_money(total_price(products))
+
+    @staticmethod
+    def open_ticket_with(sales_page, product_names, pos_api=None):
+        """
+        Open a new ticket holding the products called `product_names`.
+        Seeds it through the API when a PosApiClient is given, otherwise through the search UI.
+
+        Args:
+            sales_page (SalesPage): Instance of SalesPage.
+            product_names (list[str]): Product names, as typed in the product search.
+            pos_api (PosApiClient | None): Client sharing the browser session.
+        """
+        if pos_api is None:
+            sales_page.start_new_ticket()
+            for name in product_names:
+                sales_page.add_product_by_code(name)
+            return
+
+        ticket = pos_api.create_ticket(list(product_names))
+        sales_page.open_ticket(ticket["id"], reload=True)
 
-        return expected_total
\ No newline at end of file
+    @staticmethod
+    def build_carts_pipelined(sales_page, carts) -> dict[str, tuple]:
+        """
+        Build several carts at once, each in its own ticket tab of the same browser.
+        Products are added in rounds: the searches of every ticket are typed first, so their
+        server round-trips overlap, then each ticket picks its result. The add requests overlap
+        the same way. Check the tickets afterwards with collect_ticket_snapshots().
+
+        Args:
+            sales_page (SalesPage): Instance of SalesPage.
+            carts (list): One list of catalog Products per ticket.
+
+        Returns:
+            dict: {ticket_id: products} in the order the tickets were opened.
+        """
+        tickets = {}
+        for cart in carts:
+            sales_page.start_new_ticket()
+            tickets[sales_page.get_ticket_id()] = tuple(cart)
+
+        pending_totals = {}
+        for position in range(max((len(cart) for cart in tickets.values()), default=0)):
+            round_items = [(ticket_id, cart[position]) for ticket_id, cart in tickets.items() if position < len(cart)]
+            # Fire every search of the round first
+            for ticket_id, product in round_items:
+                sales_page.open_ticket(ticket_id)
+                if ticket_id in pending_totals:
+                    # The previous add clears the search box when it lands, let it finish first
+                    sales_page.wait_for_total_change(pending_totals.pop(ticket_id))
+                sales_page.search_product(product.name)
+            # Results are usually there by the time each ticket is visited again
+            for ticket_id, product in round_items:
+                sales_page.open_ticket(ticket_id)
+                pending_totals[ticket_id] = sales_page.select_search_result(product.name)
+        return tickets
+
+    @staticmethod
+    def collect_ticket_snapshots(sales_page, tickets) -> dict:
+        """
+        Activate each ticket, wait until all of its products landed and read it.
+
+        Args:
+            sales_page (SalesPage): Instance of SalesPage.
+            tickets (dict): {ticket_id: products}, as returned by build_carts_pipelined().
+
+        Returns:
+            dict: {ticket_id: TicketSnapshot}.
+        """
+        snapshots = {}
+        for ticket_id, products in tickets.items():
+            sales_page.open_ticket(ticket_id)
+            snapshots[ticket_id] = sales_page.wait_for_ticket_items(len(products))
+        return snapshots
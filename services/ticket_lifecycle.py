@@ -0,0 +1,62 @@
+# services/ticket_lifecycle.py
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TicketLifecycleManager:
+    """
+    Tracks the tickets each test opens and removes them afterwards,
+    so tabs and hidden nuevoTicketContenido{id} trees do not pile up over a module.
+    """
+
+    def __init__(self, sales_page, pos_api=None):
+        """
+        Args:
+            sales_page (SalesPage): Logged-in sales page shared by the tests.
+            pos_api (PosApiClient | None): When given, tickets are deleted in bulk
+                through the backend and the page is reloaded once.
+        """
+        self.sales_page = sales_page
+        self.pos_api = pos_api
+        self.baseline: set[str] = set()
+        self.dom_samples: list[tuple[str, int]] = []
+
+    def open_ticket_ids(self) -> list[str]:
+        """Return the IDs of the open ticket tabs ('Ticket 3' -> '3')."""
+        names = self.sales_page.get_ticket_list()
+        return [name.split(" ")[1] for name in names if name.startswith("Ticket ")]
+
+    def begin(self):
+        """Remember which tickets existed before the test."""
+        self.baseline = set(self.open_ticket_ids())
+
+    def cleanup(self, test_name: str):
+        """Close a leftover payment modal, remove the tickets the test created and sample the DOM size."""
+        try:
+            self.sales_page.close_payment_modal()
+            created = [ticket_id for ticket_id in self.open_ticket_ids() if ticket_id not in self.baseline]
+            if created:
+                self._remove(created)
+                logger.info("Removed %d tickets created by %s", len(created), test_name)
+        except Exception:
+            # Never let cleanup hide the test result, start the next test from a fresh page
+            logger.exception("Ticket cleanup failed after %s, reloading the sales page", test_name)
+            self.sales_page.refresh()
+        self.dom_samples.append((test_name, self.sales_page.count_dom_nodes()))
+
+    def _remove(self, ticket_ids: list[str]):
+        if self.pos_api is not None:
+            for ticket_id in ticket_ids:
+                self.pos_api.delete_ticket(ticket_id)
+            self.sales_page.refresh()
+            return
+        for ticket_id in ticket_ids:
+            self.sales_page.open_ticket(ticket_id)
+            self.sales_page.remove_current_ticket(confirm=True)
+
+    def dom_report(self) -> dict | None:
+        """Summary of the DOM node count sampled after each test."""
+        if not self.dom_samples:
+            return None
+        counts = [count for _, count in self.dom_samples]
+        return {"tests": len(counts), "first": counts[0], "last": counts[-1], "max": max(counts), "growth": counts[-1] - counts[0]}
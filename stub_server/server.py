@@ -0,0 +1,350 @@
+# stub_server/server.py
+"""
+Local stand-in for the Smart Site POS.
+Reproduces the DOM contracts used by the page objects (login, initial cash,
+ticket tabs, product search, totals, SweetAlert confirms, payment modal and
+inventory report) on top of the catalog in data/products.csv.
+
+Usage:
+    python -m stub_server.server --port 8765 --latency-ms 150
+"""
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import secrets
+import threading
+from html import escape
+from string import Template
+from urllib.parse import parse_qs, urlsplit, unquote
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STUB_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(STUB_DIR, "templates")
+STATIC_DIR = os.path.join(STUB_DIR, "static")
+DEFAULT_CATALOG = os.path.join(STUB_DIR, os.pardir, "data", "products.csv")
+
+STATIC_TYPES = {".js": "application/javascript", ".css": "text/css", ".svg": "image/svg+xml"}
+
+
+def load_catalog(path: str) -> list[dict]:
+    """Read the products CSV (name, price) into a list of product dicts."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {"name": row["name"], "price": float(row["price"]), "stock": 10 + i % 25}
+            for i, row in enumerate(csv.DictReader(f))
+        ]
+
+
+class PosSession:
+    """Server side state of one logged-in browser: cash drawer and open tickets."""
+
+    def __init__(self, user: str):
+        self.user = user
+        self.xsrf_token = secrets.token_urlsafe(24)
+        self.initial_cash = None
+        self.tickets: dict[int, list[dict]] = {}
+        self.next_ticket_id = 1
+
+    def create_ticket(self) -> int:
+        ticket_id = self.next_ticket_id
+        self.next_ticket_id += 1
+        self.tickets[ticket_id] = []
+        return ticket_id
+
+    def ticket_payload(self, ticket_id: int) -> dict:
+        items = self.tickets[ticket_id]
+        return {
+            "id": str(ticket_id),
+            "name": f"Ticket {ticket_id}",
+            "items": items,
+            "total": round(sum(item["price"] * item["quantity"] for item in items), 2),
+        }
+
+
+class StubState:
+    """Catalog, sessions and runtime knobs shared by every request handler thread."""
+
+    def __init__(self, catalog: list[dict], latency_ms: int = 0, jitter_ms: int = 0,
+                 user: str | None = None, password: str | None = None):
+        self.catalog = catalog
+        self.products_by_name = {product["name"]: product for product in catalog}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.user = user
+        self.password = password
+        self.sessions: dict[str, PosSession] = {}
+        self.lock = threading.Lock()
+
+    def check_credentials(self, user: str, password: str) -> bool:
+        """Accept the configured credentials, or any non-empty pair when none are configured."""
+        if self.user is None:
+            return bool(user and password)
+        return user == self.user and password == self.password
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        query = query.strip().lower()
+        if not query:
+            return []
+        return [p for p in self.catalog if query in p["name"].lower()][:limit]
+
+    def inject_latency(self):
+        """Simulate server time so suite overhead can be measured separately."""
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+
+class PosRequestHandler(BaseHTTPRequestHandler):
+    """Routes pages, static assets and the JSON API of the stub POS."""
+
+    state: StubState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep the pytest output clean, request logs are not useful here
+        pass
+
+    # ---------- Helpers ----------
+
+    @property
+    def path_only(self) -> str:
+        return urlsplit(self.path).path
+
+    @property
+    def query(self) -> dict:
+        return {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self) -> dict:
+        body = self.read_body()
+        return json.loads(body) if body else {}
+
+    def read_form(self) -> dict:
+        return {k: v[0] for k, v in parse_qs(self.read_body().decode("utf-8")).items()}
+
+    def current_session(self) -> PosSession | None:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie["pos_session"].value if "pos_session" in cookie else None
+        return self.state.sessions.get(token)
+
+    def send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            if name == "Set-Cookie":
+                for cookie in value:
+                    self.send_header("Set-Cookie", cookie)
+            else:
+                self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, payload, status: int = 200):
+        self.send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def send_page(self, template: str, status: int = 200, **values):
+        with open(os.path.join(TEMPLATES_DIR, template), encoding="utf-8") as f:
+            html = Template(f.read()).safe_substitute(**values)
+        self.send(status, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def redirect(self, location: str, cookies: list[str] | None = None):
+        headers = {"Location": location}
+        if cookies:
+            headers["Set-Cookie"] = cookies
+        self.send(303, b"", "text/plain", headers)
+
+    # ---------- HTTP verbs ----------
+
+    def do_GET(self):
+        path = self.path_only
+        if path.startswith("/static/"):
+            return self.serve_static(path)
+        self.state.inject_latency()
+        if path.startswith("/api/"):
+            return self.handle_api("GET", path)
+        session = self.current_session()
+        if session is None:
+            return self.send_page("login.html", error="")
+        if session.initial_cash is None:
+            return self.send_page("cash.html")
+        if path == "/":
+            return self.send_page("sales.html", user=escape(session.user))
+        if path == "/inventario":
+            return self.send_page("inventory.html", user=escape(session.user))
+        if path == "/inventario/reporte":
+            rows = "\n".join(
+                f'<tr><td class="nombre-producto">{escape(p["name"])}</td>'
+                f'<td class="precio-producto">$ {p["price"]:.2f}</td>'
+                f'<td class="existencia-producto">{p["stock"]}</td></tr>'
+                for p in self.state.catalog
+            )
+            return self.send_page("inventory_report.html", user=escape(session.user), rows=rows)
+        self.send(404, b"Not found", "text/plain")
+
+    def do_POST(self):
+        self.state.inject_latency()
+        path = self.path_only
+        if path.startswith("/api/"):
+            return self.handle_api("POST", path)
+        if path == "/login":
+            form = self.read_form()
+            if not self.state.check_credentials(form.get("email", ""), form.get("password", "")):
+                return self.send_page("login.html", status=422, error="Estas credenciales no coinciden con nuestros registros.")
+            token = secrets.token_urlsafe(24)
+            session = PosSession(form["email"])
+            with self.state.lock:
+                self.state.sessions[token] = session
+            return self.redirect("/", [
+                f"pos_session={token}; Path=/; HttpOnly; SameSite=Lax",
+                f"XSRF-TOKEN={session.xsrf_token}; Path=/; SameSite=Lax",
+            ])
+        if path == "/caja":
+            session = self.current_session()
+            if session is None:
+                return self.redirect("/")
+            session.initial_cash = float(self.read_form().get("cantidad") or 0)
+            return self.redirect("/")
+        self.send(404, b"Not found", "text/plain")
+
+    def do_DELETE(self):
+        self.state.inject_latency()
+        if self.path_only.startswith("/api/"):
+            return self.handle_api("DELETE", self.path_only)
+        self.send(404, b"Not found", "text/plain")
+
+    def serve_static(self, path: str):
+        name = os.path.basename(path)
+        file_path = os.path.join(STATIC_DIR, name)
+        if not os.path.isfile(file_path):
+            return self.send(404, b"Not found", "text/plain")
+        with open(file_path, "rb") as f:
+            body = f.read()
+        content_type = STATIC_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+        self.send(200, body, content_type)
+
+    # ---------- JSON API ----------
+
+    def handle_api(self, method: str, path: str):
+        session = self.current_session()
+        if session is None or session.initial_cash is None:
+            return self.send_json({"message": "Unauthenticated."}, 401)
+        if method != "GET" and unquote(self.headers.get("X-XSRF-TOKEN", "")) != session.xsrf_token:
+            return self.send_json({"message": "CSRF token mismatch."}, 419)
+
+        parts = path.strip("/").split("/")[1:]  # drop 'api'
+        with self.state.lock:
+            if parts == ["products"] and method == "GET":
+                return self.send_json({"products": self.state.search(self.query.get("q", ""))})
+
+            if parts == ["tickets"]:
+                if method == "GET":
+                    return self.send_json({"tickets": [session.ticket_payload(t) for t in session.tickets]})
+                if method == "POST":
+                    ticket_id = session.create_ticket()
+                    error = self.add_items(session, ticket_id, self.read_json().get("items", []))
+                    if error:
+                        del session.tickets[ticket_id]
+                        return self.send_json({"message": error}, 422)
+                    return self.send_json(session.ticket_payload(ticket_id), 201)
+
+            if len(parts) < 2 or not parts[1].isdigit() or int(parts[1]) not in session.tickets:
+                return self.send_json({"message": "Ticket not found."}, 404)
+            ticket_id = int(parts[1])
+
+            if len(parts) == 2:
+                if method == "GET":
+                    return self.send_json(session.ticket_payload(ticket_id))
+                if method == "DELETE":
+                    del session.tickets[ticket_id]
+                    return self.send_json({"deleted": str(ticket_id)})
+
+            if len(parts) == 3 and parts[2] == "items" and method == "POST":
+                error = self.add_items(session, ticket_id, self.read_json().get("items", []))
+                if error:
+                    return self.send_json({"message": error}, 422)
+                return self.send_json(session.ticket_payload(ticket_id))
+
+            if len(parts) == 4 and parts[2] == "items" and method == "DELETE":
+                items = session.tickets[ticket_id]
+                index = int(parts[3])
+                if not 0 <= index < len(items):
+                    return self.send_json({"message": "Item not found."}, 404)
+                items.pop(index)
+                return self.send_json(session.ticket_payload(ticket_id))
+
+            if len(parts) == 3 and parts[2] == "pay" and method == "POST":
+                payload = session.ticket_payload(ticket_id)
+                del session.tickets[ticket_id]
+                return self.send_json({"paid": payload, "payment": self.read_json()})
+
+        self.send_json({"message": "Not found."}, 404)
+
+    def add_items(self, session: PosSession, ticket_id: int, items: list[dict]) -> str | None:
+        """Append items to a ticket, returning an error message for unknown products."""
+        resolved = []
+        for item in items:
+            product = self.state.products_by_name.get(item.get("name"))
+            if product is None:
+                return f"Unknown product {item.get('name')!r}"
+            resolved.append({"name": product["name"], "price": product["price"], "quantity": int(item.get("quantity", 1))})
+        session.tickets[ticket_id].extend(resolved)
+        return None
+
+
+class PosStubServer:
+    """Runs the stub in a background thread (used by the --pos-stub pytest option)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, catalog_path: str = DEFAULT_CATALOG,
+                 latency_ms: int = 0, jitter_ms: int = 0, user: str | None = None, password: str | None = None):
+        state = StubState(load_catalog(catalog_path), latency_ms, jitter_ms, user, password)
+        handler = type("BoundPosRequestHandler", (PosRequestHandler,), {"state": state})
+        self.state = state
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "PosStubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="pos-stub", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub of the Smart Site POS.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="Products CSV with name,price columns")
+    parser.add_argument("--latency-ms", type=int, default=int(os.getenv("POS_STUB_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=int, default=int(os.getenv("POS_STUB_JITTER_MS", "0")))
+    parser.add_argument("--user", default=None, help="Only accept this login email (any by default)")
+    parser.add_argument("--password", default=None)
+    args = parser.parse_args()
+
+    server = PosStubServer(args.host, args.port, args.catalog, args.latency_ms, args.jitter_ms, args.user, args.password)
+    print(f"Smart Site POS stub listening on {server.url} (latency {args.latency_ms} ms)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
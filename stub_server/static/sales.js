@@ -0,0 +1,279 @@
+// stub_server/static/sales.js
+// Client side of the Smart Site POS stub: ticket tabs, product search, totals,
+// SweetAlert-like confirms and the payment modal. State lives on the server.
+(function () {
+    'use strict';
+
+    var tickets = {};          // id -> ticket payload from the API
+    var activeId = null;
+    var paymentMode = 'efectivo';
+    var searchTimers = {};
+
+    // ---------- API ----------
+
+    function xsrfToken() {
+        var match = document.cookie.match(/(?:^|;\s*)XSRF-TOKEN=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : '';
+    }
+
+    function api(method, path, body) {
+        var options = {
+            method: method,
+            credentials: 'same-origin',
+            headers: {'Accept': 'application/json', 'X-XSRF-TOKEN': xsrfToken()}
+        };
+        if (body !== undefined) {
+            options.headers['Content-Type'] = 'application/json';
+            options.body = JSON.stringify(body);
+        }
+        return fetch(path, options).then(function (response) {
+            if (response.status === 401) { window.location.href = '/'; }
+            return response.json();
+        });
+    }
+
+    function money(value) {
+        return '$ ' + Number(value).toFixed(2);
+    }
+
+    // ---------- Rendering ----------
+
+    function paneHtml(id) {
+        // Nesting mirrors the production markup the XPath locators depend on
+        return '' +
+            '<div><div><div><div class="ticket-body">' +
+                '<div class="ticket-search">' +
+                    '<input type="text" id="buscadorProductos' + id + '" placeholder="Buscar producto" autocomplete="off">' +
+                    '<div class="search-results" id="listaProductosBusqueda' + id + '"></div>' +
+                '</div>' +
+                '<div class="ticket-items" id="productosTicket' + id + '"></div>' +
+                '<div class="ticket-footer">' +
+                    '<div><h2 id="totalPagarH2Normal' + id + '">$ 0.00</h2></div>' +
+                    '<div><div><div class="ticket-actions">' +
+                        '<div><button type="button" class="btn btn-success" id="botonParaCobrar-normal' + id + '">Cobrar</button></div>' +
+                        '<div><span class="ticket-remove" title="Eliminar ticket">&#128465;</span></div>' +
+                    '</div></div></div>' +
+                '</div>' +
+            '</div></div></div></div>';
+    }
+
+    function addTicketDom(ticket) {
+        var id = ticket.id;
+        var li = document.createElement('li');
+        li.className = 'nav-item';
+        li.innerHTML = '<a class="nav-link" id="nuevoTicketContenido' + id + '-tab" href="#nuevoTicketContenido' + id + '">' + ticket.name + '</a>';
+        document.getElementById('ticketTabs').appendChild(li);
+        li.firstChild.addEventListener('click', function (event) {
+            event.preventDefault();
+            activate(id);
+        });
+
+        var pane = document.createElement('div');
+        pane.className = 'tab-pane';
+        pane.id = 'nuevoTicketContenido' + id;
+        pane.innerHTML = paneHtml(id);
+        document.getElementById('ticketPanes').appendChild(pane);
+
+        var input = document.getElementById('buscadorProductos' + id);
+        input.addEventListener('input', function () {
+            clearTimeout(searchTimers[id]);
+            searchTimers[id] = setTimeout(function () { search(id, input.value); }, 150);
+        });
+        document.getElementById('botonParaCobrar-normal' + id).addEventListener('click', openPaymentModal);
+        pane.querySelector('.ticket-remove').addEventListener('click', function () { removeTicket(id); });
+    }
+
+    function removeTicketDom(id) {
+        var tab = document.getElementById('nuevoTicketContenido' + id + '-tab');
+        var pane = document.getElementById('nuevoTicketContenido' + id);
+        if (tab) { tab.parentNode.remove(); }
+        if (pane) { pane.remove(); }
+        delete tickets[id];
+    }
+
+    function renderTicket(id) {
+        var ticket = tickets[id];
+        document.getElementById('totalPagarH2Normal' + id).textContent = money(ticket.total);
+        // Line items are only rendered for the current ticket ("TicketNormalActual")
+        if (String(id) !== String(activeId)) { return; }
+        Array.prototype.forEach.call(document.querySelectorAll('.ticket-items'), function (list) { list.innerHTML = ''; });
+        document.getElementById('productosTicket' + id).innerHTML = ticket.items.map(function (item, index) {
+            return '<div class="widget-list-item">' +
+                '<div class="widget-list-item-description">' +
+                    '<div class="widget-list-item-description-title">' + item.name + '</div>' +
+                    '<div class="widget-list-item-description-subtitle">' + money(item.price * item.quantity) + '</div>' +
+                '</div>' +
+                '<img src="/static/trash.svg" width="16" height="16" alt="Eliminar" data-index="' + index + '" ' +
+                    'onclick="eliminarProductoTicketNormalActual(this);">' +
+            '</div>';
+        }).join('');
+    }
+
+    function activate(id) {
+        activeId = String(id);
+        Array.prototype.forEach.call(document.querySelectorAll('#ticketTabs .nav-link'), function (tab) {
+            tab.classList.toggle('active', tab.id === 'nuevoTicketContenido' + activeId + '-tab');
+        });
+        Array.prototype.forEach.call(document.querySelectorAll('#ticketPanes .tab-pane'), function (pane) {
+            pane.classList.toggle('active', pane.id === 'nuevoTicketContenido' + activeId);
+        });
+        renderTicket(activeId);
+    }
+
+    // ---------- Ticket actions ----------
+
+    function newTicket() {
+        return api('POST', '/api/tickets', {items: []}).then(function (ticket) {
+            tickets[ticket.id] = ticket;
+            addTicketDom(ticket);
+            activate(ticket.id);
+        });
+    }
+
+    function activateLastOrCreate() {
+        var ids = Object.keys(tickets);
+        if (ids.length) { activate(ids[ids.length - 1]); } else { newTicket(); }
+    }
+
+    function removeTicket(id) {
+        confirmDialog('¿Eliminar el ticket?', function () {
+            api('DELETE', '/api/tickets/' + id).then(function () {
+                removeTicketDom(id);
+                activateLastOrCreate();
+            });
+        });
+    }
+
+    function search(id, query) {
+        var list = document.getElementById('listaProductosBusqueda' + id);
+        if (!query.trim()) { list.innerHTML = ''; return; }
+        api('GET', '/api/products?q=' + encodeURIComponent(query)).then(function (data) {
+            list.innerHTML = data.products.map(function (product) {
+                return '<div>' +
+                    '<div class="col-7"><strong>' + product.name + '</strong><br><small>' + money(product.price) + '</small></div>' +
+                    '<div class="col-5">Existencia: ' + product.stock + '</div>' +
+                '</div>';
+            }).join('');
+            Array.prototype.forEach.call(list.querySelectorAll('.col-7'), function (cell, index) {
+                cell.addEventListener('click', function () { addProduct(id, data.products[index].name); });
+            });
+        });
+    }
+
+    function addProduct(id, name) {
+        api('POST', '/api/tickets/' + id + '/items', {items: [{name: name, quantity: 1}]}).then(function (ticket) {
+            tickets[id] = ticket;
+            document.getElementById('buscadorProductos' + id).value = '';
+            document.getElementById('listaProductosBusqueda' + id).innerHTML = '';
+            renderTicket(id);
+        });
+    }
+
+    window.eliminarProductoTicketNormalActual = function (img) {
+        var id = activeId;
+        var index = img.getAttribute('data-index');
+        confirmDialog('¿Eliminar el producto del ticket?', function () {
+            api('DELETE', '/api/tickets/' + id + '/items/' + index).then(function (ticket) {
+                tickets[id] = ticket;
+                renderTicket(id);
+            });
+        });
+    };
+
+    // ---------- SweetAlert-like confirm ----------
+
+    function confirmDialog(title, onConfirm) {
+        var container = document.createElement('div');
+        container.className = 'swal2-container';
+        container.innerHTML = '<div class="swal2-popup"><h2 class="swal2-title">' + title + '</h2>' +
+            '<div class="swal2-actions">' +
+                '<button type="button" class="swal2-confirm">Sí, eliminar</button>' +
+                '<button type="button" class="swal2-cancel">Cancelar</button>' +
+            '</div></div>';
+        document.body.appendChild(container);
+        container.querySelector('.swal2-confirm').addEventListener('click', function () {
+            container.remove();
+            onConfirm();
+        });
+        container.querySelector('.swal2-cancel').addEventListener('click', function () { container.remove(); });
+    }
+
+    // ---------- Payment modal ----------
+
+    function field(id) { return document.getElementById(id); }
+
+    function setPaymentMode(mode) {
+        paymentMode = mode;
+        var options = {efectivo: 'divEfectivoTicketNormal', tarjeta: 'divTarjetaTicketNormal', mixto: 'divMixtoTicketNormal'};
+        Object.keys(options).forEach(function (key) {
+            field(options[key]).classList.toggle('selected', key === mode);
+        });
+        Array.prototype.forEach.call(document.querySelectorAll('.payment-fields'), function (group) {
+            group.classList.toggle('visible', group.getAttribute('data-modes').split(' ').indexOf(mode) !== -1);
+        });
+        recalculate();
+    }
+
+    function recalculate() {
+        var total = Number(tickets[activeId] ? tickets[activeId].total : 0);
+        var cashGiven = Number(field('efectivoCliente').value || 0);
+        if (paymentMode === 'efectivo') {
+            field('cambio').value = (cashGiven - total).toFixed(2);
+        } else if (paymentMode === 'mixto') {
+            var inCash = Number(field('enEfectivo').value || 0);
+            var inCard = Math.max(0, total - inCash);
+            field('enTarjeta').value = inCard.toFixed(2);
+            field('cambio').value = (cashGiven - inCash).toFixed(2);
+            field('totalRestante').value = Math.max(0, total - inCash - inCard).toFixed(2);
+        } else {
+            field('totalTarjeta').value = total.toFixed(2);
+        }
+    }
+
+    function openPaymentModal() {
+        ['enEfectivo', 'efectivoCliente', 'referenciaTarjeta'].forEach(function (id) { field(id).value = ''; });
+        field('totalPagarH2ModalTicketNormal').textContent = money(tickets[activeId].total);
+        field('modalCobroTicketNormal').classList.add('show');
+        setPaymentMode('efectivo');
+    }
+
+    function closePaymentModal() {
+        field('modalCobroTicketNormal').classList.remove('show');
+    }
+
+    function finishPayment() {
+        var id = activeId;
+        var payment = {
+            method: paymentMode,
+            cash: Number(field('enEfectivo').value || field('efectivoCliente').value || 0),
+            reference: field('referenciaTarjeta').value
+        };
+        api('POST', '/api/tickets/' + id + '/pay', payment).then(function () {
+            closePaymentModal();
+            removeTicketDom(id);
+            activateLastOrCreate();
+        });
+    }
+
+    // ---------- Wiring ----------
+
+    document.querySelector('.feather-plus-circle').addEventListener('click', newTicket);
+    field('divEfectivoTicketNormal').addEventListener('click', function () { setPaymentMode('efectivo'); });
+    field('divTarjetaTicketNormal').addEventListener('click', function () { setPaymentMode('tarjeta'); });
+    field('divMixtoTicketNormal').addEventListener('click', function () { setPaymentMode('mixto'); });
+    ['enEfectivo', 'efectivoCliente'].forEach(function (id) { field(id).addEventListener('input', recalculate); });
+    field('cerrarModalTicketNormal').addEventListener('click', closePaymentModal);
+    field('finalizarCompraTicketNormal').addEventListener('click', finishPayment);
+    document.addEventListener('keydown', function (event) {
+        if (event.key === 'Escape') { closePaymentModal(); }
+    });
+    field('nuevoTicketContenido0-tab').addEventListener('click', function (event) { event.preventDefault(); });
+
+    api('GET', '/api/tickets').then(function (data) {
+        data.tickets.forEach(function (ticket) {
+            tickets[ticket.id] = ticket;
+            addTicketDom(ticket);
+        });
+        activateLastOrCreate();
+    });
+})();
@@ -0,0 +1,65 @@
+"""
+Product Catalog Test Cases
+==========================
+Unit checks of utils/catalog.py: CSV loading, lookup and the reproducible
+product sets the sales tests are parametrized with. No browser needed.
+"""
+
+from decimal import Decimal
+from itertools import combinations
+import pytest
+from utils.catalog import ProductCatalog, load_catalog, product_set_id, total_price
+
+# ---------------------- Fixtures ---------------------- #
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text(
+        "name,price\n" + "".join(f"P{i},{i}.10\n" for i in range(1, 11)) + "\n", encoding="utf-8"
+    )
+    return ProductCatalog.from_csv(str(path))
+
+# ---------------------- Catalog Test Cases ---------------------- #
+
+class TestCatalog:
+
+    def test_from_csv_and_lookup(self, catalog):
+        """Rows load in file order with exact prices; names are looked up through the index."""
+        assert len(catalog) == 10
+        assert catalog[0].name == "P1" and catalog[0].price == Decimal("1.10")
+        assert "P10" in catalog and "P11" not in catalog
+        assert catalog.price_of("P3") == Decimal("3.10")
+        with pytest.raises(KeyError):
+            catalog.price_of("P11")
+
+    def test_total_price_is_exact(self, catalog):
+        assert total_price([catalog[0], catalog[1], catalog[2]]) == Decimal("6.30")
+
+    def test_sample_sets_are_reproducible(self, catalog):
+        """The same seed gives the same sets, each without repeated products and with its exact total."""
+        sets = catalog.sample_sets(5, 3, seed="42:tc_sales_002")
+        assert sets == catalog.sample_sets(5, 3, seed="42:tc_sales_002")
+        assert sets != catalog.sample_sets(5, 3, seed="43:tc_sales_002")
+        for product_set in sets:
+            assert len(set(product_set.names)) == 3
+            assert product_set.total == total_price(product_set.products)
+
+    @pytest.mark.parametrize("size, pool", [(2, 4), (3, 6), (4, None)])
+    def test_pairwise_sets_cover_every_pair(self, catalog, size, pool):
+        """Every pair of pool products shares a set, with fewer sets than all combinations."""
+        sets = catalog.pairwise_sets(size, pool=pool, seed=7)
+        names = {name for product_set in sets for name in product_set.names}
+        assert len(names) == (pool or len(catalog))
+        covered = {pair for product_set in sets for pair in combinations(sorted(product_set.names), 2)}
+        assert covered == set(combinations(sorted(names), 2))
+        assert all(len(product_set.products) == size for product_set in sets)
+        assert len(sets) <= len(list(combinations(names, size)))
+        assert sets == catalog.pairwise_sets(size, pool=pool, seed=7)
+
+    def test_product_set_id(self, catalog):
+        assert product_set_id(catalog.sample_sets(1, 2, seed=1)[0]).count("+") == 1
+
+    def test_bundled_catalog_loads_once(self):
+        assert load_catalog() is load_catalog()
+        assert len(load_catalog()) > 0
@@ -0,0 +1,153 @@
+"""
+Change Impact Selection Test Cases
+==================================
+Unit checks of utils/impact.py: diff parsing, symbol mapping and test selection.
+No browser needed; the git cases run against a throwaway repository.
+"""
+
+import subprocess
+from types import SimpleNamespace
+import pytest
+from utils.impact import ImpactRecorder, ImpactSelection, changed_lines, changed_symbols, parse_diff, symbol_ranges
+
+# ---------------------- Fixtures ---------------------- #
+
+PAGE_SOURCE = '''\
+JS_SNIPPET = "return 1;"
+
+
+class Page:
+    """Docstring."""
+    button = ("id", "ok")
+
+    def click(self):
+        return self.button
+
+    @staticmethod
+    def helper():
+        return JS_SNIPPET
+'''
+
+IMPACT_MAP = {
+    "tests": {
+        "tests/test_a.py::test_click": ["pages/page.py::Page.click", "pages/page.py::Page.button"],
+        "tests/test_a.py::test_helper": ["pages/page.py::Page.helper", "pages/page.py::JS_SNIPPET"],
+        "tests/test_b.py::test_other": ["pages/other.py::Other.run"],
+    },
+    "shared": ["services/auth_service.py::AuthService.login"],
+}
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Git repository with one committed page module, used as the working directory."""
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "page.py").write_text(PAGE_SOURCE, encoding="utf-8")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "-c", "user.name=qa", "-c", "user.email=qa@example.com", "commit", "-q", "-m", "base")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+# ---------------------- Impact Test Cases ---------------------- #
+
+class TestImpact:
+
+    def test_parse_diff_marks_changed_and_deleted_lines(self):
+        """Hunk headers give the changed lines of both versions; a pure deletion marks its neighbour."""
+        diff = (
+            "diff --git a/pages/page.py b/pages/page.py\n"
+            "--- a/pages/page.py\n"
+            "+++ b/pages/page.py\n"
+            "@@ -6 +6 @@ class Page:\n"
+            "-    button = (\"id\", \"ok\")\n"
+            "+    button = (\"id\", \"accept\")\n"
+            "@@ -12,2 +11,0 @@\n"
+            "--- removed line that looks like a header\n"
+            "-    pass\n"
+        )
+        old_lines, new_lines = parse_diff(diff)["pages/page.py"]
+        assert old_lines == {6, 12, 13}
+        assert new_lines == {6, 11}
+
+    def test_changed_lines_against_base(self, repo):
+        """Working-tree edits and untracked files are both reported."""
+        source = PAGE_SOURCE.replace('("id", "ok")', '("id", "accept")')
+        (repo / "pages" / "page.py").write_text(source, encoding="utf-8")
+        (repo / "pages" / "new.py").write_text("X = 1\n", encoding="utf-8")
+        changes = changed_lines("HEAD")
+        assert changes["pages/page.py"] == ({6}, {6})
+        assert changes["pages/new.py"] == (set(), {0})
+
+    def test_changed_lines_unknown_base(self, repo):
+        """An unknown ref is an error, not an empty change set."""
+        with pytest.raises(subprocess.CalledProcessError):
+            changed_lines("origin/doesnotexist")
+
+    def test_symbol_ranges(self):
+        """Functions, methods and assignments are mapped with their decorators, nested under their class."""
+        ranges = {symbol: (first, last) for first, last, symbol in symbol_ranges(PAGE_SOURCE, "pages/page.py")}
+        assert ranges["pages/page.py::JS_SNIPPET"] == (1, 1)
+        assert ranges["pages/page.py::Page"] == (4, 13)
+        assert ranges["pages/page.py::Page.button"] == (6, 6)
+        assert ranges["pages/page.py::Page.click"] == (8, 9)
+        assert ranges["pages/page.py::Page.helper"] == (11, 13)
+
+    def test_changed_symbols(self):
+        """Each line maps to its innermost symbol; class-level and module-level lines to the class or file."""
+        symbols = changed_symbols("pages/page.py", PAGE_SOURCE, {1, 5, 9, 11, 2})
+        assert symbols == {
+            "pages/page.py::JS_SNIPPET",
+            "pages/page.py::Page",
+            "pages/page.py::Page.click",
+            "pages/page.py::Page.helper",
+            "pages/page.py::*",
+        }
+        assert changed_symbols("pages/page.py", None, {1}) == set()
+        assert changed_symbols("pages/page.py", "def broken(:\n", {1}) == {"pages/page.py::*"}
+
+    @pytest.mark.parametrize("changed, expected", [
+        ({"pages/page.py::Page.button"}, {"tests/test_a.py::test_click"}),
+        ({"pages/page.py::JS_SNIPPET"}, {"tests/test_a.py::test_helper"}),
+        ({"pages/page.py::Page"}, {"tests/test_a.py::test_click", "tests/test_a.py::test_helper"}),
+        ({"pages/other.py::*"}, {"tests/test_b.py::test_other"}),
+        ({"pages/unused.py::Unused.run"}, set()),
+    ], ids=["locator", "constant", "class", "whole-file", "unrelated"])
+    def test_selects_tests_exercising_a_change(self, changed, expected):
+        """Only the mapped tests that exercised a changed symbol are selected."""
+        selection = ImpactSelection(changed=changed, impact_map=IMPACT_MAP)
+        assert {nodeid for nodeid in IMPACT_MAP["tests"] if selection.selects(nodeid)} == expected
+
+    def test_selects_unknown_changed_file_and_shared(self):
+        """Unmapped tests, changed test files and shared symbols always select."""
+        selection = ImpactSelection(changed={"pages/unused.py::X"}, test_files={"tests/test_b.py"}, impact_map=IMPACT_MAP)
+        assert selection.selects("tests/test_new.py::test_new")
+        assert selection.selects("tests/test_b.py::test_other@lpt-1")
+        assert not selection.selects("tests/test_a.py::test_click")
+        shared = ImpactSelection(changed={"services/auth_service.py::AuthService.login"}, impact_map=IMPACT_MAP)
+        assert all(shared.selects(nodeid) for nodeid in IMPACT_MAP["tests"])
+
+    def test_failed_diff_runs_everything(self, repo):
+        """A base git cannot diff against falls back to the full suite."""
+        selection = ImpactSelection.from_git("origin/doesnotexist", IMPACT_MAP)
+        assert selection.run_all == "git diff against origin/doesnotexist failed"
+        assert all(selection.selects(nodeid) for nodeid in IMPACT_MAP["tests"])
+
+    def test_recorder_keys_seeded_tests_on_history_id(self):
+        """Symbols of a seeded test are recorded under its history id, so the next seed still finds them."""
+        recorder = ImpactRecorder()
+        recorder.pytest_runtest_logreport(SimpleNamespace(
+            nodeid="tests/test_a.py::test_click[BOLSA]@lpt-0", history_id="tests/test_a.py::test_click[#0]",
+            impact=["pages/page.py::Page.click"], when="call",
+        ))
+        recorder.pytest_runtest_logreport(SimpleNamespace(
+            nodeid="tests/test_a.py::test_plain@lpt-1", impact=["pages/page.py::Page.button"], when="call",
+        ))
+        assert recorder.tests == {
+            "tests/test_a.py::test_click[#0]": {"pages/page.py::Page.click"},
+            "tests/test_a.py::test_plain": {"pages/page.py::Page.button"},
+        }
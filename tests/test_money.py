@@ -0,0 +1,93 @@
+"""
+Money Test Cases
+================
+Unit checks of utils/money.py: rounding, parsing of POS amounts, payment splits
+and the precomputed scenario outcomes. No browser needed.
+"""
+
+from decimal import Decimal
+import pytest
+from utils.money import (
+    MixedPayment, OutcomeTable, cash_change, parse_amount, parse_cash_ratio, split_payment, to_money,
+)
+
+# ---------------------- Fixtures ---------------------- #
+
+SCENARIOS = """\
+product1,product2,total_price
+ADORNO H6116,BOLSA,185
+BALERINA TD821C,,60
+
+ARETE ED-11,,0.05
+BOLSA DE FIGURA,,1000.01
+"""
+
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(SCENARIOS, encoding="utf-8")
+    return str(path)
+
+# ---------------------- Money Test Cases ---------------------- #
+
+class TestMoney:
+
+    @pytest.mark.parametrize("value, expected", [
+        (0.1, "0.10"),
+        (0.1 + 0.2, "0.30"),
+        ("2.675", "2.68"),
+        (Decimal("1.005"), "1.01"),
+        (365, "365.00"),
+        ("-0.005", "-0.01"),
+    ])
+    def test_to_money_rounds_half_up_to_cents(self, value, expected):
+        """Floats go through their repr, halves round away from zero, every amount has two decimals."""
+        assert str(to_money(value)) == expected
+
+    @pytest.mark.parametrize("text, expected", [
+        ("$ 1,365.00", Decimal("1365.00")),
+        ("365.5", Decimal("365.5")),
+        ("Total: $ 0.00", Decimal("0.00")),
+        ("", None),
+        (None, None),
+        ("$ --", None),
+    ])
+    def test_parse_amount(self, text, expected):
+        """Labels and field values parse to exact decimals, anything else to None."""
+        assert parse_amount(text) == expected
+
+    @pytest.mark.parametrize("value", ["abc", "-0.1", "1.5", "NaN", "Infinity"])
+    def test_parse_cash_ratio_rejects_values_outside_zero_one(self, value):
+        with pytest.raises(ValueError, match="cash ratio"):
+            parse_cash_ratio(value)
+
+    def test_split_payment(self):
+        """The cash part is rounded to cents, the card takes the rest and change is given on the cash part."""
+        assert split_payment("365", 1000) == MixedPayment(
+            Decimal("292.00"), Decimal("73.00"), Decimal("708.00"), Decimal("0.00")
+        )
+        assert split_payment("0.05", 1, "0.5") == MixedPayment(
+            Decimal("0.03"), Decimal("0.02"), Decimal("0.97"), Decimal("0.00")
+        )
+        assert split_payment("100", 50, "1").card == Decimal("0.00")
+        assert split_payment("100", 50, 0).cash == Decimal("0.00")
+
+    def test_outcome_table_reads_totals_by_line(self, scenario_file):
+        """Blank lines are skipped; rows are looked up by their line number."""
+        table = OutcomeTable.from_scenarios(scenario_file)
+        assert len(table) == 4
+        assert table.lines.tolist() == [2, 3, 5, 6]
+        assert table.total(2) == Decimal("185.00")
+        assert table.change(6) == Decimal("-0.01")
+        with pytest.raises(KeyError):
+            table.total(4)
+
+    @pytest.mark.parametrize("cash_ratio", ["0.8", "0.5", "1", "0", "0.333"])
+    def test_outcome_table_matches_split_payment(self, scenario_file, cash_ratio):
+        """The precomputed columns give the same change and split as cash_change and split_payment."""
+        table = OutcomeTable.from_scenarios(scenario_file, 1000, cash_ratio)
+        for line in table.lines:
+            outcome = table.outcome(line)
+            assert outcome.change == cash_change(outcome.total, 1000)
+            assert outcome.split == split_payment(outcome.total, 1000, cash_ratio)
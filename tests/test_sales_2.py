@@ -7,85 +7,83 @@ Each test validates a different functionality in the ticket and payment workflow
 Author: Jorge Lorenzo
 """
 
+import os
 import pytest
 import random
-import pandas as pd
-from pages.login_page import LoginPage
-from pages.sales_page import SalesPage
 from services.sales_service import SalesService
-from config.settings import settings
+from utils.catalog import load_catalog, product_set_id
+from utils.money import cash_change, split_payment, to_money
 from config.logger import get_logger
 
 # ---------------------- Global Test Configuration ---------------------- #
 
-SMART_SITE_POS = settings.SMART_SITE_POS
-USER = settings.USER
-PASSWORD = settings.PASSWORD
-INITIAL_CASH = 10000
 logger = get_logger("test_sales")
 
-# Load CSV data with product info (executed once per module)
-data = pd.read_csv("data/products.csv").to_dict(orient="records")
+# Run seed, set by conftest (--pos-seed) so every xdist worker collects the same product sets
+SEED = os.getenv("POS_SEED", "0")
 
-def get_random_product_sets(num_tests: int, products_per_test: int):
+def get_random_product_sets(case: str, num_tests: int, products_per_test: int):
     """
-    Generate random product combinations for test parametrization.
+    Generate reproducible product combinations for test parametrization.
     Args:
+        case: Test case key; each case draws its own sets from the run seed.
         num_tests: Number of test iterations to generate.
         products_per_test: Number of products per iteration.
     Returns:
-        List of product combinations.
+        List of ProductSets (products plus exact expected total).
     """
-    return [random.sample(data, k=products_per_test) for _ in range(num_tests)]
+    return load_catalog().sample_sets(num_tests, products_per_test, seed=f"{SEED}:{case}")
 
-# ---------------------- Pytest Fixtures ---------------------- #
-
-@pytest.fixture(scope="module")
-def sales_page(driver):
+def get_pairwise_product_sets(case: str, pool: int, products_per_test: int):
     """
-    Perform login and initialize the SalesPage.
-    Executed once per module to reduce overhead.
+    Product sets in which every pair of `pool` products (drawn from the run seed) shares a ticket at least once.
+    Args:
+        case: Test case key; each case draws its own pool from the run seed.
+        pool: Number of products whose pairs must all be covered.
+        products_per_test: Number of products per iteration.
+    Returns:
+        List of ProductSets (products plus exact expected total).
     """
-    login_page = LoginPage(driver)
-    login_page.load(SMART_SITE_POS)
-    login_page.login(USER, PASSWORD)
-    login_page.set_initial_cash(INITIAL_CASH)
-    return SalesPage(driver)
+    return load_catalog().pairwise_sets(products_per_test, pool=pool, seed=f"{SEED}:{case}")
+
+# The logged-in `sales_page` fixture lives in conftest.py (one per xdist worker).
 
 # ---------------------- Sales Test Cases ---------------------- #
 
 @pytest.mark.sales
+@pytest.mark.seeded
+@pytest.mark.usefixtures("ticket_lifecycle")
 class TestSales:
 
     @pytest.mark.tc_sales_001
-    @pytest.mark.parametrize("products", get_random_product_sets(3, 1))
-    def test_add_single_item_and_validate_total(self, products, sales_page):
+    @pytest.mark.parametrize("cart", get_random_product_sets("tc_sales_001", 3, 1), ids=product_set_id)
+    def test_add_single_item_and_validate_total(self, cart, sales_page):
         """TC-SALES-001: Add a single product and validate total."""
-        product = products[0]
-        logger.info(f"Executing TC-SALES-001 with product: {product['name']}")
+        product = cart.products[0]
+        logger.info("Executing TC-SALES-001 with product: %s", product.name)
         sales_page.start_new_ticket()
-        sales_page.add_product_by_code(product["name"])
+        sales_page.add_product_by_code(product.name)
         total = sales_page.get_ticket_total()
-        assert total == float(product["price"]), f"Expected {product['price']}, got {total}"
+        assert total == to_money(product.price), f"Expected {product.price}, got {total}"
 
     @pytest.mark.tc_sales_002
-    @pytest.mark.parametrize("products", get_random_product_sets(3, 3))
-    def test_add_multiple_items_and_validate_total(self, products, sales_page):
-        """TC-SALES-002: Add multiple products and validate total sum."""
+    @pytest.mark.parametrize("cart", get_pairwise_product_sets("tc_sales_002", 6, 3), ids=product_set_id)
+    def test_add_multiple_items_and_validate_total(self, cart, sales_page):
+        """TC-SALES-002: Add multiple products and validate total sum; every pair of 6 products shares a ticket once."""
         sales_page.start_new_ticket()
-        expected_total = SalesService.add_items_and_get_expected_total(sales_page, products)
+        expected_total = SalesService.add_items_and_get_expected_total(sales_page, cart.products)
         total = sales_page.get_ticket_total()
         assert total == expected_total, f"Expected {expected_total}, got {total}"
 
     @pytest.mark.tc_sales_003
-    @pytest.mark.parametrize("products", get_random_product_sets(3, 3))
-    def test_remove_item_and_validate_total(self, products, sales_page):
+    @pytest.mark.parametrize("cart", get_random_product_sets("tc_sales_003", 3, 3), ids=product_set_id)
+    def test_remove_item_and_validate_total(self, cart, sales_page):
         """TC-SALES-003: Remove one product and verify total is updated."""
         sales_page.start_new_ticket()
-        expected_total = SalesService.add_items_and_get_expected_total(sales_page, products)
-        product_to_remove = random.choice(products)
-        sales_page.remove_product_by_code(product_to_remove["name"])
-        expected_total -= float(product_to_remove["price"])
+        SalesService.add_items_and_get_expected_total(sales_page, cart.products)
+        product_to_remove = random.choice(cart.products)
+        sales_page.remove_product_by_code(product_to_remove.name)
+        expected_total = to_money(cart.total - product_to_remove.price)
         total = sales_page.get_ticket_total()
         assert total == expected_total, f"Expected {expected_total}, got {total}"
 
@@ -110,38 +108,47 @@ class TestSales:
         assert f"Ticket {current_ticket}" in tickets, "Ticket was deleted when cancellation was expected"
 
     @pytest.mark.tc_sales_006
-    @pytest.mark.parametrize("products", get_random_product_sets(1, 3))
-    def test_change_when_cash_is_used(self, products, sales_page):
+    @pytest.mark.page_state("payment")
+    @pytest.mark.parametrize("cart", get_random_product_sets("tc_sales_006", 1, 3), ids=product_set_id)
+    def test_change_when_cash_is_used(self, cart, sales_page, pos_api):
         """TC-SALES-006: Pay with cash and verify change is correct."""
         CASH_USED = 1000
-        sales_page.start_new_ticket()
-        expected_total = SalesService.add_items_and_get_expected_total(sales_page, products)
-        expected_change = CASH_USED - expected_total
+        expected_total = SalesService.build_cart(sales_page, cart.products, pos_api)
+        expected_change = cash_change(expected_total, CASH_USED)
         change = sales_page.pay_with_cash(CASH_USED)
         assert change == expected_change, f"Expected change {expected_change}, got {change}"
 
     @pytest.mark.tc_sales_007
-    @pytest.mark.parametrize("products", get_random_product_sets(1, 3))
-    def test_total_when_card_is_used(self, products, sales_page):
+    @pytest.mark.page_state("payment")
+    @pytest.mark.parametrize("cart", get_random_product_sets("tc_sales_007", 1, 3), ids=product_set_id)
+    def test_total_when_card_is_used(self, cart, sales_page, pos_api):
         """TC-SALES-007: Pay with card and validate total matches."""
         REFERENCE = 123456789
-        sales_page.start_new_ticket()
-        expected_total = SalesService.add_items_and_get_expected_total(sales_page, products)
+        expected_total = SalesService.build_cart(sales_page, cart.products, pos_api)
         total_to_pay = sales_page.pay_with_card(REFERENCE)
         assert expected_total == total_to_pay, f"Expected {expected_total}, got {total_to_pay}"
 
     @pytest.mark.tc_sales_008
-    @pytest.mark.parametrize("products", get_random_product_sets(1, 3))
-    def test_total_when_mix_payment_with_cash(self, products, sales_page):
+    @pytest.mark.page_state("payment")
+    @pytest.mark.parametrize("cart", get_random_product_sets("tc_sales_008", 1, 3), ids=product_set_id)
+    def test_total_when_mix_payment_with_cash(self, cart, sales_page, pos_api):
         """TC-SALES-008: Pay with cash + card (mixed payment) and validate balances."""
         CASH_USED = 1000
-        sales_page.start_new_ticket()
-
-        expected_total = SalesService.add_items_and_get_expected_total(sales_page, products)
-        expected_change = CASH_USED - expected_total * 0.8
-        expected_remaining_card = expected_total * 0.2
-
-        change, remaining_card = sales_page.mix_payment_cash(CASH_USED)
-
-        assert round(expected_change, 1) == round(change, 1), "Mismatch in cash change"
-        assert round(expected_remaining_card, 1) == round(remaining_card, 1), "Mismatch in remaining card payment"
\ No newline at end of file
+        CASH_RATIO = "0.8"
+        expected_total = SalesService.build_cart(sales_page, cart.products, pos_api)
+        expected = split_payment(expected_total, CASH_USED, CASH_RATIO)
+
+        change, remaining_card = sales_page.mix_payment_cash(CASH_USED, CASH_RATIO)
+
+        assert change == expected.change, f"Expected change {expected.change}, got {change}"
+        assert remaining_card == expected.card, f"Expected card payment {expected.card}, got {remaining_card}"
+
+    @pytest.mark.tc_sales_009
+    def test_pipelined_carts_in_several_tickets(self, sales_page):
+        """TC-SALES-009: Build several carts in parallel ticket tabs and validate every total."""
+        carts = get_random_product_sets("tc_sales_009", 3, 3)
+        tickets = SalesService.build_carts_pipelined(sales_page, [cart.products for cart in carts])
+        snapshots = SalesService.collect_ticket_snapshots(sales_page, tickets)
+        for (ticket_id, snapshot), cart in zip(snapshots.items(), carts):
+            assert sorted(snapshot.item_names) == sorted(cart.names), f"Ticket {ticket_id} items: {snapshot.item_names}"
+            assert snapshot.total == to_money(cart.total), f"Ticket {ticket_id}: expected {cart.total}, got {snapshot.total}"
@@ -0,0 +1,46 @@
+"""
+Sales Scenario Test Cases
+=========================
+Data-driven carts read from the CSV scenario files in data/.
+Each row becomes one test: the products are added to a new ticket and the
+ticket total must match the row's expected total.
+
+Rows are streamed by offset, so the same test scales to nightly files with
+thousands of carts. Split them across CI jobs with --scenario-shard K/N.
+"""
+
+import pytest
+from services.sales_service import SalesService
+from utils.money import DEFAULT_CASH
+from config.logger import get_logger
+
+logger = get_logger("test_sales_scenarios")
+
+# ---------------------- Scenario Test Cases ---------------------- #
+
+@pytest.mark.sales
+@pytest.mark.usefixtures("ticket_lifecycle")
+class TestSalesScenarios:
+
+    @pytest.mark.scenarios("data/TC-SALES-001.csv", "data/TC-SALES-002.csv")
+    def test_cart_total_matches_scenario(self, request, cart_scenario, scenario_outcome, sales_page, pos_api):
+        """
+        TC-SALES-001/002: Build the scenario cart and validate the ticket total.
+        With --scenario-payment cash|mixed the ticket is also paid and the change (and card part) checked.
+        """
+        logger.info("Executing scenario %s: %s", cart_scenario.source, ", ".join(cart_scenario.products))
+        SalesService.open_ticket_with(sales_page, cart_scenario.products, pos_api)
+        total = sales_page.get_ticket_total()
+        expected = scenario_outcome.total
+        assert total == expected, f"{cart_scenario.source}: expected {expected}, got {total}"
+
+        payment = request.config.getoption("--scenario-payment")
+        if payment == "cash":
+            change = sales_page.pay_with_cash(DEFAULT_CASH)
+            assert change == scenario_outcome.change, f"{cart_scenario.source}: expected change {scenario_outcome.change}, got {change}"
+        elif payment == "mixed":
+            split = scenario_outcome.split
+            change, card = sales_page.mix_payment_cash(DEFAULT_CASH, request.config.cash_ratio)
+            sales_page.close_payment_modal()
+            assert change == split.change, f"{cart_scenario.source}: expected change {split.change}, got {change}"
+            assert card == split.card, f"{cart_scenario.source}: expected card payment {split.card}, got {card}"
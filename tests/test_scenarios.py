@@ -0,0 +1,56 @@
+"""
+Scenario File Test Cases
+========================
+Unit checks of utils/scenarios.py: row offsets and the check of scenario rows
+against the product catalog. No browser needed.
+"""
+
+from decimal import Decimal
+import pytest
+from utils.catalog import ProductCatalog
+from utils.scenarios import catalog_mismatches, iter_scenario_refs, load_scenario
+
+# ---------------------- Fixtures ---------------------- #
+
+SCENARIOS = """\
+product1,product2,total_price
+BOLSA,CASCADA,170
+BOLSA,,90
+
+UNKNOWN,,10
+CASCADA,,abc
+BOLSA,,
+"""
+
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(SCENARIOS, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def catalog():
+    return ProductCatalog(["BOLSA", "CASCADA"], [Decimal("85"), Decimal("85")])
+
+# ---------------------- Scenario Test Cases ---------------------- #
+
+class TestScenarios:
+
+    def test_refs_point_at_their_rows(self, scenario_file):
+        """Blank lines are skipped and each ref reads back its own row."""
+        refs = list(iter_scenario_refs(scenario_file))
+        assert [ref.line for ref in refs] == [2, 3, 5, 6, 7]
+        scenario = load_scenario(refs[0])
+        assert scenario.products == ("BOLSA", "CASCADA")
+        assert scenario.total_price == Decimal("170")
+
+    def test_catalog_mismatches_reports_each_bad_row(self, scenario_file, catalog):
+        """Wrong totals, unknown products and totals that are not numbers are reported per line."""
+        assert catalog_mismatches(scenario_file, catalog) == {
+            3: "total 90 but the catalog prices sum to 85",
+            5: "not in the catalog: UNKNOWN",
+            6: "total 'abc' is not a number",
+            7: "total '' is not a number",
+        }
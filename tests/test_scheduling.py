@@ -0,0 +1,77 @@
+"""
+Scheduling Test Cases
+=====================
+Unit checks of utils/scheduling.py: LPT groups, -m/-k filtering ahead of pytest
+and the history id of seeded tests. No browser needed; items are small fakes.
+"""
+
+from types import SimpleNamespace
+import pytest
+from utils.scheduling import assign_lpt_groups, deselect_by_options, history_id
+
+# ---------------------- Fixtures ---------------------- #
+
+class FakeItem:
+    """The parts of a pytest.Item the scheduler reads."""
+
+    def __init__(self, nodeid, marks=(), callspec=None):
+        self.nodeid = nodeid
+        self.marks = [getattr(pytest.mark, name).mark for name in marks]
+        self.keywords = {nodeid.split("::")[-1]: 1, **{name: 1 for name in marks}}
+        self.parent = SimpleNamespace(nodeid=nodeid.rsplit("::", 1)[0])
+        self.originalname = nodeid.split("::")[-1].split("[")[0]
+        if callspec is not None:
+            self.callspec = SimpleNamespace(indices=callspec)
+
+    def iter_markers(self):
+        return iter(self.marks)
+
+    def get_closest_marker(self, name):
+        return next((mark for mark in self.marks if mark.name == name), None)
+
+    def add_marker(self, marker):
+        self.marks.append(marker.mark)
+
+
+def fake_config(markexpr="", keyword=""):
+    deselected = []
+    hook = SimpleNamespace(pytest_deselected=lambda items: deselected.extend(items))
+    return SimpleNamespace(option=SimpleNamespace(markexpr=markexpr, keyword=keyword), hook=hook), deselected
+
+# ---------------------- Scheduling Test Cases ---------------------- #
+
+class TestScheduling:
+
+    def test_lpt_balances_by_history(self):
+        """Longest tests go first onto the least loaded group; unknown tests get the mean of the known ones."""
+        durations = {"t::a": 30, "t::b": 20, "t::c": 10}
+        items = [FakeItem(nodeid) for nodeid in ("t::a", "t::b", "t::c", "t::new")]
+        totals = assign_lpt_groups(items, 2, lambda nodeid: durations.get(nodeid, 0))
+        assert sorted(totals) == [40, 40]
+        assert {item.get_closest_marker("xdist_group").args[0] for item in items} == {"lpt-0", "lpt-1"}
+
+    @pytest.mark.parametrize("markexpr, keyword, kept", [
+        ("sales and not quarantined", "", ["t::sale"]),
+        ("", "SALE or inventory", ["t::sale", "t::slow_sale", "t::inventory"]),
+        ("not benchmark", "not slow", ["t::sale", "t::inventory"]),
+        ("mark(x=1)", "", ["t::sale", "t::slow_sale", "t::inventory", "t::bench"]),
+    ], ids=["marks", "keywords", "both", "unsupported"])
+    def test_deselect_by_options(self, markexpr, keyword, kept):
+        """-m matches marker names, -k is a case-insensitive substring; what the parser cannot read is left to pytest."""
+        items = [
+            FakeItem("t::sale", ["sales"]),
+            FakeItem("t::slow_sale", ["sales", "quarantined"]),
+            FakeItem("t::inventory", ["inventory"]),
+            FakeItem("t::bench", ["benchmark"]),
+        ]
+        config, deselected = fake_config(markexpr, keyword)
+        deselect_by_options(config, items)
+        assert [item.nodeid for item in items] == kept
+        assert len(items) + len(deselected) == 4
+
+    def test_history_id_of_seeded_tests(self):
+        """Seeded tests are keyed on the case index, the rest on their node id without the xdist group."""
+        seeded = FakeItem("tests/t.py::TestSales::test_total[BOLSA+CASCADA]", ["seeded"], {"cart": 2})
+        assert history_id(seeded) == "tests/t.py::TestSales::test_total[#2]"
+        scenario = FakeItem("tests/t.py::TestSales::test_row[TC-SALES-001.csv:2]@lpt-1", [], {"cart_scenario": 0})
+        assert history_id(scenario) == "tests/t.py::TestSales::test_row[TC-SALES-001.csv:2]"
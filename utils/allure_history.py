@@ -0,0 +1,278 @@
+# utils/allure_history.py
+import os
+import json
+import html
+import subprocess
+from datetime import datetime
+from utils.profiler import percentile
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Which result files were already processed, rebuilt from a full scan when missing
+ALLURE_INDEX = ".cache/allure_index.json"
+RESULT_HISTORY = "reports/history/result_history.json"
+TRENDS_REPORT = "reports/trends.html"
+
+# Samples kept per test and run summaries kept overall
+MAX_SAMPLES = 20
+MAX_RUNS = 50
+
+RESULT_SUFFIX = "-result.json"
+CONTAINER_SUFFIX = "-container.json"
+
+
+def _read_json(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        logger.warning("Skipping unreadable Allure file %s", path)
+        return None
+
+
+def _write_json(path: str, data: dict):
+    """Write then rename, so an interrupted run never leaves half a file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _attachments(node: dict) -> list[str]:
+    """Attachment files of a result or container, including the ones of nested steps and fixtures."""
+    sources = [attachment["source"] for attachment in node.get("attachments", [])]
+    for key in ("steps", "befores", "afters"):
+        for child in node.get(key, []):
+            sources += _attachments(child)
+    return sources
+
+
+def tracked_by_git(directory: str) -> bool:
+    """True if git tracks any file under `directory` (False outside a work tree or without git)."""
+    try:
+        listed = subprocess.run(["git", "ls-files", "--", directory], capture_output=True, text=True)
+    except OSError:
+        return False
+    return listed.returncode == 0 and bool(listed.stdout.strip())
+
+
+class AllureResultIndex:
+    """
+    Index of the latest result per test (historyId) in the Allure results directory.
+    Only files added since the last update are parsed, so the run's new results are found cheaply.
+    With `prune`, a newer result of the same test also deletes the older one together with its
+    attachments and the containers left without children.
+    """
+
+    def __init__(self, results_dir: str, path: str = ALLURE_INDEX, prune: bool = False):
+        """
+        Args:
+            results_dir (str): Allure results directory.
+            path (str): Index file.
+            prune (bool): Delete superseded results. Refused for a directory git tracks files in.
+        """
+        self.results_dir = results_dir
+        self.path = path
+        if prune and tracked_by_git(results_dir):
+            logger.warning("Not pruning %s: it holds files tracked by git", results_dir)
+            prune = False
+        self.prune = prune
+        data = _read_json(path) if os.path.exists(path) else None
+        if not data or data.get("results_dir") != os.path.abspath(results_dir):
+            data = {}
+        # historyId -> {"file", "uuid", "stop", "attachments"}
+        self.results: dict[str, dict] = data.get("results", {})
+        # container file -> {"children", "attachments"}
+        self.containers: dict[str, dict] = data.get("containers", {})
+
+    def _known_files(self) -> set[str]:
+        return {entry["file"] for entry in self.results.values()} | set(self.containers)
+
+    def _remove(self, name: str, attachments: list[str]):
+        for file in [name, *attachments]:
+            try:
+                os.remove(os.path.join(self.results_dir, file))
+            except FileNotFoundError:
+                pass
+
+    # ---------- Update ----------
+
+    def update(self) -> list[dict]:
+        """
+        Index the files written since the last update and drop superseded results.
+
+        Returns:
+            list[dict]: The new results, as parsed from their JSON files.
+        """
+        if not os.path.isdir(self.results_dir):
+            return []
+        present = set(os.listdir(self.results_dir))
+        known = self._known_files()
+        # Files deleted behind our back (--clean-alluredir, manual cleanup) leave the index
+        self.results = {key: entry for key, entry in self.results.items() if entry["file"] in present}
+        self.containers = {name: entry for name, entry in self.containers.items() if name in present}
+        new_files = sorted(present - known)
+
+        superseded, new_results = set(), []
+        for name in (name for name in new_files if name.endswith(RESULT_SUFFIX)):
+            result = _read_json(os.path.join(self.results_dir, name))
+            if result is None or "historyId" not in result:
+                continue
+            entry = {
+                "file": name,
+                "uuid": result["uuid"],
+                "stop": result.get("stop", 0),
+                "attachments": _attachments(result),
+            }
+            previous = self.results.get(result["historyId"])
+            if previous is not None and previous["stop"] > entry["stop"]:
+                previous, entry = entry, previous
+            else:
+                new_results.append(result)
+            if previous is not None:
+                if self.prune:
+                    self._remove(previous["file"], previous["attachments"])
+                superseded.add(previous["uuid"])
+            self.results[result["historyId"]] = entry
+
+        for name in (name for name in new_files if name.endswith(CONTAINER_SUFFIX)):
+            container = _read_json(os.path.join(self.results_dir, name))
+            if container is not None:
+                self.containers[name] = {
+                    "children": container.get("children", []),
+                    "attachments": _attachments(container),
+                }
+
+        if superseded and self.prune:
+            for name, container in list(self.containers.items()):
+                container["children"] = [child for child in container["children"] if child not in superseded]
+                if not container["children"]:
+                    self._remove(name, container["attachments"])
+                    del self.containers[name]
+        new_results = [result for result in new_results if result["uuid"] not in superseded]
+        logger.info("Allure results: %d new file(s), %d superseded result(s), %d test(s) kept",
+                    len(new_files), len(superseded), len(self.results))
+        return new_results
+
+    def save(self):
+        _write_json(self.path, {
+            "results_dir": os.path.abspath(self.results_dir),
+            "results": self.results,
+            "containers": self.containers,
+        })
+
+
+class ResultHistory:
+    """
+    Compact rolling history of statuses and durations per test, fed only with the new results of a run,
+    so the trends never need the earlier result files.
+    """
+
+    def __init__(self, path: str = RESULT_HISTORY):
+        self.path = path
+        data = (_read_json(path) if os.path.exists(path) else None) or {}
+        # historyId -> {"name", "full_name", "samples": [[stop_ms, status, seconds], ...]}
+        self.tests: dict[str, dict] = data.get("tests", {})
+        self.runs: list[dict] = data.get("runs", [])
+
+    def add_run(self, results: list[dict]) -> list[dict]:
+        """
+        Append the results of one run and return its trend rows.
+
+        Args:
+            results (list[dict]): Allure results of the run.
+
+        Returns:
+            list[dict]: Per test: name, status, seconds, median of the earlier runs and the delta.
+        """
+        rows = []
+        statuses = {}
+        for result in sorted(results, key=lambda result: result.get("stop", 0)):
+            seconds = round((result.get("stop", 0) - result.get("start", 0)) / 1000, 3)
+            status = result.get("status", "unknown")
+            entry = self.tests.setdefault(
+                result["historyId"], {"name": result["name"], "full_name": result.get("fullName", ""), "samples": []}
+            )
+            earlier = [sample[2] for sample in entry["samples"] if sample[1] == "passed"]
+            baseline = percentile(earlier, 50) if earlier else None
+            rows.append({
+                "name": entry["name"],
+                "status": status,
+                "seconds": seconds,
+                "baseline": baseline,
+                "delta": None if baseline is None else round(seconds - baseline, 3),
+            })
+            entry["samples"] = (entry["samples"] + [[result.get("stop", 0), status, seconds]])[-MAX_SAMPLES:]
+            statuses[status] = statuses.get(status, 0) + 1
+        if rows:
+            self.runs = (self.runs + [{
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "tests": len(rows),
+                "seconds": round(sum(row["seconds"] for row in rows), 3),
+                **statuses,
+            }])[-MAX_RUNS:]
+        return rows
+
+    def save(self):
+        _write_json(self.path, {"tests": self.tests, "runs": self.runs})
+        logger.info("Result history saved to %s", self.path)
+
+
+# ---------- Trends ----------
+
+def slowest(rows: list[dict], top: int) -> list[dict]:
+    return sorted(rows, key=lambda row: row["seconds"], reverse=True)[:top]
+
+
+def largest_deltas(rows: list[dict], top: int) -> list[dict]:
+    """Tests that moved the most against their median of earlier passing runs."""
+    compared = [row for row in rows if row["delta"] is not None]
+    return sorted(compared, key=lambda row: abs(row["delta"]), reverse=True)[:top]
+
+
+def format_row(row: dict) -> str:
+    delta = "" if row["delta"] is None else f" ({row['delta']:+.2f}s vs median {row['baseline']:.2f}s)"
+    return f"{row['seconds']:>8.2f}s  {row['status']:<8} {row['name']}{delta}"
+
+
+def write_trends_html(history: ResultHistory, rows: list[dict], top: int, path: str = TRENDS_REPORT) -> str:
+    """Write a small static page with the run history, slowest tests and duration deltas."""
+
+    def table(headers, body):
+        head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+        lines = "".join(
+            "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in line) + "</tr>" for line in body
+        )
+        return f"<table><tr>{head}</tr>{lines}</table>"
+
+    def delta(row):
+        return "" if row["delta"] is None else f"{row['delta']:+.2f}"
+
+    statuses = ("passed", "failed", "broken", "skipped")
+    page = "\n".join([
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8"/><title>Test trends</title>',
+        "<style>body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:1em}"
+        "td,th{border:1px solid #ccc;padding:2px 8px;text-align:left}</style></head><body>",
+        "<h1>Test trends</h1>",
+        "<h2>Runs</h2>",
+        table(["time", "tests", *statuses, "seconds"],
+              [[run["time"], run["tests"], *(run.get(s, 0) for s in statuses), run["seconds"]]
+               for run in reversed(history.runs)]),
+        "<h2>Slowest tests of the last run</h2>",
+        table(["test", "status", "seconds", "median", "delta"],
+              [[row["name"], row["status"], row["seconds"], row["baseline"] or "", delta(row)]
+               for row in slowest(rows, top)]),
+        "<h2>Largest duration changes</h2>",
+        table(["test", "status", "seconds", "median", "delta"],
+              [[row["name"], row["status"], row["seconds"], row["baseline"], delta(row)]
+               for row in largest_deltas(rows, top)]),
+        "</body></html>",
+    ])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    logger.info("Trends report written to %s", path)
+    return path
@@ -1,56 +1,264 @@
 # utils/base_page.py
 import os
-import logging
+import time
 from datetime import datetime
+from typing import NamedTuple
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.screenshots import get_screenshot_writer
+from config.logger import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# Resolves a Selenium (by, value) locator inside the browser: findAll(by, value) -> Element[]
+JS_FIND_ALL = """
+var findAll = function(by, value) {
+    if (by === 'id') { var el = document.getElementById(value); return el ? [el] : []; }
+    if (by === 'xpath') {
+        var snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var out = [];
+        for (var i = 0; i < snap.snapshotLength; i++) { out.push(snap.snapshotItem(i)); }
+        return out;
+    }
+    if (by === 'name') { return Array.prototype.slice.call(document.getElementsByName(value)); }
+    if (by === 'class name') { return Array.prototype.slice.call(document.getElementsByClassName(value)); }
+    return Array.prototype.slice.call(document.querySelectorAll(value));
+};
+"""
+
+# Counts in-flight XHR/fetch requests. Installed lazily, again after every navigation.
+JS_NETWORK_STATE = """
+if (!window.__posXhrTracker) {
+    var tracker = window.__posXhrTracker = {pending: 0, last: Date.now()};
+    var done = function() { tracker.pending = Math.max(0, tracker.pending - 1); tracker.last = Date.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        tracker.pending++; tracker.last = Date.now();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var nativeFetch = window.fetch;
+        window.fetch = function() {
+            tracker.pending++; tracker.last = Date.now();
+            return nativeFetch.apply(this, arguments).finally(done);
+        };
+    }
+}
+var jqueryActive = window.jQuery ? window.jQuery.active : 0;
+return {
+    pending: Math.max(window.__posXhrTracker.pending, jqueryActive),
+    idle_ms: Date.now() - window.__posXhrTracker.last,
+    ready: document.readyState === 'complete'
+};
+"""
+
+# Timing of the current document, in ms since navigation start
+JS_NAVIGATION_TIMING = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+return {
+    id: nav.name + '@' + performance.timeOrigin,
+    url: nav.name,
+    dom_content_loaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transfer_size: nav.transferSize,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+
+class WaitRecord(NamedTuple):
+    """How long a readiness wait actually took."""
+    description: str
+    elapsed: float
+    polls: int
 
 class BasePage:
     """Base class providing reusable Selenium utilities for all page objects."""
 
+    # Adaptive polling: start fast, back off while the page keeps changing
+    poll_start = 0.05
+    poll_max = 0.5
+    poll_factor = 1.5
+
     def __init__(self, driver, timeout: int = 10):
         self.driver = driver
         self.timeout = timeout
+        self.wait = WebDriverWait(driver, timeout)
+        self.wait_records: list[WaitRecord] = []
+        # Resolved elements by locator, reused until they go stale or the page changes
+        self.elements: dict[tuple[str, str], WebElement] = {}
+
+    # ---------- Element cache ----------
+
+    def with_element(self, locator, action, clickable: bool = False):
+        """
+        Run `action(element)` on the element of `locator`, resolving it only if it is not cached.
+        A cached element that went stale (re-rendered, page reloaded) is dropped and resolved once more.
+
+        Args:
+            locator: Selenium (by, value) locator.
+            action: Callable receiving the WebElement.
+            clickable: Wait until the element is visible and enabled first.
+
+        Returns:
+            Whatever `action` returns.
+        """
+        for attempt in range(2):
+            element = self.elements.get(locator)
+            try:
+                if clickable:
+                    element = self.wait.until(EC.element_to_be_clickable(element or locator))
+                elif element is None:
+                    element = self.wait.until(EC.presence_of_element_located(locator))
+                self.elements[locator] = element
+                return action(element)
+            except StaleElementReferenceException:
+                self.elements.pop(locator, None)
+                if attempt:
+                    raise
+                logger.debug("Stale cached element, resolving again: %s", locator)
+
+    def invalidate_cache(self):
+        """Forget every cached element (navigation, or a change of what the locators point to)."""
+        self.elements.clear()
+
+    def refresh(self):
+        """Reload the page and drop the cached elements."""
+        self.driver.refresh()
+        self.invalidate_cache()
 
     # ---------- Wait & interaction utilities ----------
 
     def wait_and_click(self, locator):
         """Wait until an element is clickable and click it."""
-        element = WebDriverWait(self.driver, self.timeout).until(
-            EC.element_to_be_clickable(locator)
-        )
-        element.click()
-        logger.debug(f"Clicked element: {locator}")
+        def click(element):
+            element.click()
+            return element
+
+        element = self.with_element(locator, click, clickable=True)
+        logger.debug("Clicked element: %s", locator)
         return element
 
     def write_input(self, locator, value, clear=True):
         """Wait until input is visible, optionally clear it, then send keys."""
-        element = WebDriverWait(self.driver, self.timeout).until(
-            EC.presence_of_element_located(locator)
-        )
-        if clear:
-            element.clear()
-        element.send_keys(value)
-        logger.debug(f"Input written into {locator}: {value}")
+        def write(element):
+            if clear:
+                element.clear()
+            element.send_keys(value)
+            return element
+
+        element = self.with_element(locator, write)
+        logger.debug("Input written into %s: %s", locator, value)
         return element
 
     def get_text(self, locator) -> str:
         """Wait until element is visible and return its text."""
-        element = WebDriverWait(self.driver, self.timeout).until(
-            EC.presence_of_element_located(locator)
-        )
-        text = element.text.strip()
-        logger.debug(f"Text extracted from {locator}: {text}")
+        text = self.with_element(locator, lambda element: element.text.strip())
+        logger.debug("Text extracted from %s: %s", locator, text)
         return text
 
     def get_value(self, locator) -> str:
         """Return the 'value' attribute of a given element."""
-        value = self.driver.find_element(*locator).get_attribute("value")
-        logger.debug(f"Value extracted from {locator}: {value}")
+        value = self.with_element(locator, lambda element: element.get_attribute("value"))
+        logger.debug("Value extracted from %s: %s", locator, value)
         return value
 
+    # ---------- Readiness waits ----------
+
+    def wait_until(self, condition, description: str, timeout: float | None = None):
+        """
+        Poll `condition(driver)` until it returns a truthy value.
+        The polling interval starts at `poll_start` and grows by `poll_factor`
+        up to `poll_max`, so fast pages are detected quickly without hammering slow ones.
+
+        Args:
+            condition: Callable receiving the driver. Stale elements count as "not ready".
+            description: Human readable signal name, used in logs and timeouts.
+            timeout: Seconds to wait (defaults to the page timeout).
+
+        Returns:
+            The truthy value returned by the condition.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        interval = self.poll_start
+        polls = 0
+        while True:
+            polls += 1
+            try:
+                value = condition(self.driver)
+            except StaleElementReferenceException:
+                value = None
+            elapsed = time.monotonic() - start
+            if value:
+                record = WaitRecord(description, elapsed, polls)
+                self.wait_records.append(record)
+                logger.debug("Ready after %.3fs (%d polls): %s", elapsed, polls, description,
+                             extra={"elapsed": elapsed, "polls": polls, "wait": description})
+                return value
+            if elapsed >= timeout:
+                raise TimeoutException(f"Timed out after {elapsed:.2f}s waiting for {description}")
+            time.sleep(min(interval, timeout - elapsed))
+            interval = min(interval * self.poll_factor, self.poll_max)
+
+    def wait_for_network_idle(self, quiet_ms: int = 100, timeout: float | None = None):
+        """Wait until the document is loaded and no XHR/fetch request ran for `quiet_ms`."""
+        def idle(driver):
+            state = driver.execute_script(JS_NETWORK_STATE)
+            return state["ready"] and state["pending"] == 0 and state["idle_ms"] >= quiet_ms
+        return self.wait_until(idle, "network idle", timeout)
+
+    def wait_for_list_settled(self, locator, contains: str | None = None,
+                              settle: float = 0.15, timeout: float | None = None) -> list[str]:
+        """
+        Wait until the elements matching `locator` stop changing for `settle` seconds.
+
+        Args:
+            locator: Locator matching the list items.
+            contains: Optional text that must be the first line of one of the items.
+            settle: Seconds the item texts must stay identical.
+            timeout: Seconds to wait (defaults to the page timeout).
+
+        Returns:
+            list[str]: Texts of the settled items.
+        """
+        script = JS_FIND_ALL + "return findAll(arguments[0], arguments[1]).map(function(e) { return e.innerText; });"
+        last = {"texts": None, "since": 0.0}
+
+        def settled(driver):
+            texts = driver.execute_script(script, *locator)
+            now = time.monotonic()
+            if texts != last["texts"]:
+                last["texts"], last["since"] = texts, now
+                return None
+            if not texts or now - last["since"] < settle:
+                return None
+            if contains is not None and contains not in [t.strip().split("\n")[0] for t in texts]:
+                return None
+            return texts
+
+        return self.wait_until(settled, f"list {locator} settled", timeout)
+
+    def wait_for_text_change(self, locator, old_text: str, timeout: float | None = None) -> str:
+        """Wait until the text of `locator` differs from `old_text` and return the new text."""
+        script = JS_FIND_ALL + "var els = findAll(arguments[0], arguments[1]); return els.length ? els[0].innerText : null;"
+
+        def changed(driver):
+            text = driver.execute_script(script, *locator)
+            return text.strip() if text is not None and text.strip() != old_text else None
+
+        return self.wait_until(changed, f"text change of {locator}", timeout)
+
+    def read_text(self, locator) -> str | None:
+        """Return the text of the first element matching `locator` without waiting (None if absent)."""
+        script = JS_FIND_ALL + "var els = findAll(arguments[0], arguments[1]); return els.length ? els[0].innerText : null;"
+        text = self.driver.execute_script(script, *locator)
+        return text.strip() if text is not None else None
+
     # ---------- Screenshot utilities ----------
 
     def take_screenshot(self, path: str) -> str:
@@ -58,23 +266,29 @@ class BasePage:
         Save a screenshot of the current page.
         Creates directories automatically if needed.
         If given a folder path, it will generate a unique timestamped filename.
+        The PNG is captured in memory and written by the background screenshot writer.
         """
-        os.makedirs(os.path.dirname(path), exist_ok=True)
         if os.path.isdir(path):
             filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
             path = os.path.join(path, filename)
 
-        self.driver.save_screenshot(path)
-        logger.info(f"Screenshot saved at: {path}")
+        get_screenshot_writer().submit(self.driver.get_screenshot_as_png(), path)
+        logger.info("Screenshot queued for: %s", path)
         return path
 
     # ---------- Utility methods ----------
 
+    def count_dom_nodes(self) -> int:
+        """Return the number of elements in the current document."""
+        return self.driver.execute_script("return document.getElementsByTagName('*').length;")
+
+    def get_navigation_timing(self) -> dict | None:
+        """Return load timings (ms) of the current document, or None if the browser has none."""
+        return self.driver.execute_script(JS_NAVIGATION_TIMING)
+
     def wait_for_element(self, locator):
         """Wait for an element to be present in the DOM."""
-        return WebDriverWait(self.driver, self.timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        return self.with_element(locator, lambda element: element)
 
     def element_exists(self, locator) -> bool:
         """Check if element exists (returns True/False)."""
@@ -0,0 +1,108 @@
+# utils/benchmark.py
+import os
+import json
+import time
+from dataclasses import dataclass, field
+from utils.profiler import summarize
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+BENCHMARK_DIR = "reports/benchmarks"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+@dataclass
+class BenchmarkResult:
+    """Latency samples of one UI flow, warm-up runs excluded."""
+    flow: str
+    samples: list[float] = field(default_factory=list)
+    warmup: int = 0
+
+    @property
+    def stats(self) -> dict:
+        return summarize(self.samples)
+
+    @property
+    def ops_per_minute(self) -> float:
+        total = sum(self.samples)
+        return round(60 * len(self.samples) / total, 2) if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {"flow": self.flow, "warmup": self.warmup, "ops_per_minute": self.ops_per_minute, **self.stats}
+
+
+def run_flow(flow: str, action, repetitions: int, warmup: int = 1, setup=None, teardown=None) -> BenchmarkResult:
+    """
+    Time `action` repeatedly. Only the action itself is measured.
+
+    Args:
+        flow (str): Flow name used in reports and the baseline file.
+        action: Callable performing the measured UI operation.
+        repetitions (int): Measured runs.
+        warmup (int): Extra runs before measuring (caches, JIT, first XHR).
+        setup: Optional untimed callable run before every action.
+        teardown: Optional untimed callable run after every action.
+
+    Returns:
+        BenchmarkResult: Samples in seconds.
+    """
+    result = BenchmarkResult(flow, warmup=warmup)
+    for i in range(warmup + repetitions):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        if teardown:
+            teardown()
+        if i >= warmup:
+            result.samples.append(elapsed)
+    stats = result.stats
+    logger.info("Benchmark %s: p50=%.3fs p95=%.3fs (%s ops/min)", flow, stats["p50"], stats["p95"],
+                result.ops_per_minute, extra={"flow": flow, "p50": stats["p50"], "p95": stats["p95"]})
+    return result
+
+
+class BenchmarkBaseline:
+    """Stored reference results. A flow regresses when its p50 exceeds the baseline by more than `threshold`."""
+
+    def __init__(self, path: str = DEFAULT_BASELINE, threshold: float = 0.2):
+        self.path = path
+        self.threshold = threshold
+        self.flows = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)["flows"]
+
+    def check(self, result: BenchmarkResult) -> str | None:
+        """Return a regression message, or None if the flow is within the threshold (or has no baseline)."""
+        reference = self.flows.get(result.flow)
+        if reference is None:
+            return None
+        limit = reference["p50"] * (1 + self.threshold)
+        p50 = result.stats["p50"]
+        if p50 > limit:
+            return (f"{result.flow} regressed: p50 {p50:.3f}s > {limit:.3f}s "
+                    f"(baseline {reference['p50']:.3f}s + {self.threshold:.0%})")
+        return None
+
+    def save(self, results: list[BenchmarkResult]):
+        """Merge the results into the baseline file."""
+        self.flows.update({result.flow: result.to_dict() for result in results})
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"flows": self.flows}, f, indent=2, sort_keys=True)
+        logger.info("Benchmark baseline saved to %s", self.path)
+
+
+def write_results(results: list[BenchmarkResult], worker_id: str, directory: str = BENCHMARK_DIR) -> str:
+    """Write the run results as JSON and return the path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"benchmark_{worker_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"flows": [result.to_dict() for result in results]}, f, indent=2)
+    return path
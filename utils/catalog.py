@@ -0,0 +1,134 @@
+# utils/catalog.py
+import csv
+import random
+from decimal import Decimal
+from functools import lru_cache
+from itertools import combinations
+from collections.abc import Sequence
+from typing import NamedTuple
+
+PRODUCTS_CSV = "data/products.csv"
+
+
+class Product(NamedTuple):
+    """A sellable product as the POS search shows it."""
+    name: str
+    price: Decimal
+
+
+class ProductSet(NamedTuple):
+    """Products for one test case with their exact expected total."""
+    products: tuple[Product, ...]
+    total: Decimal
+
+    @property
+    def names(self) -> list[str]:
+        return [product.name for product in self.products]
+
+
+def total_price(products) -> Decimal:
+    """Exact sum of the product prices."""
+    return sum((product.price for product in products), Decimal("0"))
+
+
+def product_set_id(product_set: ProductSet) -> str:
+    """Readable pytest id for a product set, e.g. 'BOLSA+CASCADA'."""
+    return "+".join(product_set.names)
+
+
+class ProductCatalog(Sequence):
+    """
+    Product catalog loaded once from CSV into parallel name/price lists
+    plus a name index. No pandas: collection stays fast even with tens of thousands of SKUs.
+    """
+
+    def __init__(self, names: list[str], prices: list[Decimal]):
+        self._names = names
+        self._prices = prices
+        self._index = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_csv(cls, path: str, name_column: str = "name", price_column: str = "price") -> "ProductCatalog":
+        """Stream a `name,price` CSV export into a catalog."""
+        names, prices = [], []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            name_i, price_i = header.index(name_column), header.index(price_column)
+            for row in reader:
+                if row:
+                    names.append(row[name_i])
+                    prices.append(Decimal(row[price_i]))
+        return cls(names, prices)
+
+    # ---------- Lookup ----------
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, index: int) -> Product:
+        return Product(self._names[index], self._prices[index])
+
+    def __contains__(self, name) -> bool:
+        return name in self._index
+
+    def price_of(self, name: str) -> Decimal:
+        """Return the price of `name` (KeyError if unknown)."""
+        return self._prices[self._index[name]]
+
+    # ---------- Test data generation ----------
+
+    def sample_sets(self, num_sets: int, size: int, seed) -> list[ProductSet]:
+        """
+        Reproducible random product sets (no repeated product inside a set).
+
+        Args:
+            num_sets (int): Number of sets.
+            size (int): Products per set.
+            seed: Any int/str seed; the same seed always gives the same sets.
+        """
+        rng = random.Random(seed)
+        sets = []
+        for _ in range(num_sets):
+            products = tuple(self[i] for i in rng.sample(range(len(self)), size))
+            sets.append(ProductSet(products, total_price(products)))
+        return sets
+
+    def pairwise_sets(self, size: int, pool: int | None = None, seed=0) -> list[ProductSet]:
+        """
+        Product sets where every pair of products from the pool appears together at least once
+        (greedy covering). Far fewer sets than all combinations for size >= 3.
+
+        Args:
+            size (int): Products per set (>= 2).
+            pool (int | None): Draw the pool from a seeded sample of this many products.
+                Pairs grow quadratically, so keep it in the hundreds for big catalogs.
+            seed: Seed of the pool sample.
+        """
+        indexes = list(range(len(self)))
+        if pool is not None and pool < len(indexes):
+            indexes = sorted(random.Random(seed).sample(indexes, pool))
+        pairs = list(combinations(indexes, 2))
+        uncovered = set(pairs)
+        sets = []
+        for pair in pairs:
+            if pair not in uncovered:
+                continue
+            chosen = list(pair)
+            while len(chosen) < min(size, len(indexes)):
+                # Add the product closing the most still-uncovered pairs with the chosen ones
+                best = max(
+                    (i for i in indexes if i not in chosen),
+                    key=lambda i: sum((min(i, c), max(i, c)) in uncovered for c in chosen),
+                )
+                chosen.append(best)
+            uncovered -= {(min(a, b), max(a, b)) for a, b in combinations(chosen, 2)}
+            products = tuple(self[i] for i in sorted(chosen))
+            sets.append(ProductSet(products, total_price(products)))
+        return sets
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: str = PRODUCTS_CSV) -> ProductCatalog:
+    """Load a catalog once per process."""
+    return ProductCatalog.from_csv(path)
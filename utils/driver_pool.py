@@ -0,0 +1,225 @@
+# utils/driver_pool.py
+import time
+import queue
+import threading
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Used JS heap of the current page, 0 when the browser does not expose it
+JS_HEAP_USED = "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0;"
+
+
+class PooledDriver:
+    """
+    Stable handle on the browser a DriverPool handed out.
+    Fixtures and page objects keep the handle while the pool swaps the browser behind it;
+    attribute reads and writes go to the current WebDriver.
+    """
+
+    def __init__(self, driver):
+        object.__setattr__(self, "driver", driver)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.driver, name, value)
+
+
+class DriverPool:
+    """
+    Starts browsers on background threads before the tests need them (Chrome and chromedriver
+    startup run while pytest collects), hands out warm instances after a health check,
+    and recycles a browser after a number of tests or once its JS heap grew too much.
+    One pool per process: every xdist worker has its own.
+    """
+
+    def __init__(self, factory, spares: int = 1, max_tests: int = 0, max_memory_mb: float = 0,
+                 start_timeout: float = 120):
+        """
+        Args:
+            factory: Callable returning a started WebDriver (e.g. BrowserProfile.start).
+            spares (int): Browsers kept started and idle, ready to be handed out.
+            max_tests (int): Recycle a browser after this many tests (0 = never).
+            max_memory_mb (float): Recycle a browser once its JS heap grew this much since
+                it was handed out (0 = never).
+            start_timeout (float): Seconds to wait for a browser to start.
+        """
+        self.factory = factory
+        self.spares = spares
+        self.max_tests = max_tests
+        self.max_memory_mb = max_memory_mb
+        self.start_timeout = start_timeout
+        # Called with the handle after a swap, in registration order (re-instrument, log in again)
+        self.on_swap: list = []
+        self.ready: queue.Queue = queue.Queue()
+        self.in_use: dict[int, dict] = {}
+        self.threads: list[threading.Thread] = []
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stats = {"started": 0, "recycled": 0, "unhealthy": 0, "wait": 0.0}
+
+    @property
+    def recycling(self) -> bool:
+        return bool(self.max_tests or self.max_memory_mb)
+
+    # ---------- Background start ----------
+
+    def start(self):
+        """Start the spare browsers without waiting for them."""
+        for _ in range(self.spares):
+            self._spawn()
+        return self
+
+    def _spawn(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.pending += 1
+        thread = threading.Thread(target=self._start_driver, name="driver-pool", daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def _start_driver(self):
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception as error:
+            logger.exception("Browser start failed")
+            self.ready.put(error)
+        else:
+            logger.info("Browser started in the background in %.1fs", time.perf_counter() - start)
+            with self.lock:
+                self.stats["started"] += 1
+            self.ready.put(driver)
+        finally:
+            with self.lock:
+                self.pending -= 1
+        if self.closed:
+            self._drain()
+
+    def _take(self):
+        """Next started browser, starting one first if none is ready or on its way."""
+        with self.lock:
+            empty = self.ready.empty() and not self.pending
+        if empty:
+            self._spawn()
+        start = time.perf_counter()
+        try:
+            driver = self.ready.get(timeout=self.start_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No browser started within {self.start_timeout:.0f}s") from None
+        self.stats["wait"] += time.perf_counter() - start
+        if isinstance(driver, Exception):
+            raise driver
+        return driver
+
+    # ---------- Hand out and recycle ----------
+
+    def acquire(self) -> PooledDriver:
+        """Return a handle on a healthy, started browser."""
+        handle = PooledDriver(self._healthy())
+        self._track(handle.driver)
+        return handle
+
+    def _healthy(self):
+        while True:
+            driver = self._take()
+            if self.recycling:
+                # Keep the next browser warm for the first recycle
+                self._spawn()
+            if is_alive(driver):
+                return driver
+            self.stats["unhealthy"] += 1
+            logger.warning("Discarding a browser that failed its health check")
+            self._quit_later(driver)
+
+    def _track(self, driver):
+        self.in_use[id(driver)] = {"tests": 0, "heap": js_heap_mb(driver) if self.max_memory_mb else 0.0}
+
+    def release_test(self, handle: PooledDriver) -> bool:
+        """
+        Count one finished test on the handle's browser and swap it for a warm one when it is
+        due for recycling or no longer responds.
+
+        Returns:
+            bool: True if the browser was swapped (the on_swap callbacks ran).
+        """
+        usage = self.in_use.get(id(handle.driver))
+        if usage is None:
+            return False
+        usage["tests"] += 1
+        reason = None
+        if not is_alive(handle.driver):
+            reason = "unresponsive"
+        elif self.max_tests and usage["tests"] >= self.max_tests:
+            reason = f"served {usage['tests']} tests"
+        elif self.max_memory_mb:
+            growth = js_heap_mb(handle.driver) - usage["heap"]
+            if growth >= self.max_memory_mb:
+                reason = f"JS heap grew {growth:.0f} MB"
+        if reason is None:
+            return False
+        logger.info("Recycling browser (%s)", reason)
+        self.stats["recycled"] += 1
+        old = handle.driver
+        del self.in_use[id(old)]
+        self._quit_later(old)
+        object.__setattr__(handle, "driver", self._healthy())
+        self._track(handle.driver)
+        for callback in self.on_swap:
+            callback(handle)
+        return True
+
+    def release(self, handle: PooledDriver):
+        """Quit the handle's browser, the test session no longer needs it."""
+        self.in_use.pop(id(handle.driver), None)
+        _quit(handle.driver)
+
+    # ---------- Shutdown ----------
+
+    def _quit_later(self, driver):
+        threading.Thread(target=_quit, args=(driver,), name="driver-pool-quit", daemon=True).start()
+
+    def _drain(self):
+        while True:
+            try:
+                driver = self.ready.get_nowait()
+            except queue.Empty:
+                return
+            if not isinstance(driver, Exception):
+                _quit(driver)
+
+    def close(self, timeout: float = 30):
+        """Quit the idle browsers, waiting for the ones still starting."""
+        with self.lock:
+            self.closed = True
+        for thread in self.threads:
+            thread.join(timeout)
+        self._drain()
+        logger.info("Driver pool closed: %(started)d started, %(recycled)d recycled, %(unhealthy)d unhealthy, "
+                    "%(wait).1fs waited for a browser", self.stats)
+
+
+def is_alive(driver) -> bool:
+    """Cheap round trip to the browser."""
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+def js_heap_mb(driver) -> float:
+    try:
+        return (driver.execute_script(JS_HEAP_USED) or 0) / 1_048_576
+    except Exception:
+        return 0.0
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        logger.warning("Browser did not quit cleanly", exc_info=True)
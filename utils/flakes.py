@@ -0,0 +1,172 @@
+# utils/flakes.py
+import os
+import json
+from collections import Counter
+from utils.profiler import percentile
+from utils.scheduling import base_nodeid
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+FLAKE_HISTORY = ".cache/flake_history.json"
+
+# Failure categories worth a retry: the page was not ready yet, not a wrong result
+TRANSIENT_CATEGORIES = ("timeout", "stale")
+# Exception names per category, matched against the exception class and its bases
+CATEGORY_EXCEPTIONS = {
+    "timeout": ("TimeoutException", "TimeoutError"),
+    "stale": ("StaleElementReferenceException",),
+    "assertion": ("AssertionError",),
+}
+# pytest-rerunfailures `only_rerun` patterns, matched against the failure message
+TRANSIENT_ERRORS = [name for category in TRANSIENT_CATEGORIES for name in CATEGORY_EXCEPTIONS[category]]
+
+# Duration samples kept per test
+MAX_DURATIONS = 20
+
+
+def classify_failure(excinfo) -> str:
+    """Return the failure category of a pytest ExceptionInfo: timeout, stale, assertion or error."""
+    names = {cls.__name__ for cls in excinfo.type.__mro__}
+    for category, exceptions in CATEGORY_EXCEPTIONS.items():
+        if names.intersection(exceptions):
+            return category
+    return "error"
+
+
+class FlakeHistory:
+    """
+    Per-test outcome history across runs, stored as JSON.
+    A run is 'passed', 'flaky' (failed, then passed on a rerun) or 'failed'.
+    Tests that fail intermittently, or whose usual duration exceeds the slow budget,
+    are quarantined so they stop dominating the run.
+    """
+
+    def __init__(self, path: str = FLAKE_HISTORY, min_runs: int = 5, flake_threshold: float = 0.2,
+                 slow_budget: float = 0):
+        """
+        Args:
+            path (str): History file.
+            min_runs (int): Runs needed before a test can be quarantined.
+            flake_threshold (float): Share of unstable runs (flaky or failed) that quarantines a test
+                which also passes sometimes. Tests that never pass are broken, not flaky.
+            slow_budget (float): Median seconds above which a test is quarantined as slow (0 = off).
+        """
+        self.path = path
+        self.min_runs = min_runs
+        self.flake_threshold = flake_threshold
+        self.slow_budget = slow_budget
+        self.tests: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)["tests"]
+        except (OSError, ValueError, KeyError):
+            logger.warning("Unreadable flake history %s, starting a new one", self.path)
+            return {}
+
+    # ---------- Recording ----------
+
+    def record(self, nodeid: str, outcome: str, duration: float, categories: list[str]):
+        """
+        Add one run of a test.
+
+        Args:
+            nodeid (str): Test id.
+            outcome (str): passed, flaky or failed.
+            duration (float): Seconds of the final attempt.
+            categories (list[str]): Category of every failed attempt.
+        """
+        entry = self.tests.setdefault(
+            nodeid, {"runs": 0, "passed": 0, "flaky": 0, "failed": 0, "categories": {}, "durations": []}
+        )
+        entry["runs"] += 1
+        entry[outcome] += 1
+        entry["categories"] = dict(Counter(entry["categories"]) + Counter(categories))
+        entry["durations"] = (entry["durations"] + [round(duration, 3)])[-MAX_DURATIONS:]
+
+    def save(self):
+        """Write the history (write then rename)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tests": self.tests}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        logger.info("Flake history saved to %s", self.path)
+
+    # ---------- Analysis ----------
+
+    def flake_rate(self, nodeid: str) -> float:
+        """Share of unstable runs of a test that also passes, 0 for tests that never passed."""
+        entry = self.tests.get(nodeid)
+        if not entry or not entry["passed"] + entry["flaky"]:
+            return 0.0
+        return (entry["flaky"] + entry["failed"]) / entry["runs"]
+
+    def median_duration(self, nodeid: str) -> float:
+        entry = self.tests.get(nodeid)
+        return percentile(entry["durations"], 50) if entry else 0.0
+
+    def quarantine_reason(self, nodeid: str) -> str | None:
+        """Why a test is quarantined, or None."""
+        entry = self.tests.get(nodeid)
+        if not entry or entry["runs"] < self.min_runs:
+            return None
+        rate = self.flake_rate(nodeid)
+        if rate >= self.flake_threshold:
+            top = ", ".join(f"{name} x{count}" for name, count in Counter(entry["categories"]).most_common(2))
+            return f"flaky: {rate:.0%} unstable over {entry['runs']} runs ({top})"
+        median = self.median_duration(nodeid)
+        if self.slow_budget and median > self.slow_budget:
+            return f"slow: median {median:.1f}s over a {self.slow_budget:.0f}s budget"
+        return None
+
+
+class FlakeTracker:
+    """
+    pytest plugin that follows every test through its reruns and records the final outcome.
+    Registered once, on the process that sees every report (the xdist controller or a plain run).
+    """
+
+    def __init__(self, history: FlakeHistory):
+        self.history = history
+        self.attempts: dict[str, list[str]] = {}
+        # node id -> (history id, category of every failed attempt)
+        self.flaky: dict[str, tuple[str, list[str]]] = {}
+        # Tests whose final outcome was recorded in this run
+        self.recorded = 0
+
+    def pytest_runtest_logreport(self, report):
+        failures = self.attempts.setdefault(report.nodeid, [])
+        category = getattr(report, "failure_category", "error")
+        if report.outcome == "rerun":
+            failures.append(category)
+        elif report.when == "call" and report.passed:
+            outcome = "flaky" if failures else "passed"
+            if failures:
+                self.flaky[base_nodeid(report.nodeid)] = (self._history_id(report), failures)
+            self._finish(report, outcome)
+        elif report.when == "call" and report.skipped and hasattr(report, "wasxfail"):
+            # A quarantined (xfail) test failing again still counts, so it can leave quarantine later
+            failures.append(category)
+            self._finish(report, "failed")
+        elif report.failed and report.when in ("setup", "call"):
+            failures.append(category)
+            self._finish(report, "failed")
+
+    @staticmethod
+    def _history_id(report) -> str:
+        """Key of the test in the history: node ids of seeded tests change with the seed (see history_id)."""
+        return getattr(report, "history_id", None) or base_nodeid(report.nodeid)
+
+    def _finish(self, report, outcome: str):
+        self.history.record(self._history_id(report), outcome, report.duration, self.attempts.pop(report.nodeid, []))
+        self.recorded += 1
+
+    def pytest_sessionfinish(self, session):
+        # --collect-only and runs where every test was deselected have nothing to add
+        if self.recorded:
+            self.history.save()
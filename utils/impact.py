@@ -0,0 +1,346 @@
+# utils/impact.py
+import os
+import ast
+import json
+import inspect
+import textwrap
+import functools
+import subprocess
+from datetime import datetime
+from utils.scheduling import base_nodeid
+from utils.instrumentation import instrument_methods, restore_methods
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+IMPACT_MAP = ".cache/impact_map.json"
+
+# Code whose symbols are traced: a change there selects only the tests that exercised it
+TRACED_PATHS = ("pages/", "locators/", "services/", "utils/base_page.py")
+# Changes that never affect a test run
+IGNORED_PATHS = ("reports/", "logs/", ".gitignore", "README")
+IGNORED_SUFFIXES = (".md", ".txt", ".html")
+TESTS_PATH = "tests/"
+
+
+def _relative(path: str) -> str:
+    return os.path.relpath(path).replace(os.sep, "/")
+
+
+def _source_file(obj) -> str:
+    return _relative(inspect.getsourcefile(obj))
+
+
+@functools.lru_cache(maxsize=None)
+def _module_constants(path: str) -> frozenset:
+    """Names assigned at the top level of a module."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return frozenset(
+        target.id
+        for node in tree.body if isinstance(node, ast.Assign)
+        for target in node.targets if isinstance(target, ast.Name)
+    )
+
+
+# ---------- Tracing ----------
+
+class ImpactTracer:
+    """
+    Records which page-object, service and locator symbols each test exercises.
+    Methods are wrapped like the step profiler does; the locators and module constants a method
+    reads are found once from its source, so a locator counts as exercised when a method using it ran.
+    Symbols look like 'pages/sales_page.py::SalesPage.add_product_by_code'.
+    """
+
+    def __init__(self):
+        self.current: set[str] | None = None
+        self._originals: list[tuple[type, str, object]] = []
+
+    def instrument(self, *classes):
+        """Wrap every method (public, private, static and class methods, and __init__) defined on each class."""
+        for cls in classes:
+            self._originals += instrument_methods(
+                cls,
+                lambda name, func: self._wrap(func, self._symbols(cls, name, func)),
+                include=lambda name: not name.startswith("__") or name == "__init__",
+                static=True,
+            )
+
+    def uninstrument(self):
+        """Restore the original methods."""
+        restore_methods(self._originals)
+
+    def start(self):
+        self.current = set()
+
+    def stop(self) -> list[str]:
+        symbols, self.current = sorted(self.current or ()), None
+        return symbols
+
+    def _wrap(self, func, symbols: frozenset):
+        tracer = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if tracer.current is not None:
+                tracer.current.update(symbols)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @staticmethod
+    def _symbols(cls, name: str, func) -> frozenset:
+        """The method itself plus the locator attributes and module constants its source reads."""
+        original = inspect.unwrap(func)
+        symbols = {f"{_source_file(original)}::{cls.__name__}.{name}"}
+        try:
+            tree = ast.parse(textwrap.dedent(inspect.getsource(original)))
+        except (OSError, SyntaxError):
+            return frozenset(symbols)
+        namespace = original.__globals__
+        constants = _module_constants(inspect.getsourcefile(original))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+                owner = namespace.get(node.value.id)
+                if inspect.isclass(owner) and owner.__module__.startswith("locators."):
+                    symbols.add(f"{_source_file(owner)}::{owner.__name__}.{node.attr}")
+            elif isinstance(node, ast.Name) and node.id in constants:
+                symbols.add(f"{_source_file(original)}::{node.id}")
+        return frozenset(symbols)
+
+
+class ImpactRecorder:
+    """
+    pytest plugin that collects the symbols reported by every test and merges them into the impact map.
+    Registered on the process that sees every report (the xdist controller or a plain run).
+    Symbols reached while setting up fixtures are shared: a change there selects every test.
+    """
+
+    def __init__(self, path: str = IMPACT_MAP):
+        self.path = path
+        self.tests: dict[str, set[str]] = {}
+        self.shared: set[str] = set()
+
+    def pytest_runtest_logreport(self, report):
+        symbols = getattr(report, "impact", None)
+        if symbols is None:
+            return
+        # Seeded tests get new node ids every run; history_id stays the same (see utils.scheduling.history_id)
+        test = getattr(report, "history_id", None) or base_nodeid(report.nodeid)
+        self.tests.setdefault(test, set()).update(symbols)
+        if report.when == "setup":
+            self.shared.update(symbols)
+
+    def pytest_sessionfinish(self, session):
+        if not self.tests:
+            return
+        impact_map = load_impact_map(self.path) or {"tests": {}, "shared": []}
+        impact_map["tests"].update({nodeid: sorted(symbols) for nodeid, symbols in self.tests.items()})
+        impact_map["shared"] = sorted(set(impact_map["shared"]) | self.shared)
+        try:
+            impact_map["commit"] = _git("rev-parse", "HEAD").strip()
+        except (OSError, subprocess.CalledProcessError):
+            impact_map["commit"] = None
+        impact_map["recorded"] = datetime.now().isoformat(timespec="seconds")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(impact_map, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        logger.info("Impact map of %d test(s) saved to %s", len(self.tests), self.path)
+
+
+def load_impact_map(path: str = IMPACT_MAP) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        logger.warning("Unreadable impact map %s", path)
+        return None
+
+
+# ---------- Change detection ----------
+
+def _git(*args: str) -> str:
+    """Run git and return its output (CalledProcessError on failure, e.g. an unknown ref)."""
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+
+def parse_diff(diff: str) -> dict[str, tuple[set[int], set[int]]]:
+    """
+    Changed lines of a `git diff --unified=0` output.
+
+    Returns:
+        dict: Path -> (changed lines in the old version, changed lines in the new version).
+            Deletions are also marked on the neighbouring line of the new version.
+    """
+    changes: dict[str, tuple[set[int], set[int]]] = {}
+    old_path = new_path = None
+    header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            header = True
+        elif header and line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif header and line.startswith("+++ "):
+            new_path = line[6:] if line.startswith("+++ b/") else None
+            changes[new_path or old_path] = (set(), set())
+        elif line.startswith("@@"):
+            header = False
+            old, new = line.split()[1:3]
+            old_start, _, old_count = old[1:].partition(",")
+            new_start, _, new_count = new[1:].partition(",")
+            old_lines, new_lines = changes[new_path or old_path]
+            old_start, new_start = int(old_start), int(new_start)
+            old_lines.update(range(old_start, old_start + int(old_count or 1)))
+            new_lines.update(range(new_start, new_start + max(int(new_count or 1), 1)))
+    return changes
+
+
+def changed_lines(base: str) -> dict[str, tuple[set[int], set[int]]]:
+    """
+    Lines changed between `base` and the working tree, untracked files included (see parse_diff()).
+    Raises CalledProcessError when git cannot diff against `base`.
+    """
+    changes = parse_diff(_git("diff", "--unified=0", "--no-color", "--no-renames", base, "--"))
+    for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes.setdefault(path, (set(), {0}))
+    return changes
+
+
+def symbol_ranges(source: str, path: str) -> list[tuple[int, int, str]]:
+    """
+    (first line, last line, symbol) of the functions, methods and assignments of a module,
+    innermost last. Lines outside them belong to the class ('path::Class') or the whole file ('path::*').
+    """
+    ranges = []
+
+    def start(node):
+        return min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+
+    def visit(body, prefix):
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                ranges.append((start(node), node.end_lineno, f"{path}::{prefix}{node.name}"))
+                visit(node.body, f"{prefix}{node.name}.")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                ranges.append((start(node), node.end_lineno, f"{path}::{prefix}{node.name}"))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        ranges.append((node.lineno, node.end_lineno, f"{path}::{prefix}{target.id}"))
+
+    visit(ast.parse(source).body, "")
+    return ranges
+
+
+def changed_symbols(path: str, source: str | None, lines: set[int]) -> set[str]:
+    """Innermost symbol of every changed line of one version of a file."""
+    if source is None or not lines:
+        return set()
+    try:
+        ranges = symbol_ranges(source, path)
+    except SyntaxError:
+        return {f"{path}::*"}
+    symbols = set()
+    for line in lines:
+        matches = [symbol for first, last, symbol in ranges if first <= line <= last]
+        symbols.add(matches[-1] if matches else f"{path}::*")
+    return symbols
+
+
+class ImpactSelection:
+    """Which tests a change set affects, given the impact map of an earlier full run."""
+
+    def __init__(self, run_all: str | None = None, changed: set[str] = frozenset(),
+                 test_files: set[str] = frozenset(), impact_map: dict | None = None):
+        """
+        Args:
+            run_all (str | None): Reason to run every test (no map, untraced code changed), or None.
+            changed (set[str]): Changed traced symbols.
+            test_files (set[str]): Changed test files, all their tests run.
+            impact_map (dict | None): Recorded map.
+        """
+        self.run_all = run_all
+        self.changed = set(changed)
+        self.test_files = set(test_files)
+        self.tests = (impact_map or {}).get("tests", {})
+        self.shared = set((impact_map or {}).get("shared", []))
+
+    @classmethod
+    def from_git(cls, base: str, impact_map: dict | None) -> "ImpactSelection":
+        if impact_map is None:
+            return cls(run_all="no impact map, record one with --impact-record")
+        try:
+            changes = changed_lines(base)
+        except (OSError, subprocess.CalledProcessError) as error:
+            # Selecting nothing would pass while testing nothing (unknown ref, shallow clone)
+            logger.warning("git diff against %s failed: %s", base, (getattr(error, "stderr", None) or str(error)).strip())
+            return cls(run_all=f"git diff against {base} failed")
+        changed, test_files = set(), set()
+        for path, (old_lines, new_lines) in changes.items():
+            if path.startswith(IGNORED_PATHS) or path.endswith(IGNORED_SUFFIXES):
+                continue
+            if path.startswith(TESTS_PATH):
+                test_files.add(path)
+            elif path.startswith(TRACED_PATHS) and path.endswith(".py"):
+                try:
+                    old_source = _git("show", f"{base}:{path}") if old_lines else None
+                except subprocess.CalledProcessError:
+                    return cls(run_all=f"git show {base}:{path} failed")
+                new_source = _read(path) if new_lines else None
+                changed |= changed_symbols(path, old_source, old_lines)
+                changed |= changed_symbols(path, new_source, new_lines or set())
+            else:
+                return cls(run_all=f"{path} changed and is not traced")
+        return cls(changed=changed, test_files=test_files, impact_map=impact_map)
+
+    def to_dict(self) -> dict:
+        """Plain data, to hand the selection to xdist workers."""
+        return {
+            "run_all": self.run_all,
+            "changed": sorted(self.changed),
+            "test_files": sorted(self.test_files),
+            "impact_map": {"tests": self.tests, "shared": sorted(self.shared)},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ImpactSelection":
+        return cls(data["run_all"], set(data["changed"]), set(data["test_files"]), data["impact_map"])
+
+    def _affects(self, symbols) -> bool:
+        for changed in self.changed:
+            path, _, name = changed.partition("::")
+            if name == "*":
+                if any(symbol.startswith(f"{path}::") for symbol in symbols):
+                    return True
+            elif any(symbol == changed or symbol.startswith(f"{changed}.") for symbol in symbols):
+                return True
+        return False
+
+    @functools.cached_property
+    def shared_changed(self) -> bool:
+        return self._affects(self.shared)
+
+    def selects(self, nodeid: str) -> bool:
+        """
+        True if the test may be affected: unknown to the map, in a changed file, or exercising a change.
+        Pass the test's history_id, under which the map is recorded.
+        """
+        nodeid = base_nodeid(nodeid)
+        if self.run_all or self.shared_changed or nodeid.split("::")[0] in self.test_files:
+            return True
+        symbols = self.tests.get(nodeid)
+        return symbols is None or self._affects(symbols)
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
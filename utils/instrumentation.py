@@ -0,0 +1,40 @@
+# utils/instrumentation.py
+import inspect
+
+
+def is_public(name: str) -> bool:
+    return not name.startswith("_")
+
+
+def instrument_methods(cls, wrap, include=is_public, static: bool = False) -> list[tuple[type, str, object]]:
+    """
+    Replace the methods defined directly on `cls` with wrappers.
+
+    Args:
+        cls (type): Class to instrument.
+        wrap: Callable (name, function) returning the wrapper of a plain function.
+        include: Callable (name) -> bool choosing the methods, public ones by default.
+        static (bool): Also wrap static and class methods (the wrapper then gets no `self`).
+
+    Returns:
+        list: (cls, name, original attribute) of every wrapped method, for restore_methods().
+    """
+    originals = []
+    for name, attr in list(vars(cls).items()):
+        if not include(name):
+            continue
+        descriptor = type(attr) if static and isinstance(attr, (staticmethod, classmethod)) else None
+        func = attr.__func__ if descriptor else attr
+        if not inspect.isfunction(func):
+            continue
+        wrapped = wrap(name, func)
+        originals.append((cls, name, attr))
+        setattr(cls, name, descriptor(wrapped) if descriptor else wrapped)
+    return originals
+
+
+def restore_methods(originals: list[tuple[type, str, object]]):
+    """Put back the methods replaced by instrument_methods(), last wrapped first, and empty the list."""
+    for cls, name, attr in reversed(originals):
+        setattr(cls, name, attr)
+    originals.clear()
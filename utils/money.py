@@ -0,0 +1,166 @@
+# utils/money.py
+import csv
+from array import array
+from bisect import bisect_left
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import NamedTuple
+
+# The POS shows and charges amounts in cents, halves rounded up
+CENT = Decimal("0.01")
+# Share of a mixed payment paid in cash, the rest goes to the card
+DEFAULT_CASH_RATIO = Decimal("0.8")
+# Cash handed over in the payment tests
+DEFAULT_CASH = Decimal("1000")
+
+
+def to_money(value) -> Decimal:
+    """Exact amount in cents. Floats go through their shortest repr, so 0.1 stays 0.10."""
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def parse_amount(text: str | None) -> Decimal | None:
+    """Parse a POS amount label or field such as '$ 1,365.00' or '365.5', None if it is not a number."""
+    if not text or not text.strip():
+        return None
+    try:
+        return Decimal(text.split()[-1].replace(",", ""))
+    except InvalidOperation:
+        return None
+
+
+def parse_cash_ratio(value) -> Decimal:
+    """Parse the share of a mixed payment paid in cash (e.g. '0.8'), ValueError unless it is within 0..1."""
+    try:
+        ratio = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"cash ratio must be a number between 0 and 1, got {value!r}") from None
+    if not ratio.is_finite() or not 0 <= ratio <= 1:
+        raise ValueError(f"cash ratio must be between 0 and 1, got {value!r}")
+    return ratio
+
+
+class MixedPayment(NamedTuple):
+    """Expected fields of the payment modal for a cash + card payment."""
+    cash: Decimal         # charged in cash ('enEfectivo')
+    card: Decimal         # charged to the card ('enTarjeta')
+    change: Decimal       # cash handed back ('cambio')
+    remaining: Decimal    # still unpaid ('totalRestante')
+
+
+def cash_change(total, cash_given) -> Decimal:
+    """Change of a cash payment, negative when the cash does not cover the total."""
+    return to_money(cash_given) - to_money(total)
+
+
+def split_payment(total, cash_given, cash_ratio=DEFAULT_CASH_RATIO) -> MixedPayment:
+    """
+    Split a total between cash and card the way the POS payment modal does:
+    the cash part is rounded to cents, the card takes the rest, change is given on the cash part.
+
+    Args:
+        total: Ticket total.
+        cash_given: Cash handed over by the customer.
+        cash_ratio: Share of the total paid in cash (0..1).
+
+    Returns:
+        MixedPayment: Cash and card parts, change and remaining amount.
+    """
+    numerator, denominator = parse_cash_ratio(cash_ratio).as_integer_ratio()
+    cash, card, change = _split_cents(_cents(total), _cents(cash_given), numerator, denominator)
+    return MixedPayment(Decimal(cash) * CENT, Decimal(card) * CENT, Decimal(change) * CENT, Decimal("0.00"))
+
+
+class ScenarioOutcome(NamedTuple):
+    """Everything a scenario row's ticket should show: total, cash change and mixed payment."""
+    total: Decimal
+    change: Decimal
+    split: MixedPayment
+
+
+# ---------- Scenario files ----------
+
+def _cents(value) -> int:
+    return int(to_money(value) / CENT)
+
+
+def _ratio_cents(cents: int, numerator: int, denominator: int) -> int:
+    """cents * numerator / denominator, halves rounded up (cents are never negative here)."""
+    return (2 * cents * numerator + denominator) // (2 * denominator)
+
+
+def _split_cents(total: int, given: int, numerator: int, denominator: int) -> tuple[int, int, int]:
+    """Cash part, card part and change of a mixed payment, all in cents. Shared by split_payment and OutcomeTable."""
+    cash = _ratio_cents(total, numerator, denominator)
+    return cash, max(total - cash, 0), given - cash
+
+
+class OutcomeTable:
+    """
+    Expected outcomes of every row of a scenario file, computed in one pass before any browser starts.
+    Columns are integer cents in compact arrays, so exact and cheap for files with thousands of carts:
+    ticket total, change of a cash payment and the cash/card/change fields of a mixed payment.
+    Rows are looked up by their line number (ScenarioRef.line).
+    """
+
+    def __init__(self, lines: array, totals: array, cash_given=DEFAULT_CASH, cash_ratio=DEFAULT_CASH_RATIO):
+        self.lines = lines
+        self.totals = totals
+        self.cash_given = to_money(cash_given)
+        self.cash_ratio = parse_cash_ratio(cash_ratio)
+        given = _cents(self.cash_given)
+        numerator, denominator = self.cash_ratio.as_integer_ratio()
+        self.changes = array("q", (given - total for total in totals))
+        self.split_cash, self.split_card, self.split_changes = array("q"), array("q"), array("q")
+        for total in totals:
+            cash, card, change = _split_cents(total, given, numerator, denominator)
+            self.split_cash.append(cash)
+            self.split_card.append(card)
+            self.split_changes.append(change)
+
+    @classmethod
+    def from_scenarios(cls, path: str, cash_given=DEFAULT_CASH, cash_ratio=DEFAULT_CASH_RATIO) -> "OutcomeTable":
+        """Read the expected total column of a scenario file and derive the payment columns."""
+        from utils.scenarios import read_schema  # pydantic stays unloaded for the page objects
+
+        column = read_schema(path).total_column
+        lines, totals = array("q"), array("q")
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            next(reader)
+            for row in reader:
+                if row:
+                    lines.append(reader.line_num)
+                    # A total that is not a number stays 0; the catalog check skips that row
+                    amount = parse_amount(row[column]) if column < len(row) else None
+                    totals.append(_cents(amount) if amount is not None and amount.is_finite() else 0)
+        return cls(lines, totals, cash_given, cash_ratio)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def _index(self, line: int) -> int:
+        i = bisect_left(self.lines, line)
+        if i == len(self.lines) or self.lines[i] != line:
+            raise KeyError(f"No scenario row on line {line}")
+        return i
+
+    def total(self, line: int) -> Decimal:
+        return Decimal(self.totals[self._index(line)]) * CENT
+
+    def change(self, line: int) -> Decimal:
+        """Change when the row's ticket is paid with `cash_given` in cash."""
+        return Decimal(self.changes[self._index(line)]) * CENT
+
+    def outcome(self, line: int) -> ScenarioOutcome:
+        return ScenarioOutcome(self.total(line), self.change(line), self.split(line))
+
+    def split(self, line: int) -> MixedPayment:
+        """Mixed payment of the row's ticket with `cash_given` and `cash_ratio`."""
+        i = self._index(line)
+        return MixedPayment(
+            Decimal(self.split_cash[i]) * CENT,
+            Decimal(self.split_card[i]) * CENT,
+            Decimal(self.split_changes[i]) * CENT,
+            Decimal("0.00"),
+        )
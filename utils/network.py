@@ -0,0 +1,300 @@
+# utils/network.py
+import os
+import json
+import time
+import functools
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from utils.profiler import summarize
+from utils.instrumentation import instrument_methods, restore_methods
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+NETWORK_DIR = "reports/profiling"
+
+# Chrome capability that turns on the CDP "performance" log read by NetworkRecorder
+PERFORMANCE_LOGGING = {"goog:loggingPrefs": {"performance": "ALL"}}
+
+# Requests that reach the POS backend, as opposed to static assets
+BACKEND_TYPES = ("XHR", "Fetch", "Document")
+
+
+@dataclass
+class NetworkEntry:
+    """One request seen in the Chrome performance log."""
+    request_id: str
+    url: str
+    method: str
+    resource_type: str
+    action: str | None
+    test: str | None
+    started: float                      # epoch seconds
+    timestamp: float                    # monotonic CDP seconds, for durations
+    request_headers: dict = field(default_factory=dict)
+    status: int | None = None
+    status_text: str = ""
+    mime_type: str = ""
+    response_headers: dict = field(default_factory=dict)
+    timing: dict | None = None
+    encoded_size: int = 0
+    duration_ms: float | None = None
+    failed: str | None = None
+
+    @property
+    def server_ms(self) -> float | None:
+        """Time to first byte after the request was sent (backend processing + one network trip)."""
+        if not self.timing:
+            return None
+        return max(self.timing["receiveHeadersEnd"] - self.timing["sendEnd"], 0.0)
+
+    @property
+    def is_backend(self) -> bool:
+        return self.resource_type in BACKEND_TYPES
+
+
+class NetworkRecorder:
+    """
+    Opt-in network capture (--capture-network).
+    Reads Chrome's performance log at the start and end of every page-object action,
+    so each request is tied to the outermost action that was running when it was sent.
+    Requests are only kept until their test finished; the run keeps per-action numbers.
+    """
+
+    def __init__(self):
+        self.driver = None
+        # Requests seen since the last finish_test()
+        self.entries: dict[str, NetworkEntry] = {}
+        self.current_test: str | None = None
+        self.action_walls: list[tuple[str | None, str, float]] = []
+        # action -> counters and samples of the finished tests, for the run summary
+        self.run_actions: dict[str, dict] = {}
+        self._action: str | None = None
+        self._depth = 0
+        self._originals: list[tuple[type, str, object]] = []
+
+    # ---------- Instrumentation ----------
+
+    def instrument(self, *classes):
+        """Wrap every public method defined directly on each class."""
+        for cls in classes:
+            self._originals += instrument_methods(cls, lambda name, func: self._wrap(f"{cls.__name__}.{name}", func))
+
+    def uninstrument(self):
+        """Restore the original methods."""
+        restore_methods(self._originals)
+
+    def _wrap(self, action: str, func):
+        recorder = self
+
+        @functools.wraps(func)
+        def wrapper(page, *args, **kwargs):
+            outermost = recorder._depth == 0 and recorder.driver is not None
+            if outermost:
+                recorder.drain()
+                recorder._action = action
+                start = time.perf_counter()
+            recorder._depth += 1
+            try:
+                return func(page, *args, **kwargs)
+            finally:
+                recorder._depth -= 1
+                if outermost:
+                    recorder.drain()
+                    recorder._action = None
+                    recorder.action_walls.append((recorder.current_test, action, time.perf_counter() - start))
+
+        return wrapper
+
+    # ---------- Performance log ----------
+
+    def drain(self):
+        """Consume the pending performance log entries."""
+        if self.driver is None:
+            return
+        for log_entry in self.driver.get_log("performance"):
+            message = json.loads(log_entry["message"])["message"]
+            handler = self._handlers.get(message["method"])
+            if handler is not None:
+                handler(self, message["params"])
+
+    def _request_will_be_sent(self, params: dict):
+        request = params["request"]
+        previous = self.entries.pop(params["requestId"], None)
+        if previous is not None and params.get("redirectResponse"):
+            # A redirect reuses the request id: close the previous hop and keep it under its own key
+            self._apply_response(previous, params["redirectResponse"])
+            previous.duration_ms = (params["timestamp"] - previous.timestamp) * 1000
+            self.entries[f"{params['requestId']}@{previous.timestamp}"] = previous
+        self.entries[params["requestId"]] = NetworkEntry(
+            request_id=params["requestId"],
+            url=request["url"],
+            method=request["method"],
+            resource_type=params.get("type", "Other"),
+            action=self._action,
+            test=self.current_test,
+            started=params.get("wallTime", time.time()),
+            timestamp=params["timestamp"],
+            request_headers=request.get("headers", {}),
+        )
+
+    def _response_received(self, params: dict):
+        entry = self.entries.get(params["requestId"])
+        if entry is not None:
+            self._apply_response(entry, params["response"])
+
+    @staticmethod
+    def _apply_response(entry: NetworkEntry, response: dict):
+        entry.status = response["status"]
+        entry.status_text = response.get("statusText", "")
+        entry.mime_type = response.get("mimeType", "")
+        entry.response_headers = response.get("headers", {})
+        entry.timing = response.get("timing")
+
+    def _loading_finished(self, params: dict):
+        entry = self.entries.get(params["requestId"])
+        if entry is None:
+            return
+        entry.encoded_size = int(params.get("encodedDataLength", 0))
+        entry.duration_ms = (params["timestamp"] - entry.timestamp) * 1000
+
+    def _loading_failed(self, params: dict):
+        entry = self.entries.get(params["requestId"])
+        if entry is None:
+            return
+        entry.failed = params.get("errorText") or "failed"
+        entry.duration_ms = (params["timestamp"] - entry.timestamp) * 1000
+
+    _handlers = {
+        "Network.requestWillBeSent": _request_will_be_sent,
+        "Network.responseReceived": _response_received,
+        "Network.loadingFinished": _loading_finished,
+        "Network.loadingFailed": _loading_failed,
+    }
+
+    # ---------- Reporting ----------
+
+    def test_entries(self, test: str) -> list[NetworkEntry]:
+        return [entry for entry in self.entries.values() if entry.test == test]
+
+    @staticmethod
+    def _aggregate(entries: list[NetworkEntry], walls, into: dict | None = None) -> dict:
+        """Add the backend requests and action wall times to per-action counters and samples."""
+        rows = {} if into is None else into
+
+        def row(action):
+            return rows.setdefault(action, {"requests": 0, "bytes": 0, "failed": 0,
+                                            "server_ms": [], "network_ms": [], "wall_ms": []})
+
+        for entry in entries:
+            if not entry.is_backend:
+                continue
+            counters = row(entry.action or "(outside actions)")
+            counters["requests"] += 1
+            counters["bytes"] += entry.encoded_size
+            counters["failed"] += 1 if entry.failed or (entry.status or 0) >= 400 else 0
+            if entry.server_ms is not None:
+                counters["server_ms"].append(entry.server_ms)
+            if entry.duration_ms is not None:
+                counters["network_ms"].append(entry.duration_ms)
+        for _, action, wall in walls:
+            row(action)["wall_ms"].append(wall * 1000)
+        return rows
+
+    @staticmethod
+    def action_summary(rows: dict) -> dict:
+        """
+        Per action: backend request count, bytes transferred, server time and network time.
+        Comparing `network_ms` with the action wall time shows how much was client-side work.
+        """
+        return {
+            action: {
+                "requests": row["requests"],
+                "bytes": row["bytes"],
+                "failed": row["failed"],
+                "server_ms": summarize(row["server_ms"]),
+                "network_ms": summarize(row["network_ms"]),
+                "wall_ms": summarize(row["wall_ms"]),
+            }
+            for action, row in sorted(rows.items())
+            if row["requests"]
+        }
+
+    def test_summary(self, test: str) -> dict:
+        walls = [record for record in self.action_walls if record[0] == test]
+        return self.action_summary(self._aggregate(self.test_entries(test), walls))
+
+    def finish_test(self):
+        """Fold the requests and wall times seen so far into the run summary and forget them."""
+        self._aggregate(list(self.entries.values()), self.action_walls, self.run_actions)
+        self.entries.clear()
+        self.action_walls.clear()
+
+    def format_table(self, summary: dict) -> str:
+        """Plain-text table of an action summary, for Allure and the logs."""
+        lines = [f"{'action':<36}{'reqs':>6}{'KB':>9}{'server p50':>12}{'server max':>12}{'wall p50':>10}"]
+        for action, row in summary.items():
+            lines.append(
+                f"{action:<36}{row['requests']:>6}{row['bytes'] / 1024:>9.1f}"
+                f"{row['server_ms']['p50']:>12.1f}{row['server_ms']['max']:>12.1f}{row['wall_ms']['p50']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def to_har(self, entries: list[NetworkEntry]) -> dict:
+        """HAR 1.2 log of the entries; the triggering action is kept in the custom `_action` field."""
+        return {"log": {
+            "version": "1.2",
+            "creator": {"name": "SmartSiteHub_Testing", "version": "1.0"},
+            "pages": [],
+            "entries": [_har_entry(entry) for entry in sorted(entries, key=lambda entry: entry.started)],
+        }}
+
+    def write_report(self, worker_id: str, directory: str = NETWORK_DIR) -> str:
+        """Write the run summary per action as JSON and return its path."""
+        self.finish_test()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"network_{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"actions": self.action_summary(self.run_actions)}, f, indent=2)
+        logger.info("Network summary written to %s", path)
+        return path
+
+
+def _har_entry(entry: NetworkEntry) -> dict:
+    timing = entry.timing or {}
+    send = max(timing.get("sendEnd", 0) - timing.get("sendStart", 0), 0)
+    wait = entry.server_ms or 0
+    total = entry.duration_ms or 0
+    return {
+        "startedDateTime": datetime.fromtimestamp(entry.started, timezone.utc).isoformat(),
+        "time": round(total, 3),
+        "request": {
+            "method": entry.method,
+            "url": entry.url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": k, "value": str(v)} for k, v in entry.request_headers.items()],
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": -1,
+        },
+        "response": {
+            "status": entry.status or 0,
+            "statusText": entry.failed or entry.status_text,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": k, "value": str(v)} for k, v in entry.response_headers.items()],
+            "cookies": [],
+            "content": {"size": entry.encoded_size, "mimeType": entry.mime_type},
+            "redirectURL": "",
+            "headersSize": -1,
+            "bodySize": entry.encoded_size,
+        },
+        "cache": {},
+        "timings": {
+            "send": round(send, 3),
+            "wait": round(wait, 3),
+            "receive": round(max(total - send - wait, 0), 3),
+        },
+        "_action": entry.action,
+        "_resourceType": entry.resource_type,
+    }
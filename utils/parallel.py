@@ -0,0 +1,17 @@
+# utils/parallel.py
+import os
+
+
+def get_worker_id() -> str:
+    """
+    Return the pytest-xdist worker id of the current process.
+
+    Returns:
+        str: Worker id such as 'gw0', or 'master' when the run is not distributed.
+    """
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker(config) -> bool:
+    """Check if the given pytest config belongs to an xdist worker process."""
+    return hasattr(config, "workerinput")
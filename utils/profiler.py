@@ -0,0 +1,143 @@
+# utils/profiler.py
+import os
+import json
+import time
+import functools
+from collections import defaultdict
+from typing import NamedTuple
+from utils.instrumentation import instrument_methods, restore_methods
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILING_DIR = "reports/profiling"
+
+
+class StepRecord(NamedTuple):
+    """Timing of one page-object call."""
+    test: str | None
+    action: str
+    wall: float
+    commands: int
+    wait: float
+    depth: int
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the `pct` percentile (0-100) of `values` using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: list[float]) -> dict:
+    """Return count, p50, p95 and max of a list of durations."""
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "max": round(max(values), 4) if values else 0.0,
+        "total": round(sum(values), 4),
+    }
+
+
+class StepProfiler:
+    """
+    Opt-in profiler for page-object actions.
+    Wraps public methods of the given page classes and records, per call,
+    wall time, WebDriver commands sent and time spent in readiness waits.
+    """
+
+    def __init__(self):
+        self.records: list[StepRecord] = []
+        self.current_test: str | None = None
+        self.command_count = 0
+        self._depth = 0
+        self._originals: list[tuple[type, str, object]] = []
+
+    # ---------- Instrumentation ----------
+
+    def instrument(self, *classes):
+        """Wrap every public method defined directly on each class."""
+        for cls in classes:
+            self._originals += instrument_methods(cls, lambda name, func: self._wrap(f"{cls.__name__}.{name}", func))
+
+    def uninstrument(self):
+        """Restore the original methods."""
+        restore_methods(self._originals)
+
+    def instrument_driver(self, driver):
+        """Count WebDriver commands: every command goes through driver.execute."""
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def counting_execute(driver_command, params=None):
+            self.command_count += 1
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+        return driver
+
+    def _wrap(self, action: str, func):
+        profiler = self
+
+        @functools.wraps(func)
+        def wrapper(page, *args, **kwargs):
+            waits_before = len(getattr(page, "wait_records", []))
+            commands_before = profiler.command_count
+            profiler._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(page, *args, **kwargs)
+            finally:
+                wall = time.perf_counter() - start
+                profiler._depth -= 1
+                wait = sum(r.elapsed for r in getattr(page, "wait_records", [])[waits_before:])
+                profiler.records.append(StepRecord(
+                    profiler.current_test, action, wall,
+                    profiler.command_count - commands_before, wait, profiler._depth,
+                ))
+
+        return wrapper
+
+    # ---------- Reporting ----------
+
+    def aggregate(self, records: list[StepRecord] | None = None) -> dict:
+        """Group records by action and return wall/commands/wait statistics."""
+        records = self.records if records is None else records
+        grouped = defaultdict(list)
+        for record in records:
+            grouped[record.action].append(record)
+        return {
+            action: {
+                "wall": summarize([r.wall for r in items]),
+                "commands": summarize([r.commands for r in items]),
+                "wait": summarize([r.wait for r in items]),
+            }
+            for action, items in sorted(grouped.items())
+        }
+
+    def test_summary(self, test: str) -> dict:
+        """Per-action statistics for one test."""
+        return self.aggregate([r for r in self.records if r.test == test])
+
+    def report(self) -> dict:
+        """Full report: per action across the run and per test."""
+        tests = sorted({r.test for r in self.records if r.test})
+        return {
+            "actions": self.aggregate(),
+            "tests": {test: self.test_summary(test) for test in tests},
+        }
+
+    def write_report(self, worker_id: str, directory: str = PROFILING_DIR) -> str:
+        """Write the report as JSON and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"step_timings_{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info("Step timings written to %s", path)
+        return path
@@ -0,0 +1,159 @@
+# utils/scenarios.py
+import os
+import re
+import csv
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterator, NamedTuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from utils.money import parse_amount
+
+# Product columns: `product` (one per row) or `product1..productN`
+PRODUCT_COLUMN = re.compile(r"^product(\d*)$")
+# Expected total column, first match wins
+TOTAL_COLUMNS = ("total_price", "total", "price")
+
+
+class CartScenario(BaseModel):
+    """One validated scenario row: the products to sell and the total the ticket must show."""
+    model_config = ConfigDict(frozen=True)
+
+    products: tuple[str, ...] = Field(min_length=1)
+    total_price: Decimal = Field(ge=0)
+    source: str
+
+    @field_validator("products", mode="before")
+    @classmethod
+    def drop_empty_columns(cls, products):
+        # Files with product1..productN leave unused columns blank for smaller carts
+        return tuple(name.strip() for name in products if name and name.strip())
+
+
+class ScenarioRef(NamedTuple):
+    """Where a scenario row lives. Only this is kept per test, the row is read when the test runs."""
+    path: str
+    offset: int
+    line: int
+
+    @property
+    def id(self) -> str:
+        return f"{os.path.basename(self.path)}:{self.line}"
+
+
+class ScenarioSchema(NamedTuple):
+    """Column positions of a scenario file, derived from its header."""
+    header: list[str]
+    product_columns: list[int]
+    total_column: int
+
+    @classmethod
+    def from_header(cls, header: list[str], path: str) -> "ScenarioSchema":
+        products = sorted(
+            (int(match.group(1) or 0), i)
+            for i, name in enumerate(header)
+            if (match := PRODUCT_COLUMN.match(name.strip()))
+        )
+        total = next((header.index(name) for name in TOTAL_COLUMNS if name in header), None)
+        if not products or total is None:
+            raise ValueError(
+                f"{path}: expected 'product' or 'product1..N' columns and one of {TOTAL_COLUMNS}, got {header}"
+            )
+        return cls(header, [i for _, i in products], total)
+
+
+@lru_cache(maxsize=None)
+def read_schema(path: str) -> ScenarioSchema:
+    """Read only the header line of a scenario file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return ScenarioSchema.from_header(next(csv.reader(f)), path)
+
+
+def parse_shard(shard: str | None) -> tuple[int, int] | None:
+    """Parse '2/4' (1-based) into (index, count), None for no sharding."""
+    if not shard:
+        return None
+    index, count = (int(part) for part in shard.split("/"))
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid scenario shard '{shard}', expected K/N with 1 <= K <= N")
+    return index, count
+
+
+def iter_scenario_refs(path: str, shard: tuple[int, int] | None = None, limit: int | None = None) -> Iterator[ScenarioRef]:
+    """
+    Stream the byte offset of every data row, one line at a time.
+    Rows must not contain embedded newlines.
+
+    Args:
+        path (str): CSV scenario file.
+        shard (tuple | None): (index, count), keeps every count-th row starting at index (1-based).
+        limit (int | None): Stop after this many rows of the shard.
+    """
+    read_schema(path)  # Fail at collection on a malformed header
+    yielded = 0
+    with open(path, "rb") as f:
+        f.readline()
+        row = 0
+        line = 1
+        offset = f.tell()
+        for raw in iter(f.readline, b""):
+            line += 1
+            if raw.strip():
+                if shard is None or row % shard[1] == shard[0] - 1:
+                    yield ScenarioRef(path, offset, line)
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+                row += 1
+            offset += len(raw)
+
+
+def load_scenario(ref: ScenarioRef) -> CartScenario:
+    """Read and validate the single row `ref` points to."""
+    schema = read_schema(ref.path)
+    with open(ref.path, "rb") as f:
+        f.seek(ref.offset)
+        values = next(csv.reader([f.readline().decode("utf-8")]))
+    values += [""] * (len(schema.header) - len(values))
+    return CartScenario(
+        products=[values[i] for i in schema.product_columns],
+        total_price=values[schema.total_column],
+        source=ref.id,
+    )
+
+
+def catalog_mismatches(path: str, catalog) -> dict[int, str]:
+    """
+    Check every row of a scenario file against the product catalog, in one streaming pass.
+    The rows are the expected test data and are never changed here; mismatches are only reported.
+
+    Args:
+        path (str): CSV scenario file.
+        catalog (ProductCatalog): Products and prices the POS sells.
+
+    Returns:
+        dict[int, str]: Problem per line number, for unknown products, totals that are not a number
+            and totals that are not the sum of the catalog prices; empty when the file matches the catalog.
+    """
+    schema = read_schema(path)
+    problems = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for values in reader:
+            if not values:
+                continue
+            values += [""] * (len(schema.header) - len(values))
+            names = [values[i].strip() for i in schema.product_columns if values[i].strip()]
+            unknown = [name for name in names if name not in catalog]
+            if unknown:
+                problems[reader.line_num] = f"not in the catalog: {', '.join(unknown)}"
+                continue
+            text = values[schema.total_column].strip()
+            total = parse_amount(text)
+            if total is None or not total.is_finite():
+                problems[reader.line_num] = f"total {text!r} is not a number"
+                continue
+            expected = sum((catalog.price_of(name) for name in names), Decimal("0"))
+            if total != expected:
+                problems[reader.line_num] = f"total {text} but the catalog prices sum to {expected}"
+    return problems
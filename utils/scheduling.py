@@ -0,0 +1,182 @@
+# utils/scheduling.py
+import re
+import heapq
+import pytest
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Run order of the page states: payment tests leave a modal open and inventory tests
+# navigate away from the sales view, so each kind runs after the states it would disturb.
+PAGE_STATES = ("sales", "payment", "inventory")
+# Page state implied by the fixtures a test requests, when it has no page_state marker
+FIXTURE_STATES = {"inventory_page": "inventory", "sales_page": "sales"}
+
+# Assumed duration of a test without history
+DEFAULT_DURATION = 5.0
+
+LPT_GROUP = "lpt-{}"
+# Suffix xdist --dist loadgroup appends to node ids
+LPT_SUFFIX = re.compile(r"@lpt-\d+$")
+
+
+def page_state(item) -> str | None:
+    """Page state a test needs: its page_state marker, else inferred from its fixtures."""
+    marker = item.get_closest_marker("page_state")
+    if marker is not None:
+        return marker.args[0]
+    return next((state for fixture, state in FIXTURE_STATES.items() if fixture in item.fixturenames), None)
+
+
+def order_by_page_state(items: list):
+    """
+    Group tests by the page state they need, in PAGE_STATES order. The sort is stable,
+    so file order is kept inside a group; tests needing no page run first.
+    """
+    rank = {state: i + 1 for i, state in enumerate(PAGE_STATES)}
+    items.sort(key=lambda item: rank.get(page_state(item), 0))
+
+
+def assign_lpt_groups(items: list, workers: int, duration_of) -> list[float]:
+    """
+    Spread tests over `workers` xdist groups, longest first onto the least loaded group
+    (longest-processing-time-first). Run with --dist loadgroup so each group stays on one worker.
+
+    Args:
+        items (list): Collected test items.
+        workers (int): Number of groups, one per xdist worker.
+        duration_of: Callable returning the expected seconds of a test's history_id (0 when unknown).
+
+    Returns:
+        list[float]: Estimated seconds per group.
+    """
+    # Tests with their own xdist_group keep it
+    items = [item for item in items if item.get_closest_marker("xdist_group") is None]
+    history = {item.nodeid: duration_of(history_id(item)) for item in items}
+    known = [d for d in history.values() if d]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    estimates = {nodeid: duration or fallback for nodeid, duration in history.items()}
+
+    loads = [(0.0, group) for group in range(workers)]
+    totals = [0.0] * workers
+    for item in sorted(items, key=lambda item: estimates[item.nodeid], reverse=True):
+        load, group = heapq.heappop(loads)
+        item.add_marker(pytest.mark.xdist_group(LPT_GROUP.format(group)))
+        totals[group] = load + estimates[item.nodeid]
+        heapq.heappush(loads, (totals[group], group))
+    logger.info("LPT schedule over %d workers, estimated seconds per worker: %s",
+                workers, ", ".join(f"{total:.0f}" for total in totals))
+    return totals
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Node id without the xdist group suffix added by assign_lpt_groups()."""
+    return LPT_SUFFIX.sub("", nodeid)
+
+
+def history_id(item) -> str:
+    """
+    Id under which a test's durations, flake history and impact are kept across runs.
+    Tests marked `seeded` draw their parameters from the run seed, so their node ids change
+    with every seed: they are keyed on the test function and the case index instead,
+    e.g. 'tests/test_sales_2.py::TestSales::test_add_single_item_and_validate_total[#2]'.
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec is None or item.get_closest_marker("seeded") is None:
+        return base_nodeid(item.nodeid)
+    indices = "-".join(str(index) for index in callspec.indices.values())
+    return f"{item.parent.nodeid}::{item.originalname}[#{indices}]"
+
+
+# ---------- -m / -k ahead of pytest ----------
+
+# Tokens of a -m/-k expression: parentheses and identifiers as pytest accepts them
+EXPRESSION_TOKEN = re.compile(r"\s*(\(|\)|[\w:+\-.\[\]\\/]+)")
+
+
+def _parse_expression(expression: str):
+    """
+    Parse a -m/-k expression ('a and not (b or c)') into a predicate over a name matcher.
+    Raises ValueError on anything this small parser does not know (e.g. mark keyword arguments).
+    """
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = EXPRESSION_TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unsupported expression {expression!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+    tokens.append(None)
+    index = 0
+
+    def take(expected=None):
+        nonlocal index
+        token = tokens[index]
+        if expected is not None and token != expected:
+            raise ValueError(f"Expected {expected!r} in {expression!r}")
+        index += 1
+        return token
+
+    def any_of():
+        terms = [all_of()]
+        while tokens[index] == "or":
+            take()
+            terms.append(all_of())
+        return lambda matches: any(term(matches) for term in terms)
+
+    def all_of():
+        terms = [negation()]
+        while tokens[index] == "and":
+            take()
+            terms.append(negation())
+        return lambda matches: all(term(matches) for term in terms)
+
+    def negation():
+        token = take()
+        if token == "not":
+            term = negation()
+            return lambda matches: not term(matches)
+        if token == "(":
+            term = any_of()
+            take(")")
+            return term
+        if token in (None, ")", "and", "or"):
+            raise ValueError(f"Unexpected {token!r} in {expression!r}")
+        return lambda matches: matches(token)
+
+    predicate = any_of()
+    if tokens[index] is not None:
+        raise ValueError(f"Unexpected {tokens[index]!r} in {expression!r}")
+    return predicate
+
+
+def deselect_by_options(config, items: list):
+    """
+    Drop the tests -m and -k would deselect, reporting them through pytest_deselected.
+    pytest applies both after the collection hooks; schedulers that must only see the tests
+    that will run call this first (pytest's own pass is then a no-op).
+    An expression this parser does not understand is left to pytest.
+    """
+    filters = []
+    markexpr, keyword = config.option.markexpr, config.option.keyword
+    try:
+        if markexpr:
+            marks = _parse_expression(markexpr)
+            filters.append(lambda item: marks({mark.name for mark in item.iter_markers()}.__contains__))
+        if keyword:
+            words = _parse_expression(keyword)
+            filters.append(lambda item: words(
+                lambda word: any(word.lower() in name.lower() for name in item.keywords)
+            ))
+    except ValueError:
+        logger.warning("Could not apply -m/-k before scheduling, groups may include deselected tests")
+        return
+    if not filters:
+        return
+    selected, deselected = [], []
+    for item in items:
+        (selected if all(keep(item) for keep in filters) else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
@@ -0,0 +1,141 @@
+# utils/screenshots.py
+import io
+import os
+import time
+import queue
+import threading
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCREENSHOTS_DIR = "logs/screenshots"
+# Files written by the failure hook; retention never touches other files in the folder
+SCREENSHOT_PREFIX = "failure_"
+
+
+class ScreenshotWriter:
+    """
+    Writes screenshots to disk on a background thread.
+    The test thread only captures PNG bytes and enqueues them. The queue is
+    bounded, so a burst of failures cannot grow memory without limit.
+    """
+
+    def __init__(self, directory: str = SCREENSHOTS_DIR, max_queue: int = 32, max_files: int = 200,
+                 max_age_days: float = 7, max_width: int = 0):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_age = max_age_days * 86400
+        self.max_width = max_width
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self.thread.start()
+
+    def submit(self, png: bytes, path: str, timeout: float = 5) -> str:
+        """
+        Queue PNG bytes to be written at `path`.
+        Blocks at most `timeout` seconds when the queue is full, then drops the screenshot.
+        """
+        self._ensure_started()
+        try:
+            self.queue.put((png, path), timeout=timeout)
+        except queue.Full:
+            logger.warning("Screenshot queue full, dropped %s", path)
+        return path
+
+    def close(self, timeout: float = 30):
+        """Flush pending screenshots, stop the thread and apply the retention policy."""
+        if self.thread is None:
+            return  # Nothing was written, leave the folder alone
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+        self.apply_retention()
+
+    # ---------- Background thread ----------
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            png, path = job
+            try:
+                self._write(png, path)
+            except Exception:
+                logger.exception("Could not write screenshot %s", path)
+
+    def _write(self, png: bytes, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        Image = _pillow() if self.max_width else None
+        if Image is not None:
+            image = Image.open(io.BytesIO(png))
+            if image.width > self.max_width:
+                image.thumbnail((self.max_width, self.max_width * image.height // image.width))
+            image.save(path, format="PNG", optimize=True)
+        else:
+            with open(path, "wb") as f:
+                f.write(png)
+        logger.info("Screenshot saved at: %s", path)
+
+    # ---------- Retention ----------
+
+    def apply_retention(self):
+        """
+        Keep at most `max_files` failure screenshots, none older than `max_age_days`.
+        Only files named with SCREENSHOT_PREFIX are pruned, other PNGs in the folder are left alone.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        # Other xdist workers prune the same folder: files can vanish between listing, stat and remove
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SCREENSHOT_PREFIX) and name.endswith(".png"):
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        files.sort(reverse=True)
+        now = time.time()
+        expired = [path for i, (mtime, path) in enumerate(files) if i >= self.max_files or now - mtime > self.max_age]
+        removed = 0
+        for path in expired:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        if removed:
+            logger.info("Removed %d old screenshots from %s", removed, self.directory)
+
+
+def _pillow():
+    """PIL.Image if Pillow is installed (optional: only needed to downscale screenshots), else None."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_screenshot_writer() -> ScreenshotWriter:
+    """Return the process-wide screenshot writer (settings from POS_SCREENSHOT_* env vars)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ScreenshotWriter(
+                max_files=int(os.getenv("POS_SCREENSHOT_MAX_FILES", "200")),
+                max_age_days=float(os.getenv("POS_SCREENSHOT_MAX_AGE_DAYS", "7")),
+                max_width=int(os.getenv("POS_SCREENSHOT_MAX_WIDTH", "0")),
+            )
+        return _writer
@@ -0,0 +1,177 @@
+# utils/session_cache.py
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+SESSION_CACHE_DIR = ".cache/session"
+
+JS_DUMP_STORAGE = """
+var dump = function(storage) {
+    var out = {};
+    for (var i = 0; i < storage.length; i++) { var key = storage.key(i); out[key] = storage.getItem(key); }
+    return out;
+};
+return {origin: location.origin, local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# Runs before the page scripts of every new document until it is removed again
+JS_RESTORE_STORAGE = """
+(function(state) {
+    if (location.origin !== state.origin) { return; }
+    Object.keys(state.local).forEach(function(key) { localStorage.setItem(key, state.local[key]); });
+    Object.keys(state.session).forEach(function(key) { sessionStorage.setItem(key, state.session[key]); });
+})(%s);
+"""
+
+
+class SessionCache:
+    """
+    Disk cache of an authenticated browser session (cookies + localStorage/sessionStorage).
+    Lets later fixtures and xdist workers skip the login UI flow.
+    """
+
+    def __init__(self, base_url: str, user: str, ttl: int = 1800, cache_dir: str = SESSION_CACHE_DIR):
+        self.base_url = base_url
+        self.ttl = ttl
+        key = hashlib.sha1(f"{base_url}|{user}".encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(cache_dir, f"session_{key}.json")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    # ---------- Persistence ----------
+
+    def load(self) -> dict | None:
+        """Return the cached state, or None if missing or expired."""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Unreadable session cache %s, ignoring it", self.path)
+            return None
+        if time.time() - state["saved_at"] > self.ttl:
+            logger.info("Cached session expired")
+            return None
+        return state
+
+    def save(self, driver):
+        """Snapshot cookies and web storage of the current page to disk."""
+        if not self.enabled:
+            return
+        state = {
+            "saved_at": time.time(),
+            "url": driver.current_url,
+            "cookies": driver.get_cookies(),
+            "storage": driver.execute_script(JS_DUMP_STORAGE),
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Write then rename, so a worker never reads a half written file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        logger.info("Session saved to %s", self.path)
+
+    def clear(self):
+        """Remove the cached state (e.g. after the server rejected it)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @contextmanager
+    def lock(self, timeout: float = 240, stale_after: float = 180):
+        """
+        Cross-process lock around the login, so only one xdist worker logs in
+        through the UI while the others wait and restore its session.
+
+        Args:
+            timeout (float): Seconds to wait for the lock. Longer than `stale_after`,
+                so a waiting worker outlives the lock of a crashed one.
+            stale_after (float): Age in seconds after which a lock counts as left behind
+                by a crashed worker. Far above the time a UI login takes.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_path = f"{self.path}.lock"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    logger.warning("Removing stale session lock %s", lock_path)
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                # Released (or broken by another waiter) in the meantime, try again at once
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire session lock {lock_path}")
+            time.sleep(0.1)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                logger.warning("Session lock %s was removed while held", lock_path)
+
+    # ---------- Browser restore ----------
+
+    def restore(self, driver) -> bool:
+        """
+        Load the cached session into a fresh driver and open the saved page.
+
+        Returns:
+            bool: True if a cached state was applied. The caller still has to
+            check that the server accepted it.
+        """
+        state = self.load()
+        if state is None:
+            return False
+        if hasattr(driver, "execute_cdp_cmd"):
+            self._restore_with_cdp(driver, state)
+        else:
+            self._restore_with_navigation(driver, state)
+        logger.info("Session restored from %s", self.path)
+        return True
+
+    def _restore_with_cdp(self, driver, state: dict):
+        """Chrome: set cookies and storage before the first navigation (single page load)."""
+        cookies = []
+        for cookie in state["cookies"]:
+            param = {k: v for k, v in cookie.items() if k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")}
+            if "expiry" in cookie:
+                param["expires"] = cookie["expiry"]
+            cookies.append(param)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        script = driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": JS_RESTORE_STORAGE % json.dumps(state["storage"])},
+        )
+        try:
+            driver.get(state["url"])
+        finally:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]})
+
+    def _restore_with_navigation(self, driver, state: dict):
+        """Other browsers: cookies can only be added once the origin is open."""
+        parts = urlsplit(state["url"])
+        driver.get(f"{parts.scheme}://{parts.netloc}/")
+        driver.delete_all_cookies()
+        for cookie in state["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(JS_RESTORE_STORAGE % json.dumps(state["storage"]))
+        driver.get(state["url"])
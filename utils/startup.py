@@ -0,0 +1,94 @@
+# utils/startup.py
+import os
+import sys
+import json
+import time
+import builtins
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+STARTUP_DIR = "reports/profiling"
+
+# Libraries that should not be imported just to collect or list tests
+HEAVY_MODULES = ("selenium", "allure", "requests", "urllib3", "pandas", "numpy", "pydantic", "PIL", "dotenv")
+
+
+def heavy_modules_loaded() -> list[str]:
+    """Heavy libraries already present in sys.modules."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class StartupTimer:
+    """
+    Startup and collection timing (--startup-timing).
+    Records the time spent collecting each test module and, like `python -X importtime`,
+    the cumulative import time of every module first imported while collecting.
+    Imports done before pytest_configure (plugins, root conftest) are not seen here,
+    use `python -X importtime -m pytest --collect-only` for those.
+    """
+
+    def __init__(self):
+        # CPU time the interpreter, pytest and its plugins used before the suite's own hooks ran
+        self.cpu_before_configure = time.process_time()
+        self.preloaded = heavy_modules_loaded()
+        self.phases: dict[str, float] = {}
+        self.modules: dict[str, float] = {}
+        self.imports: dict[str, float] = {}
+        self._import = None
+
+    # ---------- Import timing ----------
+
+    def start_import_timing(self):
+        """Time every new import until stop_import_timing()."""
+        if self._import is not None:
+            return
+        original = self._import = builtins.__import__
+        timer = self
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                timer.imports.setdefault(name, time.perf_counter() - start)
+
+        builtins.__import__ = timed_import
+
+    def stop_import_timing(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    # ---------- Phases ----------
+
+    def record_phase(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record_module(self, path: str, seconds: float):
+        """Time spent importing and collecting one test module."""
+        self.modules[path] = seconds
+
+    # ---------- Reporting ----------
+
+    def report(self, top: int = 15) -> dict:
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "cpu_before_configure": round(self.cpu_before_configure, 4),
+            "phases": {phase: round(seconds, 4) for phase, seconds in self.phases.items()},
+            "modules": {path: round(seconds, 4) for path, seconds in sorted(self.modules.items())},
+            "slowest_imports": {name: round(seconds, 4) for name, seconds in slowest},
+            "heavy_modules_before_collection": self.preloaded,
+            "heavy_modules_after_collection": heavy_modules_loaded(),
+        }
+
+    def write_report(self, worker_id: str, directory: str = STARTUP_DIR) -> str:
+        """Write the report as JSON (one file per worker) and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"startup_{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info("Startup timings written to %s", path)
+        return path